@@ -1,13 +1,39 @@
-import fenics_concrete.sensors
-from fenics_concrete.experimental_setups.concrete_column import ConcreteColumnExperiment
-from fenics_concrete.experimental_setups.concrete_cube import ConcreteCubeExperiment
-from fenics_concrete.experimental_setups.concrete_beam import ConcreteBeamExperiment
-from fenics_concrete.experimental_setups.minimal_cube import MinimalCubeExperiment
-from fenics_concrete.experimental_setups.concrete_cylinder import ConcreteCylinderExperiment
-from fenics_concrete.material_problems.concrete_thermo_mechanical import ConcreteThermoMechanical
-from fenics_concrete.material_problems.linear_elasticity import LinearElasticity
-from fenics_concrete.helpers import Parameters
-from fenics_concrete.material_problems.concrete_thix_mechanical import ConcreteThixMechanical
-from fenics_concrete.experimental_setups.concrete_cube_uniaxial import ConcreteCubeUniaxialExperiment
-from fenics_concrete.experimental_setups.concrete_multiple_layers import ConcreteMultipleLayers2DExperiment
-from fenics_concrete.mori_tanaka_homogenization import ConcreteHomogenization
+import importlib
+
+from fenics_concrete.parameters import Parameters
+
+# the experiments, problems and submodules are imported on first access, importing the package does not import
+# dolfin, gmsh or scipy
+_lazy_attributes = {
+    'ConcreteColumnExperiment': 'fenics_concrete.experimental_setups.concrete_column',
+    'ConcreteCubeExperiment': 'fenics_concrete.experimental_setups.concrete_cube',
+    'ConcreteBeamExperiment': 'fenics_concrete.experimental_setups.concrete_beam',
+    'MinimalCubeExperiment': 'fenics_concrete.experimental_setups.minimal_cube',
+    'ConcreteCylinderExperiment': 'fenics_concrete.experimental_setups.concrete_cylinder',
+    'ConcreteThermoMechanical': 'fenics_concrete.material_problems.concrete_thermo_mechanical',
+    'LinearElasticity': 'fenics_concrete.material_problems.linear_elasticity',
+    'ConcreteThixMechanical': 'fenics_concrete.material_problems.concrete_thix_mechanical',
+    'ReducedConcreteThermal': 'fenics_concrete.material_problems.reduced_concrete_thermal',
+    'ConcreteCubeUniaxialExperiment': 'fenics_concrete.experimental_setups.concrete_cube_uniaxial',
+    'ConcreteMultipleLayers2DExperiment': 'fenics_concrete.experimental_setups.concrete_multiple_layers',
+    'ConcreteHomogenization': 'fenics_concrete.mori_tanaka_homogenization',
+}
+
+_lazy_submodules = ['sensors', 'aggregates', 'triggers', 'checkpoint', 'sweep', 'warmup', 'helpers', 'hydration',
+                    'hydration_history', 'mesh_cache', 'parareal', 'pv_output', 'reduced_order', 'screening',
+                    'experimental_setups', 'material_problems', 'mori_tanaka_homogenization']
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        value = getattr(importlib.import_module(_lazy_attributes[name]), name)
+    elif name in _lazy_submodules:
+        value = importlib.import_module(f'fenics_concrete.{name}')
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_attributes) + _lazy_submodules)
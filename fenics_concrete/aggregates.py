@@ -0,0 +1,179 @@
+import dolfin as df
+import numpy as np
+
+from fenics_concrete.helpers import LocalProjector
+from fenics_concrete.sensors import Sensors
+from fenics_concrete.triggers import Triggerable
+
+
+class Aggregates(Sensors):
+    """
+    Dict that holds the aggregates attached to a problem, access via attribute or key
+
+    When two aggregates with the same name are defined, the next one gets a number added to the name
+    """
+
+
+# aggregate template
+class Aggregate(Triggerable):
+    """Template for a running aggregate at each quadrature point
+
+    The values are updated in place after each time step, therefore no history of the fields is stored
+    """
+
+    state_attributes = ('data',)
+    # 'temperature' or 'mechanics' for aggregates of fields of that model, checked when the aggregate is added
+    required_model = None
+
+    def __init__(self):
+        self.data = None  # one value per quadrature point, initialized with the first update
+        self.triggers = []  # trigger conditions, checked after each solve
+        self.comm = None  # communicator of the mesh, set when the aggregate is added to a problem
+
+    def update(self, problem, t):
+        """Needs to be implemented in child, depending on the aggregate"""
+        raise NotImplementedError()
+
+    def reset(self):
+        """Clears the values and reactivates the triggers"""
+        self.data = None
+        self.reset_triggers()
+
+    def global_any(self, local):
+        """True on all processes, when `local` is True on any process"""
+        if self.comm is None:
+            return bool(local)
+        return df.MPI.max(self.comm, float(local)) > 0
+
+    def global_all(self, local):
+        """True on all processes, when `local` is True on all processes"""
+        if self.comm is None:
+            return bool(local)
+        return df.MPI.min(self.comm, float(local)) > 0
+
+    @property
+    def name(self):
+        return self.__class__.__name__
+
+    def fields(self):
+        """Returns a dict with the name and the quadrature point values of each field for the output"""
+        return {self.name: self.data}
+
+
+class PeakTemperatureAggregate(Aggregate):
+    """Peak temperature in celsius and the time of the peak at each quadrature point"""
+
+    state_attributes = ('data', 'time')
+    required_model = 'temperature'
+
+    def __init__(self):
+        super().__init__()
+        self.time = None
+
+    def reset(self):
+        super().reset()
+        self.time = None
+
+    def update(self, problem, t=1.0):
+        """
+        Arguments:
+            problem : FEM problem object
+            t : float, optional
+                time of measurement for time dependent problems
+        """
+        T = problem.q_temperature.vector().get_local() - problem.p.zero_C
+        if self.data is None:
+            self.data = T.copy()
+            self.time = np.full_like(T, t)
+        else:
+            new_peak = T > self.data
+            np.copyto(self.data, T, where=new_peak)
+            np.copyto(self.time, t, where=new_peak)
+
+    def fields(self):
+        return {'Peak temperature': self.data, 'Time of peak temperature': self.time}
+
+
+class MaxYieldAggregate(Aggregate):
+    """Maximum value of the yield function at each quadrature point
+
+    A value > 0 indicates that the stress exceeded the limits at that point at some time"""
+
+    required_model = 'mechanics'
+
+    def update(self, problem, t=1.0):
+        """
+        Arguments:
+            problem : FEM problem object
+            t : float, optional
+                time of measurement for time dependent problems
+        """
+        yield_values = problem.q_yield.vector().get_local()
+        if self.data is None:
+            self.data = yield_values.copy()
+        else:
+            np.maximum(self.data, yield_values, out=self.data)
+
+    def fields(self):
+        return {'Max yield': self.data}
+
+
+class MaxTemperatureGradientAggregate(Aggregate):
+    """Maximum magnitude of the temperature gradient at each quadrature point"""
+
+    required_model = 'temperature'
+
+    def __init__(self):
+        super().__init__()
+        self.q_grad_T = None
+        self.project_grad_T = None
+
+    def update(self, problem, t=1.0):
+        """
+        Arguments:
+            problem : FEM problem object
+            t : float, optional
+                time of measurement for time dependent problems
+        """
+        if self.project_grad_T is None:
+            # projector is only set up when the aggregate is used
+            temperature_problem = problem.temperature_problem
+            grad_T = df.grad(temperature_problem.T)
+            self.q_grad_T = df.Function(temperature_problem.q_V)
+            self.project_grad_T = LocalProjector(df.sqrt(df.dot(grad_T, grad_T)), temperature_problem.q_V,
+                                                 temperature_problem.dxm)
+
+        self.project_grad_T(self.q_grad_T)
+        grad_T_values = self.q_grad_T.vector().get_local()
+        if self.data is None:
+            self.data = grad_T_values.copy()
+        else:
+            np.maximum(self.data, grad_T_values, out=self.data)
+
+    def fields(self):
+        return {'Max temperature gradient': self.data}
+
+
+class EquivalentAgeAggregate(Aggregate):
+    """Equivalent age in seconds at each quadrature point
+
+    The time step is weighted with the temperature adjustment factor of the hydration model
+    """
+
+    required_model = 'temperature'
+
+    def update(self, problem, t=1.0):
+        """
+        Arguments:
+            problem : FEM problem object
+            t : float, optional
+                time of measurement for time dependent problems
+        """
+        temperature_problem = problem.temperature_problem
+        T = problem.q_temperature.vector().get_local()
+        if self.data is None:
+            self.data = np.zeros_like(T)
+        self.data += temperature_problem.dt * temperature_problem.temp_adjust(T)
+
+    def fields(self):
+        return {'Equivalent age': self.data}
@@ -0,0 +1,84 @@
+import os
+import pickle
+import queue
+import threading
+
+
+def checkpoint_file(name, rank=0):
+    """file name of the checkpoint part of one process"""
+    return f'{name}_{rank}.pkl'
+
+
+class CheckpointWriter:
+    """Writes checkpoints in a background thread
+
+    The state is copied by the caller, `write` only queues it. While a checkpoint is written, the next call of
+    `write` blocks. Each file is written to a temporary file first and then renamed, so a crash during the
+    write keeps the previous checkpoint intact. The thread does not keep the process alive, `flush` has to be
+    called before the end of the run.
+    """
+
+    def __init__(self, name, rank=0):
+        """
+        Arguments:
+            name : string
+                file name without extension
+            rank : int, optional
+                MPI rank of the process, each process writes its own file
+        """
+        self.file_name = checkpoint_file(name, rank)
+        self.queue = queue.Queue(maxsize=1)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        self.error = None
+
+    def write(self, state):
+        """
+        Arguments:
+            state : dict
+                copy of the simulation state, is not modified afterwards
+        """
+        self.check_error()
+        self.queue.put(state)
+
+    def flush(self):
+        """Waits until the last checkpoint is written"""
+        self.queue.join()
+        self.check_error()
+
+    def check_error(self):
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise RuntimeError(f'Writing checkpoint {self.file_name} failed') from error
+
+    # background thread
+    def run(self):
+        while True:
+            state = self.queue.get()
+            try:
+                tmp_file = self.file_name + '.tmp'
+                with open(tmp_file, 'wb') as f:
+                    pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.file_name)
+            except Exception as e:
+                # raised in the main thread with the next call
+                self.error = e
+            finally:
+                self.queue.task_done()
+
+
+def read_checkpoint(name, rank=0):
+    """
+    Arguments:
+        name : string
+            file name without extension
+        rank : int, optional
+            MPI rank of the process
+
+    returns the state dict of the checkpoint
+    """
+    with open(checkpoint_file(name, rank), 'rb') as f:
+        return pickle.load(f)
@@ -6,6 +6,10 @@ import dolfin as df
 
 
 class ConcreteBeamExperiment(Experiment):
+    geometry_parameters = ('dim', 'mesh_density', 'length', 'height', 'width', 'symmetry')
+    # the beam is symmetric to the center of the span and the center of the width
+    symmetry_directions = (0, 1)
+
     def __init__(self, parameters = None):
         p = Parameters()
         # boundary values...
@@ -34,12 +38,11 @@ class ConcreteBeamExperiment(Experiment):
             n_length += 1 # n_length must be even for loading example
 
         if self.p.dim == 2:
-             self.mesh = df.RectangleMesh(df.Point(0., 0.), df.Point(self.p.length, self.p.height),
-                                          n_length,
-                                          n_height, diagonal='right')
+             size, n = self.symmetry_box((self.p.length, self.p.height), (n_length, n_height))
+             self.mesh = df.RectangleMesh(df.Point(0., 0.), df.Point(*size), *n, diagonal='right')
         elif self.p.dim == 3:
-            self.mesh = df.BoxMesh(df.Point(0, 0, 0), df.Point(self.p.length, self.p.width, self.p.height),
-                                   n_length, n_width, n_height)
+            size, n = self.symmetry_box((self.p.length, self.p.width, self.p.height), (n_length, n_width, n_height))
+            self.mesh = df.BoxMesh(df.Point(0, 0, 0), df.Point(*size), *n)
         else:
             raise Exception(f'wrong dimension {self.p.dim} for problem setup')
 
@@ -55,11 +58,13 @@ class ConcreteBeamExperiment(Experiment):
 
         if self.p.bc_setting == 'full':
             # bc.append(DirichletBC(temperature_problem.V, T_bc, full_boundary))
-            temp_bcs.append(df.DirichletBC(V, T_bc1, self.boundary_full()))
+            temp_bcs.append(df.DirichletBC(V, T_bc1, *self.boundary_full()))
         elif self.p.bc_setting == 'left-right':
+            if self.p.symmetry is not None:
+                raise Exception('the boundary setting left-right is not symmetric, use symmetry None')
             # bc.append(DirichletBC(temperature_problem.V, T_bc, full_boundary))
-            temp_bcs.append(df.DirichletBC(V, T_bc2, self.boundary_left()))
-            temp_bcs.append(df.DirichletBC(V, T_bc3, self.boundary_right()))
+            temp_bcs.append(df.DirichletBC(V, T_bc2, *self.boundary_left()))
+            temp_bcs.append(df.DirichletBC(V, T_bc3, *self.boundary_right()))
         else:
             raise Exception(f'parameter[\'bc_setting\'] = {self.p.bc_setting} is not implemented as temperature boundary.')
 
@@ -75,12 +80,9 @@ class ConcreteBeamExperiment(Experiment):
             fixed_bc = df.Constant((0, 0, 0))
 
         # define surfaces, full, left, right, bottom, top, none
-        def left_support(x, on_boundary):
-            return df.near(x[0], 0) and df.near(x[dir_id], 0)
-        def right_support(x, on_boundary):
-            return df.near(x[0], self.p.length) and df.near(x[dir_id], 0)
-        def center_top(x, on_boundary):
-            return df.near(x[0], self.p.length/2) and df.near(x[dir_id], self.p.height)
+        left_support = self.boundary_line({0: 0, dir_id: 0})
+        right_support = self.boundary_line({0: self.p.length, dir_id: 0})
+        center_top = self.boundary_line({0: self.p.length/2, dir_id: self.p.height})
 
 
 
@@ -88,8 +90,11 @@ class ConcreteBeamExperiment(Experiment):
         displ_bcs = []
 
         displ_bcs.append(df.DirichletBC(V, fixed_bc, left_support, method='pointwise'))
-        displ_bcs.append(df.DirichletBC(V.sub(dir_id), df.Constant(0), right_support, method='pointwise'))
+        # the right support is mirrored when the beam is cut at the center
+        if 0 not in self.symmetry_planes():
+            displ_bcs.append(df.DirichletBC(V.sub(dir_id), df.Constant(0), right_support, method='pointwise'))
         displ_bcs.append(df.DirichletBC(V.sub(dir_id), self.displ_load, center_top, method='pointwise'))
+        displ_bcs += self.symmetry_bcs(V)
 
         return displ_bcs
 
@@ -5,6 +5,10 @@ import numpy as np
 import dolfin as df
 
 class ConcreteColumnExperiment(Experiment):
+    geometry_parameters = ('dim', 'mesh_density', 'mesh_density_min', 'height', 'width', 'symmetry')
+    # the square cross section is symmetric in both horizontal directions
+    symmetry_directions = (0, 1)
+
     def __init__(self, parameters=None):
         # initialize a set of "basic paramters" (for now...)
         p = Parameters()
@@ -34,12 +38,12 @@ class ConcreteColumnExperiment(Experiment):
         md_height = np.amax([self.p.mesh_density_min,int(self.p.mesh_density * self.p.height)])
 
         if self.p.dim == 2:
-             self.mesh = df.RectangleMesh(df.Point(0., 0.), df.Point(self.p.width, self.p.height),
-                                          md_width, md_height, diagonal='right')
+             size, n = self.symmetry_box((self.p.width, self.p.height), (md_width, md_height))
+             self.mesh = df.RectangleMesh(df.Point(0., 0.), df.Point(*size), *n, diagonal='right')
 
         elif self.p.dim == 3:
-            self.mesh = df.BoxMesh(df.Point(0, 0, 0), df.Point(self.p.width, self.p.width, self.p.height),
-                                   md_width, md_width, md_height)
+            size, n = self.symmetry_box((self.p.width, self.p.width, self.p.height), (md_width, md_width, md_height))
+            self.mesh = df.BoxMesh(df.Point(0, 0, 0), df.Point(*size), *n)
         else:
             raise Exception(f'wrong dimension {self.p.dim} for problem setup')
 
@@ -51,7 +55,7 @@ class ConcreteColumnExperiment(Experiment):
         temp_bcs = []
 
         if self.p.bc_setting == 'full':
-             temp_bcs.append(df.DirichletBC(V, T_bc1, self.boundary_full()))
+             temp_bcs.append(df.DirichletBC(V, T_bc1, *self.boundary_full()))
         else:
              raise Exception(
                  f'parameter[\'bc_setting\'] = {self.p.bc_settings} is not implemented as temperature boundary.')
@@ -64,8 +68,9 @@ class ConcreteColumnExperiment(Experiment):
         displ_bcs = []
 
         if self.p.dim == 2:
-            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), self.boundary_bottom()))
+            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), *self.boundary_bottom()))
         elif self.p.dim == 3:
-            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0, 0)),  self.boundary_bottom()))
+            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0, 0)), *self.boundary_bottom()))
+        displ_bcs += self.symmetry_bcs(V)
 
         return displ_bcs
@@ -4,6 +4,9 @@ from fenics_concrete.helpers import Parameters
 import dolfin as df
 
 class ConcreteCubeExperiment(Experiment):
+    # the cube is symmetric in both horizontal directions
+    symmetry_directions = (0, 1)
+
     def __init__(self, parameters=None):
         # initialize a set of "basic paramters" (for now...)
         p = Parameters()
@@ -24,7 +27,14 @@ class ConcreteCubeExperiment(Experiment):
         self.bc = bc  # different boundary settings
         # elements per spacial direction
         n = self.p.mesh_density
-        if self.p.dim == 2:
+        if self.p.symmetry is not None and self.p.dim in (2, 3):
+            # part of the unit cube, cut at the symmetry planes
+            size, elements = self.symmetry_box([1.0] * self.p.dim, [n] * self.p.dim)
+            if self.p.dim == 2:
+                self.mesh = df.RectangleMesh(df.Point(0., 0.), df.Point(*size), *elements, self.p.mesh_setting)
+            else:
+                self.mesh = df.BoxMesh(df.Point(0, 0, 0), df.Point(*size), *elements)
+        elif self.p.dim == 2:
             self.mesh = df.UnitSquareMesh(n, n, self.p.mesh_setting)
         elif self.p.dim == 3:
             self.mesh = df.UnitCubeMesh(n, n, n)
@@ -47,12 +57,14 @@ class ConcreteCubeExperiment(Experiment):
 
         if self.p.bc_setting == 'full':
             # bc.append(DirichletBC(temperature_problem.V, T_bc, full_boundary))
-            temp_bcs.append(df.DirichletBC(V, T_bc1, self.boundary_full()))
+            temp_bcs.append(df.DirichletBC(V, T_bc1, *self.boundary_full()))
         elif self.p.bc_setting == 'test-setup':
+            if self.p.symmetry is not None:
+                raise Exception('the boundary setting test-setup is not symmetric, use symmetry None')
             # bc.append(DirichletBC(temperature_problem.V, T_bc, full_boundary))
-            temp_bcs.append(df.DirichletBC(V, T_bc1, self.boundary_left()))
-            temp_bcs.append(df.DirichletBC(V, T_bc1, self.boundary_bottom(0.5)))
-            temp_bcs.append(df.DirichletBC(V, T_bc2, self.boundary_right()))
+            temp_bcs.append(df.DirichletBC(V, T_bc1, *self.boundary_left()))
+            temp_bcs.append(df.DirichletBC(V, T_bc1, *self.boundary_bottom(0.5)))
+            temp_bcs.append(df.DirichletBC(V, T_bc2, *self.boundary_right()))
         else:
             raise Exception(
                 f'parameter[\'bc_setting\'] = {self.bc_setting} is not implemented as temperature boundary.')
@@ -64,8 +76,9 @@ class ConcreteCubeExperiment(Experiment):
         displ_bcs = []
 
         if self.p.dim == 2:
-            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), self.boundary_bottom()))
+            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), *self.boundary_bottom()))
         elif self.p.dim == 3:
-            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0, 0)),  self.boundary_bottom()))
+            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0, 0)), *self.boundary_bottom()))
+        displ_bcs += self.symmetry_bcs(V)
 
         return displ_bcs
@@ -50,19 +50,19 @@ class ConcreteCubeUniaxialExperiment(Experiment):
 
         if self.p.dim == 2:
             if self.p.bc_setting == 'disp':
-                displ_bcs.append(df.DirichletBC(V.sub(1), self.top_displacement, self.boundary_top()))
+                displ_bcs.append(df.DirichletBC(V.sub(1), self.top_displacement, *self.boundary_top()))
 
-            displ_bcs.append(df.DirichletBC(V.sub(1), df.Constant(0), self.boundary_bottom()))
-            displ_bcs.append(df.DirichletBC(V.sub(0), df.Constant(0), self.boundary_left()))
+            displ_bcs.append(df.DirichletBC(V.sub(1), df.Constant(0), *self.boundary_bottom()))
+            displ_bcs.append(df.DirichletBC(V.sub(0), df.Constant(0), *self.boundary_left()))
 
 
         elif self.p.dim == 3:
             if self.p.bc_setting == 'disp':
-                displ_bcs.append(df.DirichletBC(V.sub(2), self.top_displacement, self.boundary_top()))
+                displ_bcs.append(df.DirichletBC(V.sub(2), self.top_displacement, *self.boundary_top()))
 
-            displ_bcs.append(df.DirichletBC(V.sub(2), df.Constant(0),  self.boundary_bottom()))
-            displ_bcs.append(df.DirichletBC(V.sub(0), df.Constant(0), self.boundary_left()))
-            displ_bcs.append(df.DirichletBC(V.sub(1), df.Constant(0), self.boundary_front()))
+            displ_bcs.append(df.DirichletBC(V.sub(2), df.Constant(0), *self.boundary_bottom()))
+            displ_bcs.append(df.DirichletBC(V.sub(0), df.Constant(0), *self.boundary_left()))
+            displ_bcs.append(df.DirichletBC(V.sub(1), df.Constant(0), *self.boundary_front()))
 
 
 
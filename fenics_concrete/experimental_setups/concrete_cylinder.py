@@ -1,15 +1,69 @@
 from fenics_concrete.experimental_setups.experiment import Experiment
 from fenics_concrete.helpers import Parameters
+from fenics_concrete.helpers import mesh_from_arrays
 import dolfin as df
 import numpy as np
-import gmsh
-import os
-import meshio
 
 
-def generate_cylinder_mesh(radius,height,mesh_density):
+def gmsh_cylinder(radius, height, mesh_density, dim):
+    # creates a cylinder with origin in (0,0,0) in a new gmsh model and meshes it up to dimension `dim`
+    import gmsh
+
+    gmsh.clear()
+    gmsh.model.add('cylinder_mesh')  # give the model a name
+
+    # syntax: add_cylinder(x,y,z,dx,dy,dz,radius,angle in radian)
+    membrane = gmsh.model.occ.addCylinder(0,0,0,0,0,height,radius,angle=2*np.pi)
+    gmsh.model.occ.synchronize()
+    # only physical groups get exported
+    # syntax: add_physical_group(dim , list of 3d objects, tag)
+    gmsh.model.addPhysicalGroup(3, [membrane], 1)
+
+    # meshing
+    characteristic_length = height/mesh_density
+    gmsh.option.setNumber("Mesh.CharacteristicLengthMax",characteristic_length)
+    # setting for minimal length, arbitrarily chosen as half the max value
+    gmsh.option.setNumber("Mesh.CharacteristicLengthMin",characteristic_length/2)
+    gmsh.model.mesh.generate(dim)
+
+
+def bottom_polygon_area():
+    # area of the bottom surface of the current gmsh cylinder mesh, computed from the nodes of the bottom circle
+    import gmsh
+
+    _, coordinates, _ = gmsh.model.mesh.getNodes()
+    coordinates = coordinates.reshape(-1, 3)
+    bottom = coordinates[np.isclose(coordinates[:, 2], 0.0)]
+    # shoelace formula with the nodes sorted by angle
+    bottom = bottom[np.argsort(np.arctan2(bottom[:, 1], bottom[:, 0]))]
+    x, y = bottom[:, 0], bottom[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def cylinder_mesh_radius(radius, height, mesh_density, area_error=1e-6, max_iterations=10):
+    """Radius of the polygonal mesh cylinder with the same bottom area as the circle with `radius`
+
+    The bottom of the tetrahedral mesh is the polygon of the nodes on the bottom circle, therefore only the
+    circles are meshed (1D) to compute the area. gmsh has to be initialized.
+    """
+    target_area = np.pi * radius ** 2
+    mesh_radius = radius
+    for _ in range(max_iterations):
+        gmsh_cylinder(mesh_radius, height, mesh_density, dim=1)
+        area = bottom_polygon_area()
+        if abs(target_area - area) <= target_area * area_error:
+            break
+        # for a fixed number of nodes on the circle the area scales with the square of the radius
+        mesh_radius = np.sqrt(target_area / area) * mesh_radius
+    return mesh_radius
+
+
+def generate_cylinder_mesh(radius,height,mesh_density,threads=1):
     '''Uses gmsh to generate a cylinder mesh for fenics
 
+    The radius of the mesh is corrected, that the area of the polygonal bottom surface matches the area of the
+    circle. The mesh is passed to dolfin in memory.
+
     Paramters
     ---------
     radius : float
@@ -19,63 +73,58 @@ def generate_cylinder_mesh(radius,height,mesh_density):
     mesh_density : float
         defines the size of the elements
         defines the minimum number of element edges in the height of the cylinder
+    threads : int, optional
+        number of threads of gmsh, more than one uses the parallel HXT algorithm for the volume mesh
 
     Returns
     -------
     mesh : dolfin.cpp.mesh.Mesh object
         cylinder mesh for dolfin
+    mesh_radius : float
+        radius of the mesh
     '''
 
-    # file names and location
-    folder_name = 'mesh'
-    file_name = 'cylinder'
-    msh_file = '{}/{}.msh'.format(folder_name,file_name)
-    xdmf_file = '{}/{}.xdmf'.format(folder_name,file_name)
-
-    # start gmsh
-    gmsh.initialize()
-    gmsh.option.setNumber('General.Verbosity',3) # only print warnings etc
-    gmsh.model.add('cylinder_mesh')  # give the model a name
-
-    # generate cylinder geometry with origin in (0,0,0)
-    # syntax: add_cylinder(x,y,z,dx,dy,dz,radius,angle in radian)
-    membrane = gmsh.model.occ.addCylinder(0,0,0,0,0,height,radius,angle=2*np.pi)
-    gmsh.model.occ.synchronize()
-    dim = 3
-    # only physical groups get exported
-    # syntax: add_physical_group(dim , list of 3d objects, tag)
-    gmsh.model.addPhysicalGroup(dim, [membrane], 1)
+    # the mesh is generated and built by the first process only, then the mesh is distributed
+    comm = df.MPI.comm_world
+    vertex_coordinates, cells, mesh_radius = None, None, None
+    if df.MPI.rank(comm) == 0:
+        # imported on first use, only required for the cylinder
+        import gmsh
 
-    # meshing
-    characteristic_length = height/mesh_density
-    gmsh.option.setNumber("Mesh.CharacteristicLengthMax",characteristic_length)
-    # setting for minimal length, arbitrarily chosen as half the max value
-    gmsh.option.setNumber("Mesh.CharacteristicLengthMin",characteristic_length/2)
-    gmsh.model.mesh.generate(dim)
+        # start gmsh
+        gmsh.initialize()
+        try:
+            gmsh.option.setNumber('General.Verbosity',3) # only print warnings etc
+            gmsh.option.setNumber('General.NumThreads', threads)
+            if threads > 1:
+                gmsh.option.setNumber('Mesh.Algorithm3D', 10)  # HXT, parallel Delaunay
 
-    # save it to disk as msh in folder
-    if not os.path.exists(folder_name):  # creat mesh folder if it does nto exists
-        os.mkdir(folder_name)
+            mesh_radius = cylinder_mesh_radius(radius, height, mesh_density)
+            gmsh_cylinder(mesh_radius, height, mesh_density, dim=3)
 
-    # write file
-    gmsh.write(msh_file)
-    gmsh.finalize()
+            # tetrahedra (gmsh element type 4) with the vertex numbering of dolfin
+            node_tags, coordinates, _ = gmsh.model.mesh.getNodes()
+            element_types, _, element_node_tags = gmsh.model.mesh.getElements(dim=3)
+        finally:
+            gmsh.finalize()
 
-    # convert msh to xdmf
-    meshio_mesh = meshio.read(msh_file)
-    meshio.write(xdmf_file, meshio_mesh)
+        cells = element_node_tags[list(element_types).index(4)].reshape(-1, 4)
+        vertex_tags = np.unique(cells)
+        vertex_coordinates = coordinates.reshape(-1, 3)[np.argsort(node_tags)][np.searchsorted(np.sort(node_tags),
+                                                                                               vertex_tags)]
+        cells = np.searchsorted(vertex_tags, cells)
 
-    # read xdmf as dolfin mesh
-    mesh = df.Mesh()
-    with df.XDMFFile(xdmf_file) as mesh_file:
-        mesh_file.read(mesh)
+    mesh_radius = comm.bcast(mesh_radius, root=0)
+    mesh = mesh_from_arrays(comm, vertex_coordinates, cells, 'tetrahedron')
 
-    return mesh
+    return mesh, mesh_radius
 
 
 class ConcreteCylinderExperiment(Experiment):
     """A cylinder mesh for a uni-axial displacement load"""
 
+    geometry_parameters = ('dim', 'mesh_density', 'radius', 'height', 'mesh_threads', 'axisymmetric')
+
     def __init__(self, parameters=None):
         """ initializes the object
 
@@ -96,10 +145,16 @@ class ConcreteCylinderExperiment(Experiment):
         # mesh information
         p['dim'] = 3  # dimension of problem, 2D or 3D
                       # 2D version of the cylinder is a rectangle with plane strain assumption
+        p['axisymmetric'] = False  # in 2D: axisymmetric (r, z) model of the cylinder, the mesh is the section
+                                   # 0 <= r <= radius, the results are those of the 3D cylinder
         p['mesh_density'] = 4  # in 3D: number of faces on the side when generating a polyhedral approximation
                                # in 2D: number of elements in each direction
         p['radius'] = 75   # radius of cylinder to approximate in mm
         p['height'] = 100  # height of cylinder in mm
+        p['mesh_threads'] = 1  # number of threads for the 3D meshing with gmsh
+        # temperature, used by the thermo-mechanical model
+        p['T_0'] = 20  # initial concrete temperature
+        p['T_bc1'] = 20  # temperature of the outer surface
 
         p = p + parameters
         super().__init__(p)
@@ -113,45 +168,29 @@ class ConcreteCylinderExperiment(Experiment):
         This function is called during __init__
         """
 
-        if self.p.dim == 2:
+        if self.p.axisymmetric and self.p.dim != 2:
+            raise Exception(f'axisymmetric cylinder requires dim 2, not {self.p.dim}')
+
+        if self.p.axisymmetric:
+            # section of the cylinder in the (r, z) plane, the axis is the left boundary
+            self.mesh = df.RectangleMesh(df.Point(0., 0.), df.Point(self.p.radius, self.p.height),
+                                         self.p.mesh_density, self.p.mesh_density, diagonal='right')
+        elif self.p.dim == 2:
             # build a rectangular mesh to approximate a 2D cylinder
             self.mesh = df.RectangleMesh(df.Point(0., 0.), df.Point(self.p.radius*2, self.p.height),
                                          self.p.mesh_density, self.p.mesh_density, diagonal='right')
         elif self.p.dim == 3:
             # generates a 3D cylinder mesh based on radius and height
-            # to reduce approximation errors due to the linear tetrahedron mesh, the mesh radius is iteratively changed
+            # to reduce approximation errors due to the linear tetrahedron mesh, the mesh radius is changed
             # until the bottom surface area matches that of a circle with the initially defined radius
-            def create_cylinder_mesh(radius, parameters):
-                # generate cylinder mesh using gmsh
-                mesh = generate_cylinder_mesh(radius, parameters.height, parameters.mesh_density)
-
-                # compute bottom surface area
-                class BottomSurface(df.SubDomain):
-                    def inside(self, x, on_boundary):
-                        return on_boundary and df.near(x[2], 0.0)
-
-                bottom_surface = BottomSurface()
-                boundaries = df.MeshFunction("size_t", mesh, mesh.geometric_dimension() - 1)
-                boundaries.set_all(0)
-                bottom_surface.mark(boundaries, 1)
-                ds = df.Measure("ds", domain=mesh, subdomain_data=boundaries)
-                bottom_area = df.assemble(1 * ds(1))
-
-                return bottom_area, mesh
-
-            # create a discretized cylinder mesh with the same cross-sectional area as the round cylinder
-            target_area = np.pi*self.p.radius**2
-            effective_radius = self.p.radius
-            mesh_area = 0
-            area_error = 1e-6
-            #
-            #iteratively improve the radius of the mesh till the bottom area matches the target
-            while abs(target_area - mesh_area) > target_area*area_error:
-                # generate mesh
-                self.p['mesh_radius'] = effective_radius  # not required, but maybe interesting as metadata
-                mesh_area, self.mesh = create_cylinder_mesh(effective_radius, self.p)
-                # new guess
-                effective_radius = np.sqrt(target_area/mesh_area)*effective_radius
+            # the mesh is reused from the mesh cache, when the geometry was meshed before
+            def generate():
+                mesh, mesh_radius = generate_cylinder_mesh(self.p.radius, self.p.height, self.p.mesh_density,
+                                                           self.p.mesh_threads)
+                return mesh, {'mesh_radius': mesh_radius}
+
+            self.mesh, metadata = self.cached_mesh(generate)
+            self.p['mesh_radius'] = metadata['mesh_radius']  # not required, but maybe interesting as metadata
 
         else:
             raise Exception(f'wrong dimension {self.p.dim} for problem setup')
@@ -173,38 +212,36 @@ class ConcreteCylinderExperiment(Experiment):
         # define displacement boundary
         displ_bcs = []
 
-        def boundary_node_2D(point):
-            def bc_node(x, on_boundary):
-                return df.near(x[0], point[0]) and df.near(x[1], point[1])
-            return bc_node
-
-        def boundary_node_3D(point):
-            def bc_node(x, on_boundary):
-                return df.near(x[0], point[0]) and df.near(x[1], point[1]) and df.near(x[2], point[2])
-            return bc_node
+        if self.p.axisymmetric:
+            # no radial displacement on the axis
+            displ_bcs.append(df.DirichletBC(V.sub(0), 0.0, *self.boundary_left()))
 
         if self.p.bc_setting == 'fixed':
             if self.p.dim == 2:
-                displ_bcs.append(df.DirichletBC(V.sub(1), self.top_displacement, self.boundary_top()))  # displacement
-                displ_bcs.append(df.DirichletBC(V.sub(0), 0, self.boundary_top()))
-                displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), self.boundary_bottom()))
+                displ_bcs.append(df.DirichletBC(V.sub(1), self.top_displacement, *self.boundary_top()))  # displacement
+                displ_bcs.append(df.DirichletBC(V.sub(0), 0, *self.boundary_top()))
+                displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), *self.boundary_bottom()))
 
             elif self.p.dim == 3:
-                displ_bcs.append(df.DirichletBC(V.sub(2), self.top_displacement, self.boundary_top()))  # displacement
-                displ_bcs.append(df.DirichletBC(V.sub(0), 0, self.boundary_top()))
-                displ_bcs.append(df.DirichletBC(V.sub(1), 0, self.boundary_top()))
-                displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0, 0)),  self.boundary_bottom()))
+                displ_bcs.append(df.DirichletBC(V.sub(2), self.top_displacement, *self.boundary_top()))  # displacement
+                displ_bcs.append(df.DirichletBC(V.sub(0), 0, *self.boundary_top()))
+                displ_bcs.append(df.DirichletBC(V.sub(1), 0, *self.boundary_top()))
+                displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0, 0)), *self.boundary_bottom()))
 
         elif self.p.bc_setting == 'free':
             if self.p.dim == 2:
-                displ_bcs.append(df.DirichletBC(V.sub(1), self.top_displacement, self.boundary_top()))  # displacement
-                displ_bcs.append(df.DirichletBC(V.sub(1), 0.0, self.boundary_bottom()))
-                displ_bcs.append(df.DirichletBC(V.sub(0), 0.0, boundary_node_2D(df.Point(0, 0)), method="pointwise"))
+                displ_bcs.append(df.DirichletBC(V.sub(1), self.top_displacement, *self.boundary_top()))  # displacement
+                displ_bcs.append(df.DirichletBC(V.sub(1), 0.0, *self.boundary_bottom()))
+                if not self.p.axisymmetric:
+                    # the axis already prevents the rigid body motion
+                    displ_bcs.append(df.DirichletBC(V.sub(0), 0.0, self.boundary_point((0, 0)), method="pointwise"))
 
             elif self.p.dim == 3:
                 # getting nodes at the bottom of the mesh to apply correct boundary condition to arbitrary cylinder mesh
                 mesh_points = self.mesh.coordinates()  # list of all nodal coordinates
                 bottom_points = mesh_points[(mesh_points[:, 2] == 0.0)]  # copying the bottom nodes, z coord = 0.0
+                # collect the bottom nodes of all processes to get the same points on each process
+                bottom_points = np.vstack(self.mesh.mpi_comm().allgather(bottom_points))
 
                 # sorting by x coordinate
                 x_min_boundary_point = bottom_points[bottom_points[:, 0].argsort(kind='mergesort')][0]
@@ -212,11 +249,11 @@ class ConcreteCylinderExperiment(Experiment):
                 # sorting by y coordinate
                 y_boundary_point = bottom_points[bottom_points[:, 1].argsort(kind='mergesort')][0]
 
-                displ_bcs.append(df.DirichletBC(V.sub(2), self.top_displacement, self.boundary_top()))  # displacement
-                displ_bcs.append(df.DirichletBC(V.sub(2), 0.0, self.boundary_bottom()))
-                displ_bcs.append(df.DirichletBC(V.sub(1), 0.0, boundary_node_3D(x_min_boundary_point), method="pointwise"))
-                displ_bcs.append(df.DirichletBC(V.sub(1), 0.0, boundary_node_3D(x_max_boundary_point), method="pointwise"))
-                displ_bcs.append(df.DirichletBC(V.sub(0), 0.0, boundary_node_3D(y_boundary_point), method="pointwise"))
+                displ_bcs.append(df.DirichletBC(V.sub(2), self.top_displacement, *self.boundary_top()))  # displacement
+                displ_bcs.append(df.DirichletBC(V.sub(2), 0.0, *self.boundary_bottom()))
+                displ_bcs.append(df.DirichletBC(V.sub(1), 0.0, self.boundary_point(x_min_boundary_point), method="pointwise"))
+                displ_bcs.append(df.DirichletBC(V.sub(1), 0.0, self.boundary_point(x_max_boundary_point), method="pointwise"))
+                displ_bcs.append(df.DirichletBC(V.sub(0), 0.0, self.boundary_point(y_boundary_point), method="pointwise"))
             else:
                 raise Exception(f'dim setting: {self.p.dim}, not implemented for cylinder bc setup: free')
 
@@ -225,6 +262,31 @@ class ConcreteCylinderExperiment(Experiment):
 
         return displ_bcs
 
+    def create_temp_bcs(self, V):
+        """Defines the temperature boundary conditions, the outer surface is kept at T_bc1
+
+        Parameters
+        ----------
+            V : FunctionSpace
+                Function space of the temperature
+
+        Returns
+        -------
+            temp_bcs : list
+                A list of DirichletBC objects, defining the boundary conditions
+        """
+        T_bc1 = df.Expression('t_boundary', t_boundary=self.p.T_bc1 + self.p.zero_C, degree=0)
+
+        temp_bcs = []
+        if self.p.axisymmetric:
+            # the axis is no surface, the flux over it is zero
+            for boundary in [self.boundary_bottom(), self.boundary_top(), self.boundary_right()]:
+                temp_bcs.append(df.DirichletBC(V, T_bc1, *boundary))
+        else:
+            temp_bcs.append(df.DirichletBC(V, T_bc1, *self.boundary_full()))
+
+        return temp_bcs
+
     def apply_displ_load(self, top_displacement):
         """Updates the applied displacement load
 
@@ -6,6 +6,8 @@ import dolfin as df
 # one mesh for all layers -> activate elements by pseudo-density
 
 class ConcreteMultipleLayers2DExperiment(Experiment):
+    geometry_parameters = ('dim', 'mesh_density', 'layer_width', 'layer_height', 'layer_number')
+
     def __init__(self, parameters=None):
         # initialize a set of "basic paramters" (for now...)
         p = Parameters()
@@ -38,7 +40,7 @@ class ConcreteMultipleLayers2DExperiment(Experiment):
         displ_bcs = []
 
         if self.p.dim == 2:
-            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), self.boundary_bottom()))
+            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), *self.boundary_bottom()))
         else:
             raise ValueError('Dimension has to be 2!! for that experiment')
 
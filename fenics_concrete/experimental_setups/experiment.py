@@ -1,11 +1,18 @@
 import dolfin as df
 import numpy as np
 from fenics_concrete.helpers import Parameters
+from fenics_concrete import mesh_cache
 
 
 class Experiment:
     """Parent class for experimental setups"""
 
+    # parameters that change the mesh, experiments with equal values can share the mesh
+    geometry_parameters = ('dim', 'mesh_density', 'mesh_setting', 'symmetry')
+    # directions of the symmetry planes of the body, used by the option `symmetry`, the vertical direction is
+    # never a symmetry direction
+    symmetry_directions = ()
+
     def __init__(self, parameters=None):
         """Initialises the parent object
 
@@ -16,59 +23,245 @@ class Experiment:
         self.p = Parameters()
         # constants
         self.p['zero_C'] = 273.15  # to convert celsius to kelvin input to
+        # None meshes the full body, 'half' or 'quarter' mesh the part cut at one or two symmetry planes
+        self.p['symmetry'] = None
+        # directory of the persistent mesh cache for generated or imported meshes, None disables the cache, the
+        # default is the environment variable FENICS_CONCRETE_MESH_CACHE
+        self.p['mesh_cache'] = mesh_cache.default_cache_dir()
 
         self.p = self.p + parameters
 
+        # facet functions of the boundaries, computed on first use
+        self.facet_cache = {}
+
         self.setup()
 
     def setup(self):
         """Is called by init, must be defined by child"""
         raise NotImplementedError()
 
-    # define some common boundary conditions
-    def boundary_full(self):
-        """Includes all nodes at the boundary"""
+    def symmetry_planes(self):
+        """Directions of the symmetry planes of the meshed part, the planes are at its largest coordinates"""
+        count = {None: 0, 'half': 1, 'quarter': 2}.get(self.p.symmetry)
+        if count is None:
+            raise Exception(f'unknown symmetry {self.p.symmetry}, use None, "half" or "quarter"')
+        directions = [direction for direction in self.symmetry_directions if direction < self.p.dim - 1]
+        if count > len(directions):
+            raise Exception(f'symmetry {self.p.symmetry} is not possible for {type(self).__name__} in {self.p.dim}D')
+        return directions[:count]
 
-        def bc_full(x, on_boundary):
-            return on_boundary
+    def symmetry_factor(self):
+        """Ratio of the full body to the meshed part"""
+        return 2 ** len(self.symmetry_planes())
 
-        return bc_full
+    def symmetry_box(self, size, elements):
+        """Size and number of elements of the meshed part of the box [0, size], cut at the symmetry planes
 
-    def boundary_empty(self):
-        """Boundary condition without any nodes"""
+        Arguments
+        ---------
+        size : list
+            size of the full box in each direction
+        elements : list
+            number of elements of the full box in each direction
+        """
+        size = list(size)
+        elements = list(elements)
+        for direction in self.symmetry_planes():
+            size[direction] = size[direction] / 2
+            elements[direction] = max(1, int(np.ceil(elements[direction] / 2)))
+        return size, elements
+
+    def symmetry_sides(self):
+        """Names of the sides of the mesh at the symmetry planes"""
+        return [{0: 'right', 1: 'back'}[direction] for direction in self.symmetry_planes()]
+
+    def symmetry_bcs(self, V):
+        """Displacement boundary conditions of the symmetry planes, no displacement normal to the plane
+
+        The temperature needs no condition, the flux over the planes is zero.
+        """
+        return [df.DirichletBC(V.sub(direction), df.Constant(0.0), *self.boundary_side(side))
+                for direction, side in zip(self.symmetry_planes(), self.symmetry_sides())]
+
+    def map_point(self, point):
+        """Mirrors a point of the full body into the meshed part
+
+        Returns
+        -------
+        point : list
+            coordinates in the meshed part
+        signs : list
+            -1 for the directions in which the point was mirrored, 1 otherwise
+        """
+        if isinstance(point, df.Point):
+            point = point.array()[:self.p.dim]
+        point = [float(x) for x in point]
+        signs = [1] * len(point)
+        for direction in self.symmetry_planes():
+            plane = self.coordinate_max(direction)
+            if point[direction] > plane:
+                point[direction] = 2 * plane - point[direction]
+                signs[direction] = -1
+        return point, signs
+
+    def cached_mesh(self, generate, comm=None):
+        """Returns the mesh from the persistent mesh cache, the mesh is generated and stored if it is missing
+
+        The cache entry is identified by the experiment class and the values of its `geometry_parameters`.
 
-        def bc_empty(x, on_boundary):
+        Arguments
+        ---------
+        generate : callable
+            function without arguments, returns the mesh and a dict of float metadata
+        comm : MPI communicator, optional
+            communicator of the mesh, default is the world communicator
+
+        Returns
+        -------
+        mesh, metadata
+        """
+        if comm is None:
+            comm = df.MPI.comm_world
+        key = mesh_cache.mesh_key(type(self), self.p, self.geometry_parameters)
+        return mesh_cache.cached_mesh(comm, key, generate, self.p.mesh_cache)
+
+    def coordinate_min(self, direction):
+        """Smallest coordinate of the mesh in the given direction, over all processes"""
+        return df.MPI.min(self.mesh.mpi_comm(), float(np.amin(self.mesh.coordinates()[:, direction])))
+
+    def coordinate_max(self, direction):
+        """Largest coordinate of the mesh in the given direction, over all processes"""
+        return df.MPI.max(self.mesh.mpi_comm(), float(np.amax(self.mesh.coordinates()[:, direction])))
+
+    # markers of the sides of the mesh in `facet_markers`, each side is given by the direction and min/max
+    boundary_markers = {'left': 1, 'right': 2, 'front': 3, 'back': 4, 'bottom': 5, 'top': 6}
+
+    def side_direction(self, side):
+        """Direction and extreme (min or max) of the coordinate of a side, None for front and back in 2D"""
+        vertical = self.p.dim - 1
+        if self.p.dim == 2 and side in ('front', 'back'):
             return None
+        return {'left': (0, 'min'), 'right': (0, 'max'), 'front': (1, 'min'), 'back': (1, 'max'),
+                'bottom': (vertical, 'min'), 'top': (vertical, 'max')}[side]
+
+    def exterior_facets(self):
+        """Indices and vertex coordinates of the exterior facets of the local mesh
+
+        Returns
+        -------
+        facets : array of facet indices
+        coordinates : array of shape (number of facets, vertices per facet, geometric dimension)
+        """
+        if 'exterior' not in self.facet_cache:
+            mesh = self.mesh
+            fdim = mesh.topology().dim() - 1
+            mesh.init(fdim, 0)
+            facets = df.BoundaryMesh(mesh, 'exterior').entity_map(fdim).array().astype(np.intp)
+            facet_vertices = mesh.topology()(fdim, 0)().reshape(mesh.num_entities(fdim), -1)
+            self.facet_cache['exterior'] = (facets, mesh.coordinates()[facet_vertices[facets]])
+        return self.facet_cache['exterior']
+
+    def mark_facets(self, facets, marker, facet_function=None):
+        """Sets the marker of the given facets, in a new facet MeshFunction if none is given"""
+        if facet_function is None:
+            facet_function = df.MeshFunction('size_t', self.mesh, self.mesh.topology().dim() - 1, 0)
+        values = facet_function.array()
+        values[facets] = marker
+        facet_function.set_values(values)
+        return facet_function
+
+    def facet_markers(self):
+        """Facet MeshFunction with the `boundary_markers` of the sides of the mesh
+
+        The markers are computed once from the vertex coordinates of the facets, a facet belongs to a side when
+        all its vertices are at the minimal or maximal coordinate of the mesh in the direction of the side.
+        """
+        if 'sides' not in self.facet_cache:
+            facets, coordinates = self.exterior_facets()
+            facet_function = self.mark_facets(np.array([], dtype=np.intp), 0)
+            for side, marker in self.boundary_markers.items():
+                if self.side_direction(side) is None:
+                    continue
+                direction, extreme = self.side_direction(side)
+                if extreme == 'min':
+                    value = self.coordinate_min(direction)
+                else:
+                    value = self.coordinate_max(direction)
+                on_side = np.all(np.abs(coordinates[:, :, direction] - value) < df.DOLFIN_EPS, axis=1)
+                self.mark_facets(facets[on_side], marker, facet_function)
+            self.facet_cache['sides'] = facet_function
+        return self.facet_cache['sides']
+
+    def ds(self, side=None):
+        """Surface measure of the exterior boundary or of one side of the mesh
+
+        Arguments
+        ---------
+        side : string, optional
+            name of the side in `boundary_markers`, default is the complete boundary
+        """
+        ds = df.Measure('ds', domain=self.mesh, subdomain_data=self.facet_markers())
+        if side is None:
+            return ds
+        return ds(self.boundary_markers[side])
+
+    def boundary_side(self, side):
+        """Facet function and marker of a side of the mesh, as arguments of DirichletBC"""
+        if self.side_direction(side) is None:
+            return self.boundary_empty()
+        return self.facet_markers(), self.boundary_markers[side]
+
+    def boundary_point(self, point):
+        """Compiled subdomain of a single point, for pointwise boundary conditions
+
+        dolfin needs a SubDomain for pointwise constraints, the compiled subdomain is evaluated in C++ for each
+        DOF. The point should be a vertex of the mesh.
+        """
+        condition = ' && '.join(f'near(x[{i}], p{i})' for i in range(self.p.dim))
+        return df.CompiledSubDomain(condition, **{f'p{i}': float(point[i]) for i in range(self.p.dim)})
 
-        return bc_empty
+    def boundary_line(self, conditions):
+        """Compiled subdomain of all points with the given coordinates, for pointwise boundary conditions
+
+        Arguments
+        ---------
+        conditions : dict
+            coordinate for each constrained direction, e.g. {0: 0.0, 2: 0.0} for the line x=0, z=0 in 3D
+        """
+        condition = ' && '.join(f'near(x[{i}], p{i})' for i in conditions)
+        return df.CompiledSubDomain(condition, **{f'p{i}': float(value) for i, value in conditions.items()})
+
+    # define some common boundary conditions
+    # each boundary is returned as facet MeshFunction and marker, used as
+    #     df.DirichletBC(V, value, *self.boundary_left())
+    def boundary_full(self):
+        """Includes all nodes at the boundary, except the symmetry planes"""
+        if 'full' not in self.facet_cache:
+            facets, _ = self.exterior_facets()
+            # the symmetry planes are no surface of the body
+            markers = self.facet_markers().array()[facets]
+            symmetry = np.isin(markers, [self.boundary_markers[side] for side in self.symmetry_sides()])
+            self.facet_cache['full'] = self.mark_facets(facets[~symmetry], 1)
+        return self.facet_cache['full'], 1
+
+    def boundary_empty(self):
+        """Boundary condition without any nodes"""
+        # a marker that is not used for any facet
+        return self.facet_markers(), max(self.boundary_markers.values()) + 1
 
     def boundary_left(self):
         """Includes all nodes at the left of the mesh
 
         This is defined as the smallest x values in 2D and 3D (x[0])
         """
-        # Left and right are defined as x (x[0]) in 2D and 3D
-        # minimum vales aka "left" boundary
-        left = np.amin(self.mesh.coordinates()[:, 0])
-
-        def bc_left(x, on_boundary):
-            return on_boundary and df.near(x[0], left)
-
-        return bc_left
+        return self.boundary_side('left')
 
     def boundary_right(self):
         """Includes all nodes at the right of the mesh
 
         This is defined as the largest x values in 2D and 3D (x[0])
         """
-        # Left and right are defined as x (x[0) in 2D and 3D
-        # max vales aka "right" boundary
-        right = np.amax(self.mesh.coordinates()[:, 0])
-
-        def bc_right(x, on_boundary):
-            return on_boundary and df.near(x[0], right)
-
-        return bc_right
+        return self.boundary_side('right')
 
     def boundary_bottom(self, end=None):
         """Includes nodes at the bottom of the mesh
@@ -81,44 +274,29 @@ class Experiment:
             when defined, this excludes nodes with x values greater than end
             this has no practical function other than to create more complex test cases
         """
-
-        if self.p.dim == 2:
-            dir_id = 1
-        elif self.p.dim == 3:
-            dir_id = 2
-        else:
+        if self.p.dim not in (2, 3):
             raise Exception('Dimension not defined')
 
-        # minimum vales aka "bottom" boundary
-        bottom = np.amin(self.mesh.coordinates()[:, dir_id])
         if end is None:
-            end = np.amax(self.mesh.coordinates()[:, 0])
+            return self.boundary_side('bottom')
 
-        def bc_bottom(x, on_boundary):
-            return on_boundary and df.near(x[dir_id], bottom) and x[0] <= end
-
-        return bc_bottom
+        key = ('bottom', end)
+        if key not in self.facet_cache:
+            facets, coordinates = self.exterior_facets()
+            bottom_facets = np.where(self.facet_markers().array()[facets] == self.boundary_markers['bottom'])[0]
+            in_range = np.all(coordinates[bottom_facets, :, 0] <= end, axis=1)
+            self.facet_cache[key] = self.mark_facets(facets[bottom_facets[in_range]], 1)
+        return self.facet_cache[key], 1
 
     def boundary_top(self):
         """Includes all nodes at the top of the mesh
 
         This is defined as the largest y values (x[1]) in 2D and the largest z value 3D (x[2])
         """
-
-        if self.p.dim == 2:
-            dir_id = 1
-        elif self.p.dim == 3:
-            dir_id = 2
-        else:
+        if self.p.dim not in (2, 3):
             raise Exception('Dimension not defined')
 
-            # minimum vales aka "bottom" boundary
-        top = np.amax(self.mesh.coordinates()[:, dir_id])
-
-        def bc_top(x, on_boundary):
-            return on_boundary and df.near(x[dir_id], top)
-
-        return bc_top
+        return self.boundary_side('top')
 
     def boundary_front(self):
         """Includes all nodes at the front of the mesh
@@ -126,40 +304,17 @@ class Experiment:
         This is only defined for the 3D case, as minimum y values (x[1])
         """
         # front and back are not defined in  2D and as y (x[1]) in 3D
-        if self.p.dim == 2:
-            bc = self.boundary_empty()
-
-        elif self.p.dim == 3:
-            # minimum vales aka "front" boundary
-            front = np.amin(self.mesh.coordinates()[:, 1])
-
-            def bc_front(x, on_boundary):
-                return on_boundary and df.near(x[1], front)
-
-            bc = bc_front
-        else:
+        if self.p.dim not in (2, 3):
             raise Exception('Dimension not defined')
 
-        return bc
+        return self.boundary_side('front')
 
     def boundary_back(self):
         """Includes all nodes at the back of the mesh
 
         This is only defined for the 3D case, as max y values (x[1])
         """
-
-        if self.p.dim == 2:
-            bc = self.boundary_empty()
-
-        elif self.p.dim == 3:
-            # max vales aka "back" boundary
-            back = np.amax(self.mesh.coordinates()[:, 1])
-
-            def bc_back(x, on_boundary):
-                return on_boundary and df.near(x[1], back)
-
-            bc = bc_back
-        else:
+        if self.p.dim not in (2, 3):
             raise Exception('Dimension not defined')
 
-        return bc
+        return self.boundary_side('back')
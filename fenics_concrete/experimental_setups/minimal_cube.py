@@ -38,8 +38,8 @@ class MinimalCubeExperiment(Experiment):
         displ_bcs = []
 
         if self.p.dim == 2:
-            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), self.boundary_full()))
+            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0)), *self.boundary_full()))
         elif self.p.dim == 3:
-            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0, 0)), self.boundary_full()))
+            displ_bcs.append(df.DirichletBC(V, df.Constant((0, 0, 0)), *self.boundary_full()))
 
         return displ_bcs
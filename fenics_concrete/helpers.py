@@ -1,27 +1,9 @@
 import dolfin as df
+import numpy as np
+import warnings
 
-
-class Parameters(dict):
-    """
-    Dict that also allows to access the parameter
-        p["parameter"]
-    via the matching attribute
-        p.parameter
-    to make access shorter
-    """
-    def __getattr__(self, key):
-        return self[key]
-
-    def __setattr__(self, key, value):
-        assert key in self
-        self[key] = value
-
-    def __add__(self, other):
-        if other == None:
-            dic = self
-        else:
-            dic = Parameters({**self, **other})
-        return dic
+from fenics_concrete.parameters import Parameters
+from fenics_concrete.pv_output import BinaryXDMFWriter
 
 
 # helper functions for quadrature spaces
@@ -61,3 +43,374 @@ class LocalProjector:
             function that is filled with the solution of the projection
         """
         self.solver.solve_local_rhs(u)
+
+
+class QuadratureTransfer:
+    def __init__(self, q_source, V_target, dx_source, dx_target):
+        """
+        transfers a quadrature function to a quadrature space with other quadrature points
+
+        the values are projected cell by cell onto a discontinuous space, which is evaluated at the target points,
+        piecewise linear fields are transferred exactly for quadrature degrees of at least 2
+
+        q_source:
+            quadrature function that is transferred
+        V_target:
+            quadrature function space of the result
+        dx_source, dx_target:
+            dolfin.Measure("dx") that match the source and the target space
+        """
+        source_degree = q_source.function_space().ufl_element().degree()
+        V_dg = df.FunctionSpace(V_target.mesh(), 'DG', 0 if source_degree < 2 else 1)
+        self.dg = df.Function(V_dg)
+        self.to_dg = LocalProjector(q_source, V_dg, dx_source)
+        self.to_target = LocalProjector(self.dg, V_target, dx_target)
+
+    def __call__(self, q_target):
+        """
+        q_target:
+            quadrature function that is filled with the transferred values
+        """
+        self.to_dg(self.dg)
+        self.to_target(q_target)
+
+
+class MeshTransfer:
+    def __init__(self):
+        """
+        transfers functions between different meshes of the same domain, e.g. a coarse and a fine mesh
+
+        nodal functions are interpolated, quadrature functions are projected cell by cell onto a discontinuous space,
+        which is interpolated to the other mesh and evaluated at the target points. The target points have to lie
+        within the source mesh. The projectors are set up with the first transfer of each pair of functions.
+        """
+        self.transfers = {}
+
+    def __call__(self, source, target):
+        """
+        source:
+            function that is transferred
+        target:
+            function on the other mesh that is filled with the transferred values
+        """
+        key = (id(source), id(target))
+        if key not in self.transfers:
+            self.transfers[key] = self.setup(source, target)
+        self.transfers[key]()
+
+    @staticmethod
+    def setup(source, target):
+        element = source.function_space().ufl_element()
+        if element.family() != 'Quadrature':
+            return lambda: df.LagrangeInterpolator.interpolate(target, source)
+
+        def dg_function(mesh):
+            degree = 0 if element.degree() < 2 else 1
+            if source.ufl_shape == ():
+                return df.Function(df.FunctionSpace(mesh, 'DG', degree))
+            return df.Function(df.VectorFunctionSpace(mesh, 'DG', degree, dim=source.ufl_shape[0]))
+
+        def measure(function):
+            degree = function.function_space().ufl_element().degree()
+            return df.dx(metadata={'quadrature_degree': degree, 'quadrature_scheme': 'default'})
+
+        dg_source = dg_function(source.function_space().mesh())
+        dg_target = dg_function(target.function_space().mesh())
+        to_dg = LocalProjector(source, dg_source.function_space(), measure(source))
+        to_target = LocalProjector(dg_target, target.function_space(), measure(target))
+
+        def transfer():
+            to_dg(dg_source)
+            df.LagrangeInterpolator.interpolate(dg_target, dg_source)
+            to_target(target)
+
+        return transfer
+
+
+class Projector:
+    def __init__(self, expr, V, dxm):
+        """
+        global L2 projection, the mass matrix is factorized once
+
+        expr:
+            expression to project
+        V:
+            function space of the projection
+        dxm:
+            dolfin.Measure("dx") that matches the quadrature of `expr`
+        """
+        dv = df.TrialFunction(V)
+        v_ = df.TestFunction(V)
+        a_proj = df.inner(dv, v_) * dxm
+        self.b_proj = df.Form(df.inner(expr, v_) * dxm)
+        self.b = df.assemble(self.b_proj)
+        self.solver = df.LUSolver(df.assemble(a_proj))
+
+    def __call__(self, u):
+        """
+        u:
+            function that is filled with the solution of the projection
+        """
+        df.assemble(self.b_proj, tensor=self.b)
+        self.solver.solve(u.vector(), self.b)
+
+
+def visu_projector(expr, V, dxm):
+    """
+    projector onto a visualisation space, cell local for discontinuous spaces
+
+    expr:
+        expression to project
+    V:
+        function space of the projection
+    dxm:
+        dolfin.Measure("dx") that matches the quadrature of `expr`
+    """
+    if V.ufl_element().family() == 'Discontinuous Lagrange':
+        return LocalProjector(expr, V, dxm)
+    return Projector(expr, V, dxm)
+
+
+class VisuFields:
+    def __init__(self, dxm, selection=None):
+        """
+        functions for the paraview output, the projectors are set up once per field
+
+        dxm:
+            dolfin.Measure("dx") that matches the quadrature of the projected expressions
+        selection:
+            list of the names of the fields that are written, None for all fields
+        """
+        self.dxm = dxm
+        self.selection = selection
+        self.fields = {}
+
+    def selected(self, name):
+        """
+        returns True when the field `name` is part of the output, check before projecting
+        """
+        return self.selection is None or name in self.selection
+
+    def __call__(self, name, expr, V):
+        """
+        name:
+            name of the field in the output
+        expr:
+            expression to project, has to be the same in each call for the same name
+        V:
+            visualisation function space
+
+        returns the function with the current projection of `expr` onto `V`
+        """
+        if name not in self.fields:
+            function = df.Function(V)
+            function.rename(name, name)
+            self.fields[name] = (function, visu_projector(expr, V, self.dxm))
+        function, projector = self.fields[name]
+        projector(function)
+        return function
+
+
+def evaluate_at_point(function, point):
+    """
+    evaluates a function at a point, also on distributed meshes
+
+    the value is computed on the process that owns the point and broadcast to all processes
+
+    function:
+        dolfin function to evaluate
+    point:
+        dolfin.Point or coordinates of the point
+    """
+    mesh = function.function_space().mesh()
+    comm = mesh.mpi_comm()
+    size = df.MPI.size(comm)
+    if size == 1:
+        return function(point)
+
+    if not isinstance(point, df.Point):
+        point = df.Point(*point)
+    rank = df.MPI.rank(comm)
+    cell = mesh.bounding_box_tree().compute_first_entity_collision(point)
+    owner = int(df.MPI.min(comm, float(rank if cell < mesh.num_cells() else size)))
+    if owner == size:
+        raise RuntimeError(f'Point {point.array()} is not inside the mesh')
+
+    value = function(point) if rank == owner else None
+    return comm.bcast(value, root=owner)
+
+
+# axisymmetric formulation, the coordinates of the 2D mesh are (r, z), the first coordinate is the radius
+def axisymmetric_weight(mesh):
+    """weight 2 pi r of the integrals over the rotated domain, the integrals are those of the 3D body"""
+    return 2 * np.pi * df.SpatialCoordinate(mesh)[0]
+
+
+def axisymmetric_strain(u, mesh):
+    """3x3 strain tensor of the axisymmetric displacement (u_r, u_z), in the order (r, z, theta)"""
+    r = df.SpatialCoordinate(mesh)[0]
+    eps = df.sym(df.grad(u))
+    return df.as_tensor([[eps[0, 0], eps[0, 1], 0],
+                         [eps[1, 0], eps[1, 1], 0],
+                         [0, 0, u[0] / r]])
+
+
+def volume_weight(mesh, p):
+    """weight of the volume integrals, 1 for plane and 3D problems"""
+    if p.get('axisymmetric', False):
+        return axisymmetric_weight(mesh)
+    return 1
+
+
+# fills a mesh editor from arrays in one call, a python loop over the entities is slow for large meshes
+mesh_editor_code = """
+#include <pybind11/pybind11.h>
+#include <pybind11/eigen.h>
+#include <dolfin/geometry/Point.h>
+#include <dolfin/mesh/MeshEditor.h>
+
+using Coordinates = Eigen::Matrix<double, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>;
+using Cells = Eigen::Matrix<std::size_t, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>;
+
+void add_entities(dolfin::MeshEditor& editor, Eigen::Ref<const Coordinates> coordinates,
+                  Eigen::Ref<const Cells> cells)
+{
+  for (Eigen::Index i = 0; i < coordinates.rows(); ++i)
+    editor.add_vertex(i, dolfin::Point(coordinates.cols(), coordinates.row(i).data()));
+  std::vector<std::size_t> cell(cells.cols());
+  for (Eigen::Index i = 0; i < cells.rows(); ++i)
+  {
+    for (Eigen::Index j = 0; j < cells.cols(); ++j)
+      cell[j] = cells(i, j);
+    editor.add_cell(i, cell);
+  }
+}
+
+PYBIND11_MODULE(SIGNATURE, m)
+{
+  m.def("add_entities", &add_entities);
+}
+"""
+_mesh_editor_module = None
+
+
+def mesh_editor_module():
+    # compiled with the first call, collective on all processes, afterwards loaded from the cache of the jit
+    global _mesh_editor_module
+    if _mesh_editor_module is None:
+        _mesh_editor_module = df.compile_cpp_code(mesh_editor_code)
+    return _mesh_editor_module
+
+
+def mesh_from_arrays(comm, coordinates, cells, cell_type):
+    """
+    builds a dolfin mesh from vertex coordinates and cell connectivity, the mesh is distributed in parallel
+
+    the mesh is built by the first process only, the other processes start with an empty mesh and receive their
+    part when the mesh is distributed, the vertices and cells are added in compiled code
+
+    comm:
+        MPI communicator of the mesh
+    coordinates:
+        array of shape (number of vertices, geometric dimension), only used on the first process
+    cells:
+        array of shape (number of cells, vertices per cell) with vertex indices, only used on the first process
+    cell_type:
+        dolfin cell type name, e.g. 'tetrahedron'
+    """
+    tdim = {'interval': 1, 'triangle': 2, 'quadrilateral': 2, 'tetrahedron': 3, 'hexahedron': 3}[cell_type]
+    rank = df.MPI.rank(comm)
+    if rank == 0:
+        coordinates = np.ascontiguousarray(coordinates, dtype=float)
+        cells = np.ascontiguousarray(cells, dtype=np.uintp)
+        sizes = (coordinates.shape[1], len(coordinates), len(cells))
+    else:
+        sizes = None
+    gdim, n_vertices, n_cells = comm.bcast(sizes, root=0)
+    module = mesh_editor_module()
+
+    mesh = df.Mesh(comm)
+    editor = df.MeshEditor()
+    editor.open(mesh, cell_type, tdim, gdim)
+    if rank == 0:
+        editor.init_vertices_global(n_vertices, n_vertices)
+        editor.init_cells_global(n_cells, n_cells)
+        module.add_entities(editor, coordinates, cells)
+    else:
+        editor.init_vertices_global(0, n_vertices)
+        editor.init_cells_global(0, n_cells)
+    editor.close()
+
+    if df.MPI.size(comm) > 1:
+        # the mesh data of the first process is partitioned and sent to all processes
+        df.cpp.mesh.MeshPartitioning.build_distributed_mesh(mesh)
+    return mesh
+
+
+# helper functions for paraview output
+def region_cells(mesh, region):
+    """
+    returns a boolean array that marks the cells of the region
+
+    mesh:
+        dolfin mesh
+    region:
+        bounding box as pair of the min and max coordinates, e.g. ((0, 0), (1, 0.5)), cells with the midpoint
+        inside the box are selected, or a pair of a cell MeshFunction and a marker
+    """
+    if hasattr(region[0], 'array'):
+        # cell MeshFunction
+        markers, marker = region
+        return markers.array() == marker
+
+    lower, upper = np.array(region[0], dtype=float), np.array(region[1], dtype=float)
+    dim = mesh.geometry().dim()
+    if lower.shape != (dim,) or upper.shape != (dim,):
+        raise Exception(f'paraview region {region} does not match the mesh dimension {dim}')
+    midpoints = mesh.coordinates()[mesh.cells()].mean(axis=1)
+    return np.all((midpoints >= lower) & (midpoints <= upper), axis=1)
+
+
+def create_pv_file(mesh, pv_name, asynchronous=False, region=None, precision='float64'):
+    """
+    mesh:
+        mesh of the functions that are written
+    pv_name:
+        file name without extension
+    asynchronous:
+        when True, the output is written by a background thread, only implemented in serial
+    region:
+        only write the cells in this region, see `region_cells`, only implemented in serial
+    precision:
+        'float64' or 'float32', single precision is only implemented in serial
+    """
+    if precision not in ('float64', 'float32'):
+        raise Exception(f'unknown paraview precision {precision}, only "float64" and "float32" implemented')
+
+    if asynchronous or region is not None or precision != 'float64':
+        if df.MPI.size(mesh.mpi_comm()) == 1:
+            cell_mask = None if region is None else region_cells(mesh, region)
+            return BinaryXDMFWriter(mesh, pv_name, asynchronous=asynchronous, cell_mask=cell_mask,
+                                    precision=precision)
+        warnings.warn('Asynchronous, regional and single precision paraview output are only implemented in '
+                      'serial, writing the complete mesh synchronously in double precision')
+
+    pv_file = df.XDMFFile(mesh.mpi_comm(), pv_name + '.xdmf')
+    pv_file.parameters["flush_output"] = True
+    pv_file.parameters["functions_share_mesh"] = True
+    return pv_file
+
+
+def pv_encoding(mesh, encoding='HDF5'):
+    """
+    mesh:
+        mesh of the functions that are written
+    encoding:
+        'HDF5' for binary output or 'ASCII', ascii output is only supported in serial
+    """
+    if encoding == 'HDF5' or df.MPI.size(mesh.mpi_comm()) > 1:
+        return df.XDMFFile.Encoding.HDF5
+    elif encoding == 'ASCII':
+        return df.XDMFFile.Encoding.ASCII
+    else:
+        raise Exception(f'unknown paraview encoding {encoding}, only "HDF5" and "ASCII" implemented')
@@ -0,0 +1,248 @@
+"""Hydration kinetics of the thermo-mechanical model, only depends on numpy
+
+All functions take the parameters as dict or Parameters with the entries
+    B1, B2, eta, alpha_max : affinity
+    E_act, T_ref, temp_adjust_law, igc, zero_C : temperature adjustment
+"""
+
+import numpy as np
+
+
+def temp_adjust(T, p):
+    """temperature adjustment factor of the affinity, T in kelvin"""
+    val = 1
+    if p['temp_adjust_law'] == 'exponential':
+        val = np.exp(-p['E_act'] / p['igc'] * (1 / T - 1 / (p['T_ref'] + p['zero_C'])))
+    elif p['temp_adjust_law'] == 'off':
+        pass
+    else:
+        # TODO throw correct error
+        raise Exception(
+            f'Warning: Incorrect temp_adjust_law {p["temp_adjust_law"]} given, only "exponential" and "off" implemented')
+    return val
+
+
+def temp_adjust_tangent(T, p):
+    """derivative of the temperature adjustment factor with respect to the temperature"""
+    val = 0
+    if p['temp_adjust_law'] == 'exponential':
+        val = temp_adjust(T, p) * p['E_act'] / p['igc'] / T ** 2
+    return val
+
+
+def affinity(delta_alpha, alpha_n, p):
+    """affinity at the degree of hydration `alpha_n + delta_alpha`"""
+    alpha = delta_alpha + alpha_n
+    return p['B1'] * (p['B2'] / p['alpha_max'] + alpha) * (p['alpha_max'] - alpha) * np.exp(
+        -p['eta'] * alpha / p['alpha_max'])
+
+
+def daffinity_ddalpha(delta_alpha, alpha_n, p):
+    """derivative of the affinity with respect to delta alpha"""
+    alpha = delta_alpha + alpha_n
+    return p['B1'] * np.exp(-p['eta'] * alpha / p['alpha_max']) * (
+            (p['alpha_max'] - alpha) * (p['B2'] / p['alpha_max'] + alpha) * (-p['eta'] / p['alpha_max'])
+            - p['B2'] / p['alpha_max'] - 2 * alpha + p['alpha_max'])
+
+
+def delta_alpha_fkt(delta_alpha, alpha_n, T, dt, p):
+    """residual of the implicit time step of the degree of hydration"""
+    return delta_alpha - dt * affinity(delta_alpha, alpha_n, p) * temp_adjust(T, p)
+
+
+def delta_alpha_prime(delta_alpha, alpha_n, T, dt, p):
+    """derivative of `delta_alpha_fkt` with respect to delta alpha"""
+    return 1 - dt * daffinity_ddalpha(delta_alpha, alpha_n, p) * temp_adjust(T, p)
+
+
+def solve_delta_alpha(alpha_n, T, dt, p, x0):
+    """increment of the degree of hydration in one time step, solved with newtons method at each point
+
+    alpha_n:
+        degree of hydration at the last time step
+    T:
+        temperature in kelvin
+    dt:
+        time step
+    p:
+        parameters
+    x0:
+        starting value
+    """
+    import scipy.optimize
+
+    return scipy.optimize.newton(delta_alpha_fkt, args=(alpha_n, T, dt, p), fprime=delta_alpha_prime, x0=x0)
+
+
+def hydration_substeps(alpha_n, T_n, T, dt, p, tolerance, max_steps=100):
+    """number of backward euler sub steps of the degree of hydration per point in one time step
+
+    the number of sub steps is doubled at each point until the degree of hydration at the end of the step changes
+    less than the tolerance, which estimates the error of the result with the finer sub steps
+
+    alpha_n:
+        degree of hydration at the last time step
+    T_n, T:
+        temperature at the last and the current time step in kelvin
+    dt:
+        time step
+    p:
+        parameters
+    tolerance:
+        largest error of the degree of hydration in one time step
+    max_steps:
+        largest number of sub steps
+    """
+    n_steps = np.ones(len(alpha_n), dtype=int)
+    alpha, _ = substep_alpha(alpha_n, T_n, T, dt, p, n_steps)
+    active = np.arange(len(alpha_n))
+    while len(active) > 0:
+        n_steps[active] = np.minimum(2 * n_steps[active], max_steps)
+        alpha_fine, _ = substep_alpha(alpha_n[active], T_n[active], T[active], dt, p, n_steps[active])
+        error = np.abs(alpha_fine - alpha[active])
+        alpha[active] = alpha_fine
+        active = active[(error > tolerance) & (n_steps[active] < max_steps)]
+    return n_steps
+
+
+def substep_alpha(alpha_n, T_n, T, dt, p, n_steps):
+    """degree of hydration at the end of a time step, integrated with backward euler sub steps
+
+    the temperature is linear in time between T_n and T, the sub steps are vectorized over the points, each point
+    takes its own number of equal sub steps
+
+    alpha_n:
+        degree of hydration at the last time step
+    T_n, T:
+        temperature at the last and the current time step in kelvin
+    dt:
+        time step
+    p:
+        parameters
+    n_steps:
+        number of sub steps per point, see `hydration_substeps`
+
+    returns the degree of hydration and its derivative with respect to T
+    """
+    alpha = np.array(alpha_n, dtype=float)
+    dalpha_dT = np.zeros_like(alpha)
+    h = dt / n_steps
+    for k in range(1, np.max(n_steps, initial=0) + 1):
+        active = k <= n_steps
+        weight = k / n_steps[active]
+        T_k = T_n[active] + weight * (T[active] - T_n[active])
+        alpha_k = alpha[active]
+        h_k = h[active]
+
+        # the explicit euler increment is the starting value, newton can converge to a negative root at small
+        # degrees of hydration, these points are solved again with larger starting values
+        x0 = h_k * affinity(0, alpha_k, p) * temp_adjust(T_k, p)
+        delta_alpha = solve_delta_alpha(alpha_k, T_k, h_k, p, x0)
+        for guess in [0.2, 0.5]:
+            negative = delta_alpha < 0.0
+            if not np.any(negative):
+                break
+            delta_alpha[negative] = solve_delta_alpha(alpha_k[negative], T_k[negative], h_k[negative], p,
+                                                      np.full(np.count_nonzero(negative), guess))
+        if np.any(delta_alpha < 0.0):
+            raise Exception('There is a problem with the alpha computation, computed delta alpha is negative.')
+
+        # sensitivity of alpha with respect to the temperature at the end of the step
+        dalpha_dT[active] = (dalpha_dT[active]
+                             + h_k * affinity(delta_alpha, alpha_k, p) * temp_adjust_tangent(T_k, p) * weight) \
+                            / delta_alpha_prime(delta_alpha, alpha_k, T_k, h_k, p)
+        alpha[active] = alpha_k + delta_alpha
+    return alpha, dalpha_dT
+
+
+def interpolate(x, x_list, y_list):
+    # linear interpolation in an ordered x list, with extrapolation
+    i = 0
+    # check if x is in the dataset
+    if x > x_list[-1]:
+        print(' * Warning!!!: Extrapolation!!!')
+        point1 = (x_list[-2], y_list[-2])
+        point2 = (x_list[-1], y_list[-1])
+    elif x < x_list[0]:
+        print(' * Warning!!!: Extrapolation!!!')
+        point1 = (x_list[0], y_list[0])
+        point2 = (x_list[1], y_list[1])
+    else:
+        while x_list[i] < x:
+            i += 1
+        point1 = (x_list[i - 1], y_list[i - 1])
+        point2 = (x_list[i], y_list[i])
+
+    slope = (point2[1] - point1[1]) / (point2[0] - point1[0])
+    x_increment = x - point1[0]
+    y_increment = slope * x_increment
+    y = point1[1] + y_increment
+
+    return y
+
+
+def heat_of_hydration(T, time_list, dt, p):
+    """
+    heat of hydration and degree of hydration at constant temperature
+
+    T:
+        temperature in celsius
+    time_list:
+        ordered list of times of the output
+    dt:
+        time step of the integration
+    p:
+        parameters, additionally Q_pot, the potential heat per weight of binder
+
+    returns the heat in kJ/kg and the degree of hydration at the times of `time_list`
+    """
+    # get tmax, identify number of time steps, then interpolate data
+    # assuming time list is ordered!!!
+    tmax = time_list[-1]
+
+    t = 0
+    time = [0.0]
+    heat = [0.0]
+    alpha_list = [0.0]
+    alpha = 0
+    delta_alpha = 0.0
+
+    error_flag = False
+    while t < tmax:
+        # compute delta_alpha, trying several starting values
+        for x0 in [delta_alpha, 0.2, 0.5, 1.0]:
+            try:
+                delta_alpha = solve_delta_alpha(alpha, T + p['zero_C'], dt, p, x0)
+                if delta_alpha < 0:
+                    raise Exception(
+                        f'Problem with solving for delta alpha. Result is negative for starting delta alpha = {x0}')
+                break
+            except Exception:
+                continue
+        else:
+            error_flag = True
+            break
+
+        # update alpha
+        alpha = delta_alpha + alpha
+        # save heat of hydration
+        alpha_list.append(alpha)
+        heat.append(alpha * p['Q_pot'])
+
+        # timeupdate
+        t = t + dt
+        time.append(t)
+
+    # if there was a probem with the computation (bad input values), return zero
+    if error_flag:
+        heat_interpolated = np.zeros_like(time_list)
+        alpha_interpolated = np.zeros_like(time_list)
+    else:
+        # interpolate heat to match time_list
+        heat_interpolated = []
+        alpha_interpolated = []
+        for value in time_list:
+            heat_interpolated.append(interpolate(value, time, heat))
+            alpha_interpolated.append(interpolate(value, time, alpha_list))
+
+    return np.asarray(heat_interpolated) / 1000, np.asarray(alpha_interpolated)
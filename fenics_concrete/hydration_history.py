@@ -0,0 +1,85 @@
+import bisect
+
+import numpy as np
+
+from fenics_concrete.checkpoint import read_checkpoint
+
+
+class HydrationHistory:
+    """Degree of hydration at the quadrature points of the temperature problem over time
+
+    A stored history drives the mechanics problem of ConcreteThermoMechanical with problem_mode 'mechanical',
+    without solving the temperature problem. The values are local to each process, the history can only be
+    used with the same mesh, partition and quadrature degree as the run it was recorded in.
+    """
+
+    def __init__(self, times=(), values=()):
+        """
+        Arguments:
+            times : list, optional
+                increasing times of the stored states
+            values : list, optional
+                arrays with the local degree of hydration at the quadrature points, one per time
+        """
+        self.times = []
+        self.values = []
+        for t, alpha in zip(times, values):
+            self.add(t, alpha)
+
+    def add(self, t, values):
+        """
+        Arguments:
+            t : float
+                time of the state
+            values : array
+                local degree of hydration at the quadrature points
+        """
+        i = bisect.bisect_left(self.times, t)
+        if i < len(self.times) and self.times[i] == t:
+            self.values[i] = np.array(values)
+        else:
+            self.times.insert(i, t)
+            self.values.insert(i, np.array(values))
+
+    def add_state(self, state):
+        """adds the degree of hydration of a state returned by `get_state` or read from a checkpoint"""
+        self.add(state['t'], state['fields']['temperature']['q_alpha'])
+
+    @classmethod
+    def from_checkpoints(cls, names, rank=0):
+        """
+        history from the checkpoints of a previous run
+
+        Arguments:
+            names : list
+                file names of the checkpoints without extension
+            rank : int, optional
+                MPI rank of the process
+        """
+        history = cls()
+        for name in names:
+            history.add_state(read_checkpoint(name, rank))
+        return history
+
+    def __call__(self, t):
+        """degree of hydration at time `t`, linear in time between the stored states, constant outside"""
+        if not self.times:
+            raise Exception('The hydration history is empty')
+        if t <= self.times[0]:
+            return self.values[0].copy()
+        if t >= self.times[-1]:
+            return self.values[-1].copy()
+
+        i = bisect.bisect_right(self.times, t)
+        t_0, t_1 = self.times[i - 1], self.times[i]
+        weight = (t - t_0) / (t_1 - t_0)
+        return (1 - weight) * self.values[i - 1] + weight * self.values[i]
+
+    def save(self, file_name):
+        """writes the history to a numpy .npz file, one file per process"""
+        np.savez(file_name, times=np.array(self.times), values=np.array(self.values))
+
+    @classmethod
+    def load(cls, file_name):
+        with np.load(file_name) as data:
+            return cls(list(data['times']), list(data['values']))
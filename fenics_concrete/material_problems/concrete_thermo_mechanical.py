@@ -1,6 +1,5 @@
 import dolfin as df
 import numpy as np
-import scipy.optimize
 
 
 from fenics_concrete.material_problems.material_problem import MaterialProblem
@@ -8,6 +7,13 @@ from fenics_concrete.material_problems.material_problem import MaterialProblem
 from fenics_concrete.helpers import Parameters
 from fenics_concrete.helpers import set_q
 from fenics_concrete.helpers import LocalProjector
+from fenics_concrete.helpers import QuadratureTransfer
+from fenics_concrete.helpers import create_pv_file
+from fenics_concrete.helpers import pv_encoding
+from fenics_concrete.helpers import VisuFields
+from fenics_concrete.helpers import axisymmetric_strain
+from fenics_concrete.helpers import volume_weight
+from fenics_concrete import hydration
 from fenics_concrete import experimental_setups
 import fenics_concrete
 
@@ -20,6 +26,12 @@ warnings.simplefilter("ignore", QuadratureRepresentationDeprecationWarning)
 
 # full concrete model, including hydration-temperate and mechanics, including calls to solve etc.
 class ConcreteThermoMechanical(MaterialProblem):
+    # material parameters and boundary values that can be changed with `update_parameters`
+    runtime_parameters = ('density', 'themal_cond', 'vol_heat_cap', 'Q_pot', 'Q_inf', 'B1', 'B2', 'eta', 'alpha_max',
+                          'E_act', 'T_ref', 'temp_adjust_law', 'E_28', 'nu', 'alpha_t', 'alpha_0', 'a_E', 'fc_inf',
+                          'a_fc', 'ft_inf', 'a_ft', 'g', 'T_0', 'T_bc1', 'T_bc2', 'T_bc3', 'hydration_tolerance',
+                          'hydration_max_substeps')
+
     def __init__(self, experiment=None, parameters=None, pv_name='pv_output_concrete-thermo-mechanical'):
         # generate "dummy" experiement when none is passed
         if experiment == None:
@@ -53,8 +65,22 @@ class ConcreteThermoMechanical(MaterialProblem):
         # setting for temperature adjustment
         # option: 'exponential' and 'off'
         default_p['temp_adjust_law'] = 'exponential'
+        # 'thermo-mechanical' solves both problems, 'thermal' only the temperature and hydration problem,
+        # 'mechanical' only the mechanics problem with a given hydration history
+        default_p['problem_mode'] = 'thermo-mechanical'
+        # time integration of the temperature and the hydration: 'backward-euler', the second order schemes 'bdf2'
+        # and 'crank-nicolson', or 'explicit' with a lumped capacity matrix and automatic stable sub steps
+        default_p['time_scheme'] = 'backward-euler'
+        # largest error of the degree of hydration per time step, the hydration at the quadrature points is
+        # integrated with adaptive backward euler sub steps, None for one step, only for 'backward-euler' and
+        # 'explicit'
+        default_p['hydration_tolerance'] = None
+        default_p['hydration_max_substeps'] = 100  # largest number of sub steps per point and time step
         # polinomial degree
-        default_p['degree'] = 2  #
+        default_p['degree'] = 2  # default for the temperature and the displacement
+        default_p['degree_T'] = None  # polynomial degree of the temperature, default is `degree`
+        default_p['degree_u'] = None  # polynomial degree of the displacement, default is `degree`
+        default_p['quadrature_degree'] = None  # quadrature degree of both problems, default is the degree of each field
 
         ### paramters for mechanics problem
         default_p['E_28'] = 15000000  # Youngs Modulus N/m2 or something... TODO: check units!
@@ -72,121 +98,312 @@ class ConcreteThermoMechanical(MaterialProblem):
         default_p['a_ft'] = 1.0
 
         self.p = default_p + self.p
-
-        # setting up the two nonlinear problems
-        self.temperature_problem = ConcreteTempHydrationModel(self.experiment.mesh, self.p, pv_name=self.pv_name)
-
-        # here I "pass on the parameters from temperature to mechanics problem.."
-        self.mechanics_problem = ConcreteMechanicsModel(self.experiment.mesh, self.p, pv_name=self.pv_name)
-        # coupling of the output files
-        self.mechanics_problem.pv_file = self.temperature_problem.pv_file
+        if self.p.problem_mode not in ('thermo-mechanical', 'thermal', 'mechanical'):
+            raise Exception(f'unknown problem_mode {self.p.problem_mode}, '
+                            f'use "thermo-mechanical", "thermal" or "mechanical"')
+        if self.p.time_scheme not in ('backward-euler', 'bdf2', 'crank-nicolson', 'explicit'):
+            raise Exception(f'unknown time_scheme {self.p.time_scheme}, '
+                            f'use "backward-euler", "bdf2", "crank-nicolson" or "explicit"')
+        if self.p.hydration_tolerance and self.p.time_scheme in ('bdf2', 'crank-nicolson'):
+            raise Exception('the hydration sub steps are only implemented for "backward-euler" and "explicit"')
+        if self.p.degree_T is None:
+            self.p.degree_T = self.p.degree
+        if self.p.degree_u is None:
+            self.p.degree_u = self.p.degree
+
+        # the temperature problem is not built in the mechanical mode, the degree of hydration is given by a
+        # hydration history at the quadrature points of the temperature problem instead
+        self.temperature_problem = None
+        self.temperature_solver = None
+        self.hydration_history = None
+        if self.p.problem_mode != 'mechanical':
+            # setting up the two nonlinear problems
+            self.temperature_problem = ConcreteTempHydrationModel(self.experiment.mesh, self.p, pv_name=self.pv_name)
+            self.q_alpha_source = self.temperature_problem.q_alpha
+            dx_alpha = self.temperature_problem.dxm
+        else:
+            q_degree = self.p.quadrature_degree or self.p.degree_T
+            metadata = {"quadrature_degree": q_degree, "quadrature_scheme": "default"}
+            dx_alpha = df.dx(metadata=metadata)
+            quadrature_element = df.FiniteElement("Quadrature", self.experiment.mesh.ufl_cell(), degree=q_degree,
+                                                  quad_scheme="default")
+            self.q_alpha_source = df.Function(df.FunctionSpace(self.experiment.mesh, quadrature_element),
+                                              name="degree of hydration")
+
+        # the mechanics problem is not built in the thermal mode
+        self.mechanics_problem = None
+        self.mechanics_solver = None
+        self.alpha_transfer = None
+        if self.p.problem_mode != 'thermal':
+            # here I "pass on the parameters from temperature to mechanics problem.."
+            self.mechanics_problem = ConcreteMechanicsModel(self.experiment.mesh, self.p, pv_name=self.pv_name)
+            # coupling of the output files
+            if self.temperature_problem is not None:
+                self.mechanics_problem.pv_file = self.temperature_problem.pv_file
+
+            # the degree of hydration is shared, when both problems use the same quadrature space, otherwise it is
+            # transferred to the quadrature points of the mechanics problem
+            if self.q_alpha_source.function_space().ufl_element() != self.mechanics_problem.q_V.ufl_element():
+                self.alpha_transfer = QuadratureTransfer(self.q_alpha_source, self.mechanics_problem.q_V,
+                                                         dx_alpha, self.mechanics_problem.dxm)
 
         # initialize concrete temperature as given in experimental setup
         self.set_inital_T(self.p.T_0)
 
         # setting bcs
-        self.mechanics_problem.set_bcs(self.experiment.create_displ_bcs(self.mechanics_problem.V))
-        self.temperature_problem.set_bcs(self.experiment.create_temp_bcs(self.temperature_problem.V))
+        if self.mechanics_problem is not None:
+            self.mechanics_problem.set_bcs(self.experiment.create_displ_bcs(self.mechanics_problem.V))
+        if self.temperature_problem is not None:
+            self.temperature_problem.set_bcs(self.experiment.create_temp_bcs(self.temperature_problem.V))
 
         # setting up the solvers
-        self.temperature_solver = df.NewtonSolver()
-        self.temperature_solver.parameters['absolute_tolerance'] = 1e-9
-        self.temperature_solver.parameters['relative_tolerance'] = 1e-8
-
-        self.mechanics_solver = df.NewtonSolver()
-        self.mechanics_solver.parameters['absolute_tolerance'] = 1e-9
-        self.mechanics_solver.parameters['relative_tolerance'] = 1e-8
-
-
-
-
+        if self.temperature_problem is not None:
+            self.temperature_solver = df.NewtonSolver()
+            self.temperature_solver.parameters['absolute_tolerance'] = 1e-9
+            self.temperature_solver.parameters['relative_tolerance'] = 1e-8
+
+        if self.mechanics_problem is not None:
+            self.mechanics_solver = df.NewtonSolver()
+            self.mechanics_solver.parameters['absolute_tolerance'] = 1e-9
+            self.mechanics_solver.parameters['relative_tolerance'] = 1e-8
+
+    def has_model(self, model):
+        return getattr(self, f'{model}_problem') is not None
+
+    def set_hydration_history(self, history):
+        """
+        sets the degree of hydration of the mechanical mode
+
+        Arguments:
+            history : HydrationHistory
+                degree of hydration at the quadrature points of the temperature problem over time, e.g. recorded
+                with a HydrationHistorySensor or read from the checkpoints of a previous run
+        """
+        self.hydration_history = history
+
+    def apply_hydration_history(self, t):
+        # sets the degree of hydration at time t from the hydration history
+        if self.hydration_history is None:
+            raise Exception('the mechanical mode requires a hydration history, see `set_hydration_history`')
+        values = self.hydration_history(t)
+        if len(values) != self.q_alpha_source.vector().local_size():
+            raise Exception(f'the hydration history has {len(values)} local values, the quadrature space has '
+                            f'{self.q_alpha_source.vector().local_size()}, the mesh, partition and quadrature degree '
+                            f'have to match the run it was recorded in')
+        set_q(self.q_alpha_source, values)
 
     def solve(self, t=1.0):
 
-        # print('Solving: T') # TODO ouput only a certain log level INFO
-        self.temperature_solver.solve(self.temperature_problem, self.temperature_problem.T.vector())
-
-        # set current DOH for computation of Young's modulus
-        self.mechanics_problem.q_alpha = self.temperature_problem.q_alpha
-        # print('Solving: u') # TODO ouput only a certain log level INFO
+        if self.temperature_problem is not None:
+            # print('Solving: T') # TODO ouput only a certain log level INFO
+            if self.p.time_scheme == 'explicit':
+                self.temperature_problem.solve_explicit()
+            else:
+                self.temperature_solver.solve(self.temperature_problem, self.temperature_problem.T.vector())
+        else:
+            self.apply_hydration_history(t)
 
-        # mechanics paroblem is not required for temperature, could crash in frist time steps but then be useful
-        try:
-            self.mechanics_solver.solve(self.mechanics_problem, self.mechanics_problem.u.vector())
-        except Exception as e:
-            print('AAAAAAAAAAHHHHHHHHHH!!!!!')
-            warnings.warn(f'Mechanics crashed at time: {t}, Error message: {e}')
-            
+        if self.mechanics_problem is not None:
+            # set current DOH for computation of Young's modulus
+            self.couple_alpha()
+            # print('Solving: u') # TODO ouput only a certain log level INFO
 
-        # history update
-        self.temperature_problem.update_history()
+            # mechanics paroblem is not required for temperature, could crash in frist time steps but then be useful
+            try:
+                self.mechanics_solver.solve(self.mechanics_problem, self.mechanics_problem.u.vector())
+            except Exception as e:
+                print('AAAAAAAAAAHHHHHHHHHH!!!!!')
+                warnings.warn(f'Mechanics crashed at time: {t}, Error message: {e}')
 
         # save fields to global problem for sensor output
-        self.displacement = self.mechanics_problem.u
-        self.temperature = self.temperature_problem.T
-        self.degree_of_hydration = df.project(self.temperature_problem.q_alpha, self.temperature_problem.visu_space, form_compiler_parameters={'quadrature_degree': self.p.degree})
-        self.q_degree_of_hydration = self.temperature_problem.q_alpha
-        self.q_yield = self.mechanics_problem.q_yield
-        self.stress = self.mechanics_problem.sigma_ufl
+        if self.temperature_problem is not None:
+            # history update
+            self.temperature_problem.update_history()
+
+            self.temperature = self.temperature_problem.T
+            self.q_temperature = self.temperature_problem.q_T
+        self.degree_of_hydration = None  # projected when a sensor accesses it
+        self.q_degree_of_hydration = self.q_alpha_source
+        if self.mechanics_problem is not None:
+            self.displacement = self.mechanics_problem.u
+            self.q_yield = self.mechanics_problem.q_yield
+            self.stress = self.mechanics_problem.sigma_ufl
 
         # get sensor data
         for sensor_name in self.sensors:
             # go through all sensors and measure
             self.sensors[sensor_name].measure(self, t)
 
+        # update the per point aggregates
+        for aggregate_name in self.aggregates:
+            self.aggregates[aggregate_name].update(self, t)
+
+        self.check_triggers(t)
+
+        if self.checkpoint_due():
+            self.write_checkpoint(t)
+
+    @property
+    def degree_of_hydration(self):
+        # the projection onto the visualisation space is a global solve, it is only done when a sensor needs it,
+        # at most once per time step
+        if self._degree_of_hydration is None and self.q_degree_of_hydration is not None:
+            model = self.temperature_problem if self.temperature_problem is not None else self.mechanics_problem
+            self._degree_of_hydration = model.visu_fields("DOH", model.q_alpha, model.visu_space)
+        return self._degree_of_hydration
+
+    @degree_of_hydration.setter
+    def degree_of_hydration(self, value):
+        self._degree_of_hydration = value
+
     def pv_plot(self, t=0):
         # calls paraview output for both problems
-        self.temperature_problem.pv_plot(t=t)
-        self.mechanics_problem.pv_plot(t=t)
+        if not self.output_due():
+            return
+        if self.temperature_problem is not None:
+            self.temperature_problem.pv_plot(t=t)
+        if self.mechanics_problem is not None:
+            self.mechanics_problem.pv_plot(t=t)
+
+    def pv_close(self):
+        # writes the remaining paraview output and checkpoint and closes the file, shared by both problems
+        self.flush_checkpoint()
+        if self.temperature_problem is not None:
+            self.temperature_problem.pv_file.close()
+        else:
+            self.mechanics_problem.pv_file.close()
+
+    def open_pv_file(self):
+        # both problems write to the same file
+        pv_file = create_pv_file(self.experiment.mesh, self.pv_name, self.p.pv_async, self.p.pv_region,
+                                 self.p.pv_precision)
+        for model in (self.temperature_problem, self.mechanics_problem):
+            if model is not None:
+                model.pv_file = pv_file
+
+    def pv_plot_aggregates(self, t=0):
+        # paraview output of the per point aggregates, meant to be called once at the end
+        model = self.temperature_problem if self.temperature_problem is not None else self.mechanics_problem
+        for aggregate_name in self.aggregates:
+            for field_name, values in self.aggregates[aggregate_name].fields().items():
+                model.pv_plot_quadrature_values(values, field_name, t=t)
+
+    def apply_parameters(self, changed):
+        if self.temperature_problem is not None:
+            self.temperature_problem.update_parameters()
+        if self.mechanics_problem is not None:
+            self.mechanics_problem.update_parameters()
+        # the boundary values are set when the boundary conditions are created
+        if any(key in self.experiment.p for key in changed):
+            if self.temperature_problem is not None:
+                self.temperature_problem.set_bcs(self.experiment.create_temp_bcs(self.temperature_problem.V))
+            if self.mechanics_problem is not None:
+                self.mechanics_problem.set_bcs(self.experiment.create_displ_bcs(self.mechanics_problem.V))
+
+    def reset_fields(self):
+        if self.temperature_problem is not None:
+            self.temperature_problem.reset()
+        if self.mechanics_problem is not None:
+            self.mechanics_problem.reset()
+        self.set_inital_T(self.p.T_0)
+
+    def get_field_state(self):
+        fields = {}
+        if self.temperature_problem is not None:
+            fields['temperature'] = self.temperature_problem.get_state()
+        if self.mechanics_problem is not None:
+            fields['mechanics'] = self.mechanics_problem.get_state()
+        return fields
+
+    def set_field_state(self, fields):
+        if self.temperature_problem is not None:
+            self.temperature_problem.set_state(fields['temperature'])
+        if self.mechanics_problem is not None:
+            self.mechanics_problem.set_state(fields['mechanics'])
+            # in the mechanical mode the degree of hydration is set from the hydration history in the next solve
+            if self.temperature_problem is not None:
+                self.couple_alpha()
+
+    def couple_alpha(self):
+        # passes the degree of hydration of the temperature problem or the hydration history to the mechanics problem
+        if self.alpha_transfer is None:
+            self.mechanics_problem.q_alpha = self.q_alpha_source
+        else:
+            self.alpha_transfer(self.mechanics_problem.q_alpha)
 
     def set_inital_T(self, T):
-        self.temperature_problem.set_initial_T(T)
+        if self.temperature_problem is not None:
+            self.temperature_problem.set_initial_T(T)
 
     def set_timestep(self, dt):
-        self.temperature_problem.set_timestep(dt)
+        if self.temperature_problem is not None:
+            self.temperature_problem.set_timestep(dt)
 
     def get_heat_of_hydration_ftk(self):
-        return self.temperature_problem.heat_of_hydration_ftk
+        # the hydration functions do not need the fields, a meshless model is used in the mechanical mode
+        temperature_problem = self.temperature_problem
+        if temperature_problem is None:
+            temperature_problem = ConcreteTempHydrationModel(None, self.p)
+        return temperature_problem.heat_of_hydration_ftk
 
     def get_E_alpha_fkt(self):
-        return np.vectorize(self.mechanics_problem.E_fkt)
+        # the material functions do not need the fields, a meshless model is used in the thermal mode
+        mechanics_problem = self.mechanics_problem
+        if mechanics_problem is None:
+            mechanics_problem = ConcreteMechanicsModel(None, self.p)
+        return np.vectorize(mechanics_problem.E_fkt)
 
     def get_X_alpha_fkt(self):
-        return self.mechanics_problem.general_hydration_fkt
+        mechanics_problem = self.mechanics_problem
+        if mechanics_problem is None:
+            mechanics_problem = ConcreteMechanicsModel(None, self.p)
+        return mechanics_problem.general_hydration_fkt
 
 
 class ConcreteTempHydrationModel(df.NonlinearProblem):
+    # fields and histories of the state of the problem
+    state_fields = ('T', 'T_n', 'T_nn', 'q_T', 'q_T_n', 'q_alpha', 'q_alpha_n', 'q_delta_alpha', 'q_ddalpha_dT',
+                    'q_alpha_nn', 'q_rate_n', 'q_alpha_rate')
+
     def __init__(self, mesh, p, pv_name='temp_output', **kwargs):
         df.NonlinearProblem.__init__(self)  # apparently required to initialize things
         self.p = p
 
         if mesh != None:
             # initialize possible paraview output
-            self.pv_file = df.XDMFFile(pv_name + '.xdmf')
-            self.pv_file.parameters["flush_output"] = True
-            self.pv_file.parameters["functions_share_mesh"] = True
+            self.pv_file = create_pv_file(mesh, pv_name, self.p.pv_async, self.p.pv_region,
+                                          self.p.pv_precision)
+            self.pv_encoding = pv_encoding(mesh, self.p.pv_encoding)
             # function space for single value per element, required for plot of quadrature space values
 
             # initialize timestep, musst be reset using .set_timestep(dt)
             self.dt = 0
             self.dt_form = df.Constant(self.dt)
 
-            if self.p.degree == 1:
+            # polynomial and quadrature degree of the temperature
+            degree = self.p.get('degree_T') or self.p.degree
+            q_degree = self.p.get('quadrature_degree') or degree
+
+            if q_degree == 1:
                 self.visu_space = df.FunctionSpace(mesh, "DG", 0)
             else:
                 self.visu_space = df.FunctionSpace(mesh, "P", 1)
 
-            metadata = {"quadrature_degree": self.p.degree, "quadrature_scheme": "default"}
+            metadata = {"quadrature_degree": q_degree, "quadrature_scheme": "default"}
             dxm = df.dx(metadata=metadata)
+            self.dxm = dxm
+            self.visu_fields = VisuFields(dxm, self.p.pv_fields)  # cached projections for the paraview output
 
             # solution field
-            self.V = df.FunctionSpace(mesh, 'P', self.p.degree)
+            self.V = df.FunctionSpace(mesh, 'P', degree)
 
             # generic quadrature function space
             cell = mesh.ufl_cell()
             q = "Quadrature"
-            quadrature_element = df.FiniteElement(q, cell, degree=self.p.degree, quad_scheme="default")
+            quadrature_element = df.FiniteElement(q, cell, degree=q_degree, quad_scheme="default")
             q_V = df.FunctionSpace(mesh, quadrature_element)
+            self.q_V = q_V
+            self.q_values = None  # buffer for the output of quadrature values
 
             # quadrature functions
             self.q_T = df.Function(q_V, name="temperature")
@@ -194,6 +411,12 @@ class ConcreteTempHydrationModel(df.NonlinearProblem):
             self.q_alpha_n = df.Function(q_V, name="degree of hydration last time step")
             self.q_delta_alpha = df.Function(q_V, name="inrease in degree of hydration")
             self.q_ddalpha_dT = df.Function(q_V, name="derivative of delta alpha wrt temperature")
+            # histories of the second order time schemes and the hydration of the step in the heat balance
+            self.q_alpha_nn = df.Function(q_V, name="degree of hydration second last time step")
+            self.q_rate_n = df.Function(q_V, name="rate of hydration last time step")
+            self.q_alpha_rate = df.Function(q_V, name="hydration of the time step")
+            self.q_T_n = df.Function(q_V, name="temperature last time step")
+            self.substeps = None  # sub steps of the hydration per point, set in the first evaluation of a step
 
             # empfy list for newton iteration to compute delta alpha using the last value as starting point
             self.delta_alpha_n_list = np.full(np.shape(self.q_alpha_n.vector().get_local()), 0.2)
@@ -205,70 +428,63 @@ class ConcreteTempHydrationModel(df.NonlinearProblem):
             self.delta_alpha = 0
 
             # Define variational problem
-            self.T = df.Function(self.V)  # temperature
+            self.T = df.Function(self.V, name="Temperature")  # temperature
             self.T_n = df.Function(self.V)  # overwritten later...
+            self.T_nn = df.Function(self.V)  # second last time step, for bdf2
             T_ = df.TrialFunction(self.V)  # temperature
             vT = df.TestFunction(self.V)
 
+            # material parameters, can be changed with `update_parameters` without rebuilding the forms
+            self.vol_heat_cap = df.Constant(self.p.vol_heat_cap)
+            self.themal_cond = df.Constant(self.p.themal_cond)
+            self.Q_inf = df.Constant(self.p.Q_inf)
+
+            # weight of the volume integrals, 2 pi r in the axisymmetric case
+            w = volume_weight(mesh, self.p)
+
+            # coefficients of the time scheme, a0 T + a1 T_n + a2 T_nn = dt * (theta f + (1 - theta) f_n)
+            self.n_steps = 0  # completed time steps, the second order schemes need a history
+            self.dt_n = 0  # time step of the last step
+            self.time_coefficients = (1.0, -1.0, 0.0, 1.0)
+            self.a_form = [df.Constant(a) for a in self.time_coefficients[:3]]
+            self.theta_form = df.Constant(1.0)
+            self.update_time_coefficients()
+            a0, a1, a2 = self.a_form
+            theta = self.theta_form
+
             # normal form
-            R_ufl = df.Constant(self.p.vol_heat_cap) * (self.T) * vT * dxm
-            R_ufl += self.dt_form * df.dot(df.Constant(self.p.themal_cond) * df.grad(self.T), df.grad(vT)) * dxm
-            R_ufl += -  df.Constant(self.p.vol_heat_cap) * self.T_n * vT * dxm
+            R_ufl = self.vol_heat_cap * (a0 * self.T + a1 * self.T_n + a2 * self.T_nn) * vT * w * dxm
+            R_ufl += self.dt_form * df.dot(self.themal_cond * df.grad(theta * self.T + (1 - theta) * self.T_n),
+                                           df.grad(vT)) * w * dxm
             # quadrature point part
 
-            self.R = R_ufl - df.Constant(
-                self.p.Q_inf) * self.q_delta_alpha * vT * dxm
+            self.R = R_ufl - self.Q_inf * self.q_alpha_rate * vT * w * dxm
 
             # derivative
             # normal form
             dR_ufl = df.derivative(R_ufl, self.T)
             # quadrature part
-            self.dR = dR_ufl - df.Constant(
-                self.p.Q_inf) * self.q_ddalpha_dT * T_ * vT * dxm
+            self.dR = dR_ufl - self.Q_inf * self.q_ddalpha_dT * T_ * vT * w * dxm
 
             # setup projector to project continuous funtionspace to quadrature
             self.project_T = LocalProjector(self.T, q_V, dxm)
 
+            # forms of the explicit time integration, assembled with the first explicit step
+            self.mass_form = T_ * vT * w * dxm
+            self.conductivity_form = df.dot(df.grad(T_), df.grad(vT)) * w * dxm
+            self.source_form = self.Q_inf * self.q_delta_alpha * vT * w * dxm
+            self.lumped_mass = None
+
             self.assembler = None  # set as default, to check if bc have been added???
+            self.bcs = []
 
     def delta_alpha_fkt(self, delta_alpha, alpha_n, T):
-        return delta_alpha - self.dt * self.affinity(delta_alpha, alpha_n) * self.temp_adjust(T)
+        return hydration.delta_alpha_fkt(delta_alpha, alpha_n, T, self.dt, self.p)
 
     def delta_alpha_prime(self, delta_alpha, alpha_n, T):
-        return 1 - self.dt * self.daffinity_ddalpha(delta_alpha, alpha_n) * self.temp_adjust(T)
+        return hydration.delta_alpha_prime(delta_alpha, alpha_n, T, self.dt, self.p)
 
     def heat_of_hydration_ftk(self, T, time_list, dt, parameter):
-
-        def interpolate(x, x_list, y_list):
-            # assuming ordered x list
-
-            i = 0
-            # check if x is in the dataset
-            if x > x_list[-1]:
-                print(' * Warning!!!: Extrapolation!!!')
-                point1 = (x_list[-2], y_list[-2])
-                point2 = (x_list[-1], y_list[-1])
-            elif x < x_list[0]:
-                print(' * Warning!!!: Extrapolation!!!')
-                point1 = (x_list[0], y_list[0])
-                point2 = (x_list[1], y_list[1])
-            else:
-                while x_list[i] < x:
-                    i += 1
-                point1 = (x_list[i - 1], y_list[i - 1])
-                point2 = (x_list[i], y_list[i])
-
-            slope = (point2[1] - point1[1]) / (point2[0] - point1[0])
-            x_increment = x - point1[0]
-            y_increment = slope * x_increment
-            y = point1[1] + y_increment
-
-            return y
-
-        # get tmax, identify number of time steps, then interpolate data
-        # assuming time list is ordered!!!
-        tmax = time_list[-1]
-
         # set paramters
         self.p.B1 = parameter['B1']
         self.p.B2 = parameter['B2']
@@ -278,76 +494,7 @@ class ConcreteTempHydrationModel(df.NonlinearProblem):
         self.p.T_ref = parameter['T_ref']
         self.p.Q_pot = parameter['Q_pot']
 
-        # set time step
-        self.dt = dt
-
-        t = 0
-        time = [0.0]
-        heat = [0.0]
-        alpha_list = [0.0]
-        alpha = 0
-        delta_alpha = 0.0
-
-        error_flag = False
-        while t < tmax:
-            # compute delta_alpha
-            try:
-                delta_alpha = scipy.optimize.newton(self.delta_alpha_fkt, args=(alpha, T + self.p.zero_C),
-                                                    fprime=self.delta_alpha_prime, x0=delta_alpha)
-                if delta_alpha < 0:
-                    raise Exception(
-                        f'Problem with solving for delta alpha. Result is negative for starting delta alpha = {delta_alpha}')
-            except:
-                delta_alpha = 0.2
-                try:
-                    delta_alpha = scipy.optimize.newton(self.delta_alpha_fkt, args=(alpha, T + self.p.zero_C),
-                                                        fprime=self.delta_alpha_prime, x0=delta_alpha)
-                    if delta_alpha < 0:
-                        raise Exception(
-                            'Problem with solving for delta alpha. Result is negative for starting delta alpha = 0.2')
-                except:
-                    delta_alpha = 0.5
-                    try:
-                        delta_alpha = scipy.optimize.newton(self.delta_alpha_fkt, args=(alpha, T + self.p.zero_C),
-                                                            fprime=self.delta_alpha_prime, x0=delta_alpha)
-                        if delta_alpha < 0:
-                            raise Exception(
-                                'Problem with solving for delta alpha. Result is negative for starting delta alpha = 0.5')
-                    except:
-                        delta_alpha = 1.0
-
-                        try:
-                            delta_alpha = scipy.optimize.newton(self.delta_alpha_fkt, args=(alpha, T + self.p.zero_C),
-                                                                fprime=self.delta_alpha_prime, x0=delta_alpha)
-                            if delta_alpha < 0:
-                                raise Exception('Problem with solving for delta alpha. Result is negative.')
-                        except:
-                            error_flag = True
-                            break
-
-            # update alpha
-            alpha = delta_alpha + alpha
-            # save heat of hydration
-            alpha_list.append(alpha)
-            heat.append(alpha * self.p.Q_pot)
-
-            # timeupdate
-            t = t + self.dt
-            time.append(t)
-
-        # if there was a probem with the computation (bad input values), return zero
-        if error_flag:
-            heat_interpolated = np.zeros_like(time_list)
-            alpha_interpolated = np.zeros_like(time_list)
-        else:
-            # interpolate heat to match time_list
-            heat_interpolated = []
-            alpha_interpolated = []
-            for value in time_list:
-                heat_interpolated.append(interpolate(value, time, heat))
-                alpha_interpolated.append(interpolate(value, time, alpha_list))
-
-        return np.asarray(heat_interpolated) / 1000, np.asarray(alpha_interpolated)
+        return hydration.heat_of_hydration(T, time_list, dt, self.p)
 
     def get_affinity(self):
         alpha_list = []
@@ -367,19 +514,34 @@ class ConcreteTempHydrationModel(df.NonlinearProblem):
         temperature_list = self.q_T.vector().get_local()
         alpha_n_list = self.q_alpha_n.vector().get_local()
 
+        if self.p.get('hydration_tolerance'):
+            self.evaluate_substeps(temperature_list, alpha_n_list)
+            return
+
+        # the time scheme a0 alpha + a1 alpha_n + a2 alpha_nn = dt * (theta r(alpha, T) + (1 - theta) r_n) is
+        # written as backward euler step delta - dt_scheme * r(alpha_start + delta, T) = 0 from the explicit part
+        # alpha_start
+        a0, a1, a2, theta = self.time_coefficients
+        dt_scheme = self.dt * theta / a0
+        alpha_start_list = alpha_n_list
+        if self.time_coefficients != (1.0, -1.0, 0.0, 1.0):
+            alpha_start_list = alpha_n_list + (-(a0 + a1) * alpha_n_list
+                                               - a2 * self.q_alpha_nn.vector().get_local()
+                                               + self.dt * (1 - theta) * self.q_rate_n.vector().get_local()) / a0
+
         # solve for alpha at each quadrature point
         # here the newton raphson method of the scipy package is used
         # the zero value of the delta_alpha_fkt is found for each entry in alpha_n_list is found. the corresponding temparature
         # is given in temperature_list and as starting point the value of last step used from delta_alpha_n
         try:
-            delta_alpha_list = scipy.optimize.newton(self.delta_alpha_fkt, args=(alpha_n_list, temperature_list),
-                                                     fprime=self.delta_alpha_prime, x0=self.delta_alpha_n_list)
+            delta_alpha_list = hydration.solve_delta_alpha(alpha_start_list, temperature_list, dt_scheme, self.p,
+                                                           x0=self.delta_alpha_n_list)
             # I dont trust the algorithim!!! check if only applicable results are obtained
         except:
             # AAAAAAHHHH, negative delta alpha!!!!
             # NO PROBLEM!!!, different starting value!
-            delta_alpha_list = scipy.optimize.newton(self.delta_alpha_fkt, args=(alpha_n_list, temperature_list),
-                                                     fprime=self.delta_alpha_prime, x0=self.delta_alpha_guess)
+            delta_alpha_list = hydration.solve_delta_alpha(alpha_start_list, temperature_list, dt_scheme, self.p,
+                                                           x0=self.delta_alpha_guess)
             if np.any(delta_alpha_list < 0.0):
                 print('AAAAAAHHHH, negative delta alpha!!!!')
                 raise Exception(
@@ -389,32 +551,192 @@ class ConcreteTempHydrationModel(df.NonlinearProblem):
         self.delta_alpha_n_list = delta_alpha_list
 
         # compute current alpha
-        alpha_list = alpha_n_list + delta_alpha_list
-        # compute derivative of delta alpha with respect to temperature for rhs
-        ddalpha_dT_list = self.dt * self.affinity(alpha_list, alpha_n_list) * self.temp_adjust_tangent(temperature_list)
+        alpha_list = alpha_start_list + delta_alpha_list
+        # hydration in the heat balance of the time step, a0 alpha + a1 alpha_n + a2 alpha_nn
+        alpha_rate_list = a0 * (alpha_list - alpha_start_list)
+        if theta != 1:
+            alpha_rate_list += self.dt * (1 - theta) * self.q_rate_n.vector().get_local()
+        # compute derivative of the hydration of the time step with respect to temperature for the tangent
+        ddalpha_dT_list = a0 * dt_scheme * self.affinity(delta_alpha_list, alpha_start_list) \
+                          * self.temp_adjust_tangent(temperature_list) \
+                          / hydration.delta_alpha_prime(delta_alpha_list, alpha_start_list, temperature_list,
+                                                        dt_scheme, self.p)
 
         # project lists onto quadrature spaces
         set_q(self.q_alpha, alpha_list)
-        set_q(self.q_delta_alpha, delta_alpha_list)
+        set_q(self.q_delta_alpha, alpha_list - alpha_n_list)
+        set_q(self.q_alpha_rate, alpha_rate_list)
+        set_q(self.q_ddalpha_dT, ddalpha_dT_list)
+
+    def evaluate_substeps(self, temperature_list, alpha_n_list):
+        # backward euler step of the degree of hydration with adaptive sub steps at each quadrature point, the
+        # number of sub steps is fixed in the first evaluation of the time step to keep the residual smooth for the
+        # newton solver
+        T_n_list = self.q_T_n.vector().get_local()
+        if self.substeps is None:
+            self.substeps = hydration.hydration_substeps(alpha_n_list, T_n_list, temperature_list, self.dt, self.p,
+                                                         self.p.hydration_tolerance, self.p.hydration_max_substeps)
+        alpha_list, ddalpha_dT_list = hydration.substep_alpha(alpha_n_list, T_n_list, temperature_list, self.dt,
+                                                              self.p, self.substeps)
+
+        set_q(self.q_alpha, alpha_list)
+        set_q(self.q_delta_alpha, alpha_list - alpha_n_list)
+        set_q(self.q_alpha_rate, alpha_list - alpha_n_list)
         set_q(self.q_ddalpha_dT, ddalpha_dT_list)
 
     def update_history(self):
+        if self.time_coefficients[3] != 1:
+            # rate of hydration at the end of the step, the explicit part of the next step
+            temperature_list = self.q_T.vector().get_local()
+            set_q(self.q_rate_n, self.affinity(self.q_alpha.vector().get_local(), 0) * self.temp_adjust(temperature_list))
+        self.T_nn.assign(self.T_n)
+        self.q_alpha_nn.assign(self.q_alpha_n)
         self.T_n.assign(self.T)  # save temparature field
+        self.q_T_n.assign(self.q_T)
         self.q_alpha_n.assign(self.q_alpha)  # save alpha field
+        self.substeps = None
+        self.n_steps += 1
+        self.dt_n = self.dt
+        self.update_time_coefficients()
+
+    def update_time_coefficients(self):
+        # coefficients (a0, a1, a2, theta) of the time scheme, the first step of bdf2 is a backward euler step
+        scheme = self.p.get('time_scheme')
+        if scheme == 'crank-nicolson':
+            coefficients = (1.0, -1.0, 0.0, 0.5)
+        elif scheme == 'bdf2' and self.n_steps > 0 and self.dt > 0:
+            # variable step size bdf2, omega is the ratio of the current and the last time step
+            omega = self.dt / self.dt_n
+            coefficients = ((1 + 2 * omega) / (1 + omega), -(1 + omega), omega ** 2 / (1 + omega), 1.0)
+        else:
+            coefficients = (1.0, -1.0, 0.0, 1.0)
+        self.time_coefficients = coefficients
+        for constant, value in zip(self.a_form, coefficients[:3]):
+            constant.assign(value)
+        self.theta_form.assign(coefficients[3])
+
+    def update_parameters(self):
+        # sets the constants of the forms to the current parameters, the hydration uses the parameters directly
+        self.vol_heat_cap.assign(self.p.vol_heat_cap)
+        self.themal_cond.assign(self.p.themal_cond)
+        self.Q_inf.assign(self.p.Q_inf)
+
+    def reset(self):
+        # initial fields, the temperature and the initial rate of hydration are set separately with `set_initial_T`
+        for name in ['q_T', 'q_alpha', 'q_alpha_n', 'q_delta_alpha', 'q_ddalpha_dT', 'q_alpha_nn', 'q_rate_n',
+                     'q_alpha_rate']:
+            getattr(self, name).vector().zero()
+        self.delta_alpha_n_list.fill(0.2)
+        self.substeps = None
+        self.n_steps = 0
+        self.dt_n = 0
+        self.update_time_coefficients()
+
+    def get_state(self):
+        # copies of the local values of the fields and histories
+        state = {name: getattr(self, name).vector().get_local() for name in self.state_fields}
+        state['delta_alpha_n_list'] = np.copy(self.delta_alpha_n_list)
+        state['dt'] = self.dt
+        state['n_steps'] = self.n_steps
+        state['dt_n'] = self.dt_n
+        return state
+
+    def set_state(self, state):
+        for name in self.state_fields:
+            set_q(getattr(self, name), state[name])
+        self.delta_alpha_n_list = np.copy(state['delta_alpha_n_list'])
+        self.n_steps = state['n_steps']
+        self.dt_n = state['dt_n']
+        self.set_timestep(state['dt'])
 
     def set_timestep(self, dt):
         self.dt = dt
         self.dt_form.assign(df.Constant(self.dt))
+        self.substeps = None
+        self.update_time_coefficients()
 
     def set_initial_T(self, T):
         # set initial temperature, in kelvin
         T0 = df.Expression('t_zero', t_zero=T + self.p.zero_C, degree=0)
+        self.T_nn.interpolate(T0)
         self.T_n.interpolate(T0)
         self.T.interpolate(T0)
+        self.project_T(self.q_T_n)
+        # rate of hydration at the initial temperature, the explicit part of the first crank-nicolson step
+        alpha_list = self.q_alpha_n.vector().get_local()
+        set_q(self.q_rate_n, self.affinity(alpha_list, 0) * self.temp_adjust(self.q_T_n.vector().get_local()))
 
     def set_bcs(self, bcs):
         # Only now (with the bcs) can we initialize the assembler
         self.assembler = df.SystemAssembler(self.dR, self.R, bcs)
+        self.bcs = bcs
+
+    def assemble_explicit(self):
+        # lumped capacity matrix without the volumetric heat capacity and the conductivity matrix without the
+        # thermal conductivity
+        M = df.assemble(self.mass_form)
+        self.conductivity_matrix = df.assemble(self.conductivity_form)
+        self.source = self.T.vector().copy()
+
+        row_sums = self.T.vector().copy()
+        ones = self.T.vector().copy()
+        ones[:] = 1
+        M.mult(ones, row_sums)
+        if self.V.ufl_element().degree() == 1:
+            self.lumped_mass = row_sums.get_local()
+        else:
+            # the row sums of higher order elements can be zero or negative, the diagonal is scaled to the total
+            # mass instead
+            diagonal = self.T.vector().copy()
+            M.get_diagonal(diagonal)
+            self.lumped_mass = diagonal.get_local() * row_sums.sum() / diagonal.sum()
+
+        # largest eigenvalue of the lumped system, bounded by the row sums of the absolute values
+        indptr, _, values = df.as_backend_type(self.conductivity_matrix).mat().getValuesCSR()
+        abs_row_sums = np.add.reduceat(np.abs(values), indptr[:-1])
+        comm = self.T.function_space().mesh().mpi_comm()
+        self.max_eigenvalue = df.MPI.max(comm, float(np.max(abs_row_sums / self.lumped_mass)))
+
+    def stable_timestep(self):
+        """largest stable time step of the explicit integration
+
+        the critical time step 2 / lambda_max of the lumped system scales with h_min^2 * vol_heat_cap / themal_cond
+        """
+        if self.lumped_mass is None:
+            self.assemble_explicit()
+        return 2 * self.p.vol_heat_cap / (self.p.themal_cond * self.max_eigenvalue)
+
+    def solve_explicit(self):
+        """
+        explicit time step of the temperature with the lumped capacity matrix, no linear systems are solved
+
+        the time step is divided into equal stable sub steps, in each sub step the degree of hydration at the
+        quadrature points is integrated implicitly with the temperature at the start of the sub step
+        """
+        if self.dt <= 0:
+            raise RuntimeError("You need to `.set_timestep(dt)` larger than zero before the solve!")
+        if self.lumped_mass is None:
+            self.assemble_explicit()
+
+        # 10 % safety to the estimated critical time step
+        dt = self.dt
+        n_steps = int(np.ceil(dt / (0.9 * self.stable_timestep())))
+        self.set_timestep(dt / n_steps)
+        for i in range(n_steps):
+            if i > 0:
+                self.update_history()
+            # hydration and heat source with the temperature at the start of the sub step
+            self.T.assign(self.T_n)
+            self.evaluate_material()
+            df.assemble(self.source_form, tensor=self.source)
+            self.conductivity_matrix.mult(self.T_n.vector(), self.T.vector())
+
+            T_n_list = self.T_n.vector().get_local()
+            flux = self.source.get_local() - self.dt * self.p.themal_cond * self.T.vector().get_local()
+            set_q(self.T, T_n_list + flux / (self.p.vol_heat_cap * self.lumped_mass))
+            for bc in self.bcs:
+                bc.apply(self.T.vector())
+        self.set_timestep(dt)
 
     def F(self, b, x):
         if self.dt <= 0:
@@ -430,55 +752,43 @@ class ConcreteTempHydrationModel(df.NonlinearProblem):
     def pv_plot(self, t=0):
         # paraview export
 
-        # temperature plot
-        T_plot = df.project(self.T, self.V)
-        T_plot.rename("Temperature", "test string, what does this do??")  # TODO: what does the second string do?
-        self.pv_file.write(T_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
+        # temperature plot, written directly without projection
+        if self.visu_fields.selected("Temperature"):
+            self.pv_file.write(self.T, t, encoding=self.pv_encoding)
 
         # degree of hydration plot
-        alpha_plot = df.project(self.q_alpha, self.visu_space,
-                                form_compiler_parameters={'quadrature_degree': self.p.degree})
-        alpha_plot.rename("DOH", "test string, what does this do??")  # TODO: what does the second string do?
-        self.pv_file.write(alpha_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
+        if self.visu_fields.selected("DOH"):
+            alpha_plot = self.visu_fields("DOH", self.q_alpha, self.visu_space)
+            self.pv_file.write(alpha_plot, t, encoding=self.pv_encoding)
+
+    def pv_plot_quadrature_values(self, values, name, t=0):
+        # paraview export of an array with one value per quadrature point
+        if self.q_values is None:
+            self.q_values = df.Function(self.q_V)
+        set_q(self.q_values, values)
+        values_plot = self.visu_fields(name, self.q_values, self.visu_space)
+        self.pv_file.write(values_plot, t, encoding=self.pv_encoding)
 
     def temp_adjust(self, T):
-        val = 1
-        if self.p.temp_adjust_law == 'exponential':
-            val = np.exp(-self.p.E_act / self.p.igc * (1 / T - 1 / (self.p.T_ref + self.p.zero_C)))
-        elif self.p.temp_adjust_law == 'off':
-            pass
-        else:
-            # TODO throw correct error
-            raise Exception(
-                f'Warning: Incorrect temp_adjust_law {self.p.temp_adjust_law} given, only "exponential" and "off" implemented')
-        return val
-
-        # derivative of the temperature adjustment factor with respect to the temperature
+        return hydration.temp_adjust(T, self.p)
 
+    # derivative of the temperature adjustment factor with respect to the temperature
     def temp_adjust_tangent(self, T):
-        val = 0
-        if self.p.temp_adjust_law == 'exponential':
-            val = self.temp_adjust(T) * self.p.E_act / self.p.igc / T ** 2
-        return val
+        return hydration.temp_adjust_tangent(T, self.p)
 
     # affinity function
     def affinity(self, delta_alpha, alpha_n):
-        affinity = self.p.B1 * (self.p.B2 / self.p.alpha_max + delta_alpha + alpha_n) * (
-                self.p.alpha_max - (delta_alpha + alpha_n)) * np.exp(
-            -self.p.eta * (delta_alpha + alpha_n) / self.p.alpha_max)
-        return affinity
+        return hydration.affinity(delta_alpha, alpha_n, self.p)
 
     # derivative of affinity with respect to delta alpha
     def daffinity_ddalpha(self, delta_alpha, alpha_n):
-        affinity_prime = self.p.B1 * np.exp(-self.p.eta * (delta_alpha + alpha_n) / self.p.alpha_max) * (
-                (self.p.alpha_max - (delta_alpha + alpha_n)) * (
-                self.p.B2 / self.p.alpha_max + (delta_alpha + alpha_n)) * (
-                        -self.p.eta / self.p.alpha_max) - self.p.B2 / self.p.alpha_max - 2 * (
-                        delta_alpha + alpha_n) + self.p.alpha_max)
-        return affinity_prime
+        return hydration.daffinity_ddalpha(delta_alpha, alpha_n, self.p)
 
 
 class ConcreteMechanicsModel(df.NonlinearProblem):
+    # fields of the state of the problem
+    state_fields = ('u', 'q_E', 'q_fc', 'q_ft', 'q_yield', 'q_sigma')
+
     def __init__(self, mesh, p, pv_name='mechanics_output', **kwargs):
         df.NonlinearProblem.__init__(self)  # apparently required to initialize things
         self.p = p
@@ -489,38 +799,52 @@ class ConcreteMechanicsModel(df.NonlinearProblem):
             self.stress_vector_dim = 3
         elif self.p.dim == 3:
             self.stress_vector_dim = 6
+        # the axisymmetric stress tensor is 3x3, including the hoop stress
+        tensor_shape = None
+        if self.p.axisymmetric:
+            self.stress_vector_dim = 6
+            tensor_shape = (3, 3)
 
         # todo: I do not like the "meshless" setup right now
         if mesh != None:
+            self.mesh = mesh
             # initialize possible paraview output
-            self.pv_file = df.XDMFFile(pv_name + '.xdmf')
-            self.pv_file.parameters["flush_output"] = True
-            self.pv_file.parameters["functions_share_mesh"] = True
+            self.pv_file = create_pv_file(mesh, pv_name, self.p.pv_async, self.p.pv_region,
+                                          self.p.pv_precision)
+            self.pv_encoding = pv_encoding(mesh, self.p.pv_encoding)
             # function space for single value per element, required for plot of quadrature space values
 
+            # polynomial and quadrature degree of the displacement
+            degree = self.p.get('degree_u') or self.p.degree
+            q_degree = self.p.get('quadrature_degree') or degree
+
             #
-            if self.p.degree == 1:
+            if q_degree == 1:
                 self.visu_space = df.FunctionSpace(mesh, "DG", 0)
-                self.visu_space_T = df.TensorFunctionSpace(mesh, "DG", 0)
+                self.visu_space_T = df.TensorFunctionSpace(mesh, "DG", 0, shape=tensor_shape)
             else:
                 self.visu_space = df.FunctionSpace(mesh, "P", 1)
-                self.visu_space_T = df.TensorFunctionSpace(mesh, "P", 1)
+                self.visu_space_T = df.TensorFunctionSpace(mesh, "P", 1, shape=tensor_shape)
 
-            metadata = {"quadrature_degree": self.p.degree, "quadrature_scheme": "default"}
+            metadata = {"quadrature_degree": q_degree, "quadrature_scheme": "default"}
             dxm = df.dx(metadata=metadata)
+            self.dxm = dxm
+            self.visu_fields = VisuFields(dxm, self.p.pv_fields)  # cached projections for the paraview output
 
             # solution field
-            self.V = df.VectorFunctionSpace(mesh, 'P', self.p.degree)
+            self.V = df.VectorFunctionSpace(mesh, 'P', degree)
 
             # generic quadrature function space
             cell = mesh.ufl_cell()
             q = "Quadrature"
 
-            quadrature_element = df.FiniteElement(q, cell, degree=self.p.degree, quad_scheme="default")
-            quadrature_vector_element = df.VectorElement(q, cell, degree=self.p.degree, dim=self.stress_vector_dim,
+            quadrature_element = df.FiniteElement(q, cell, degree=q_degree, quad_scheme="default")
+            quadrature_vector_element = df.VectorElement(q, cell, degree=q_degree, dim=self.stress_vector_dim,
                                                          quad_scheme="default")
             q_V = df.FunctionSpace(mesh, quadrature_element)
             q_VT = df.FunctionSpace(mesh, quadrature_vector_element)
+            self.q_V = q_V
+            self.q_values = None  # buffer for the output of quadrature values
 
             # quadrature functions
             self.q_E = df.Function(q_V, name="youngs modulus")
@@ -534,29 +858,30 @@ class ConcreteMechanicsModel(df.NonlinearProblem):
             self.q_alpha.vector()[:] = 1
 
             # Define variational problem
-            self.u = df.Function(self.V)  # displacement
+            self.u = df.Function(self.V, name="Displacement")  # displacement
             v = df.TestFunction(self.V)
 
-            # Elasticity parameters without multiplication with E
-            x_mu = 1.0 / (2.0 * (1.0 + self.p.nu))
-            x_lambda = 1.0 * self.p.nu / ((1.0 + self.p.nu) * (1.0 - 2.0 * self.p.nu))
+            # Elasticity parameters without multiplication with E, can be changed with `update_parameters`
+            self.x_mu = df.Constant(1.0 / (2.0 * (1.0 + self.p.nu)))
+            self.x_lambda = df.Constant(1.0 * self.p.nu / ((1.0 + self.p.nu) * (1.0 - 2.0 * self.p.nu)))
+            x_mu = self.x_mu
+            x_lambda = self.x_lambda
+            eps = self.eps
 
             # Stress computation for linear elastic problem without multiplication with E
             def x_sigma(v):
-                return 2.0 * x_mu * df.sym(df.grad(v)) + x_lambda * df.tr(df.sym(df.grad(v))) * df.Identity(len(v))
+                return 2.0 * x_mu * eps(v) + x_lambda * df.tr(eps(v)) * df.Identity(eps(v).ufl_shape[0])
 
-            # Volume force            
-            if self.p.dim == 1:
-                f = df.Constant(-self.p.g * self.p.density)
-            elif self.p.dim == 2:
-                f = df.Constant((0, -self.p.g * self.p.density))
-            elif self.p.dim == 3:
-                f = df.Constant((0, 0, -self.p.g * self.p.density))
+            # Volume force
+            self.f = df.Constant(self.volume_force())
+            f = self.f
 
             self.sigma_ufl = self.q_E * x_sigma(self.u)
 
-            R_ufl = self.q_E * df.inner(x_sigma(self.u), df.sym(df.grad(v))) * dxm
-            R_ufl += - df.inner(f, v) * dxm  # add volumetric force, aka gravity (in this case)
+            # weight of the volume integrals, 2 pi r in the axisymmetric case
+            w = volume_weight(mesh, self.p)
+            R_ufl = self.q_E * df.inner(x_sigma(self.u), eps(v)) * w * dxm
+            R_ufl += - df.inner(f, v) * w * dxm  # add volumetric force, aka gravity (in this case)
             # quadrature point part
             self.R = R_ufl
 
@@ -570,6 +895,12 @@ class ConcreteMechanicsModel(df.NonlinearProblem):
 
             self.assembler = None  # set as default, to check if bc have been added???
 
+    def eps(self, v):
+        # strain of the displacement field, 3x3 in (r, z, theta) for axisymmetric problems
+        if self.p.axisymmetric:
+            return axisymmetric_strain(v, self.mesh)
+        return df.sym(df.grad(v))
+
     def sigma_voigt(self, s):
         # 1D option
         if s.ufl_shape == (1, 1):
@@ -747,6 +1078,32 @@ class ConcreteMechanicsModel(df.NonlinearProblem):
         # no history field currently
         pass
 
+    def volume_force(self):
+        # gravity, in the last direction
+        force = [0.0] * self.p.dim
+        force[-1] = -self.p.g * self.p.density
+        return force[0] if self.p.dim == 1 else force
+
+    def update_parameters(self):
+        # sets the constants of the forms to the current parameters, the other material functions use the
+        # parameters directly
+        self.x_mu.assign(1.0 / (2.0 * (1.0 + self.p.nu)))
+        self.x_lambda.assign(1.0 * self.p.nu / ((1.0 + self.p.nu) * (1.0 - 2.0 * self.p.nu)))
+        self.f.assign(df.Constant(self.volume_force()))
+
+    def reset(self):
+        # initial fields
+        for name in self.state_fields:
+            getattr(self, name).vector().zero()
+
+    def get_state(self):
+        # copies of the local values of the fields, the displacement is the start value of the next solve
+        return {name: getattr(self, name).vector().get_local() for name in self.state_fields}
+
+    def set_state(self, state):
+        for name in self.state_fields:
+            set_q(getattr(self, name), state[name])
+
     def set_timestep(self, dt):
         self.dt = dt
         self.dt_form.assign(df.Constant(self.dt))
@@ -769,35 +1126,23 @@ class ConcreteMechanicsModel(df.NonlinearProblem):
     def pv_plot(self, t=0):
         # paraview export
 
-        # displacement plot
-        u_plot = df.project(self.u, self.V)
-        u_plot.rename("Displacement", "test string, what does this do??")  # TODO: what does the second string do?
-        self.pv_file.write(u_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
-
-        # Elasticity parameters without multiplication with E
-        x_mu = 1.0 / (2.0 * (1.0 + self.p.nu))
-        x_lambda = 1.0 * self.p.nu / ((1.0 + self.p.nu) * (1.0 - 2.0 * self.p.nu))
-
-        def x_sigma(v):
-            return 2.0 * x_mu * df.sym(df.grad(v)) + x_lambda * df.tr(df.sym(df.grad(v))) * df.Identity(len(v))
-
-        sigma_plot = df.project(self.sigma_ufl, self.visu_space_T,
-                                form_compiler_parameters={'quadrature_degree': self.p.degree})
-        E_plot = df.project(self.q_E, self.visu_space, form_compiler_parameters={'quadrature_degree': self.p.degree})
-        fc_plot = df.project(self.q_fc, self.visu_space, form_compiler_parameters={'quadrature_degree': self.p.degree})
-        ft_plot = df.project(self.q_ft, self.visu_space, form_compiler_parameters={'quadrature_degree': self.p.degree})
-        yield_plot = df.project(self.q_yield, self.visu_space,
-                                form_compiler_parameters={'quadrature_degree': self.p.degree})
-        #
-        E_plot.rename("Young's Modulus", "test string, what does this do??")  # TODO: what does the second string do?
-        fc_plot.rename("Compressive strength",
-                       "test string, what does this do??")  # TODO: what does the second string do?
-        ft_plot.rename("Tensile strength", "test string, what does this do??")  # TODO: what does the second string do?
-        yield_plot.rename("Yield surface", "test string, what does this do??")  # TODO: what does the second string do?
-        sigma_plot.rename("Stress", "test string, what does this do??")  # TODO: what does the second string do?
-
-        self.pv_file.write(E_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
-        self.pv_file.write(fc_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
-        self.pv_file.write(ft_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
-        self.pv_file.write(yield_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
-        self.pv_file.write(sigma_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
+        # displacement plot, written directly without projection
+        if self.visu_fields.selected("Displacement"):
+            self.pv_file.write(self.u, t, encoding=self.pv_encoding)
+
+        # projected fields, only the selected ones are projected
+        for name, expr, V in [("Young's Modulus", self.q_E, self.visu_space),
+                              ("Compressive strength", self.q_fc, self.visu_space),
+                              ("Tensile strength", self.q_ft, self.visu_space),
+                              ("Yield surface", self.q_yield, self.visu_space),
+                              ("Stress", self.sigma_ufl, self.visu_space_T)]:
+            if self.visu_fields.selected(name):
+                self.pv_file.write(self.visu_fields(name, expr, V), t, encoding=self.pv_encoding)
+
+    def pv_plot_quadrature_values(self, values, name, t=0):
+        # paraview export of an array with one value per quadrature point
+        if self.q_values is None:
+            self.q_values = df.Function(self.q_V)
+        set_q(self.q_values, values)
+        values_plot = self.visu_fields(name, self.q_values, self.visu_space)
+        self.pv_file.write(values_plot, t, encoding=self.pv_encoding)
@@ -8,6 +8,11 @@ from fenics_concrete.material_problems.material_problem import MaterialProblem
 from fenics_concrete.helpers import Parameters
 from fenics_concrete.helpers import set_q
 from fenics_concrete.helpers import LocalProjector
+from fenics_concrete.helpers import create_pv_file
+from fenics_concrete.helpers import pv_encoding
+from fenics_concrete.helpers import VisuFields
+from fenics_concrete.helpers import axisymmetric_strain
+from fenics_concrete.helpers import volume_weight
 from fenics_concrete import experimental_setups
 
 
@@ -20,6 +25,9 @@ warnings.simplefilter("ignore", QuadratureRepresentationDeprecationWarning)
 # copy from concrete_thermo_mechanical.py
 # change/ adapted models for modelling structural build-up
 class ConcreteThixMechanical(MaterialProblem):
+    # material parameters that can be changed with `update_parameters`
+    runtime_parameters = ('density', 'g', 'nu', 'E_0', 'R_E', 'A_E', 't_f', 'age_0')
+
     def __init__(self, experiment=None, parameters=None, pv_name='pv_output_concrete-thix'):
         # generate "dummy" experiment when none is passed
         if experiment == None:
@@ -89,16 +97,44 @@ class ConcreteThixMechanical(MaterialProblem):
             # go through all sensors and measure
             self.sensors[sensor_name].measure(self, t)
 
+        self.check_triggers(t)
+
         # update age & path before next step!
         self.mechanics_problem.update_values()
 
+        if self.checkpoint_due():
+            self.write_checkpoint(t)
+
     def pv_plot(self, t=0):
         # calls paraview output for both problems
+        if not self.output_due():
+            return
         self.mechanics_problem.pv_plot(t=t)
 
+    def pv_close(self):
+        # writes the remaining paraview output and checkpoint and closes the file
+        self.flush_checkpoint()
+        self.mechanics_problem.pv_file.close()
+
+    def open_pv_file(self):
+        self.mechanics_problem.pv_file = create_pv_file(self.experiment.mesh, self.pv_name, self.p.pv_async,
+                                                        self.p.pv_region, self.p.pv_precision)
+
     def set_timestep(self, dt):
         self.mechanics_problem.set_timestep(dt)
 
+    def apply_parameters(self, changed):
+        self.mechanics_problem.update_parameters()
+
+    def reset_fields(self):
+        self.mechanics_problem.reset()
+
+    def get_field_state(self):
+        return {'mechanics': self.mechanics_problem.get_state()}
+
+    def set_field_state(self, fields):
+        self.mechanics_problem.set_state(fields['mechanics'])
+
     def get_E_fkt(self):
         return np.vectorize(self.mechanics_problem.E_fkt)
 
@@ -114,25 +150,32 @@ class ConcreteThixElasticModel(df.NonlinearProblem):
             self.stress_vector_dim = 3
         elif self.p.dim == 3:
             self.stress_vector_dim = 6
+        # the axisymmetric stress tensor is 3x3, including the hoop stress
+        tensor_shape = None
+        if self.p.axisymmetric:
+            self.stress_vector_dim = 6
+            tensor_shape = (3, 3)
 
         # todo: I do not like the "meshless" setup right now
         if mesh != None:
+            self.mesh = mesh
             # initialize possible paraview output
-            self.pv_file = df.XDMFFile(pv_name + '.xdmf')
-            self.pv_file.parameters["flush_output"] = True
-            self.pv_file.parameters["functions_share_mesh"] = True
+            self.pv_file = create_pv_file(mesh, pv_name, self.p.pv_async, self.p.pv_region,
+                                          self.p.pv_precision)
+            self.pv_encoding = pv_encoding(mesh, self.p.pv_encoding)
             # function space for single value per element, required for plot of quadrature space values
 
             #
             if self.p.degree == 1:
                 self.visu_space = df.FunctionSpace(mesh, "DG", 0)
-                self.visu_space_T = df.TensorFunctionSpace(mesh, "DG", 0)
+                self.visu_space_T = df.TensorFunctionSpace(mesh, "DG", 0, shape=tensor_shape)
             else:
                 self.visu_space = df.FunctionSpace(mesh, "P", 1)
-                self.visu_space_T = df.TensorFunctionSpace(mesh, "P", 1)
+                self.visu_space_T = df.TensorFunctionSpace(mesh, "P", 1, shape=tensor_shape)
 
             metadata = {"quadrature_degree": self.p.degree, "quadrature_scheme": "default"}
             dxm = df.dx(metadata=metadata)
+            self.visu_fields = VisuFields(dxm, self.p.pv_fields)  # cached projections for the paraview output
 
             # solution field
             self.V = df.VectorFunctionSpace(mesh, 'P', self.p.degree)
@@ -150,6 +193,7 @@ class ConcreteThixElasticModel(df.NonlinearProblem):
             # quadrature functions
             # to initialize values (otherwise initialized by 0)
             self.q_path = df.Function(q_V, name="path time defined overall")  # negative values where not active yet
+            self.initial_path = self.q_path.vector().get_local()  # restored by `reset`
 
             # computed values
             self.q_pd = df.Function(q_V, name="pseudo density") # active or nonactive
@@ -158,26 +202,29 @@ class ConcreteThixElasticModel(df.NonlinearProblem):
             self.q_eps = df.Function(q_VT, name="Strain")
 
             # Define variational problem
-            self.u = df.Function(self.V)  # displacement
+            self.u = df.Function(self.V, name="Displacement")  # displacement
             v = df.TestFunction(self.V)
 
             # Volume force todo: ANNIKA: density should also evolve with time (?) ensuring constant strain for individual layer (?)
-            if self.p.dim == 1:
-                f = df.Constant(-self.p.g * self.p.density)
-            elif self.p.dim == 2:
-                f = df.Constant((0, -self.p.g * self.p.density))
-            elif self.p.dim == 3:
-                f = df.Constant((0, 0, -self.p.g * self.p.density))
+            self.f = df.Constant(self.volume_force())
+            f = self.f
 
             # define sigma from(u,t) in evalute material or here global E change ? (see damage example Thomas) -> then tangent by hand!
             # # Elasticity parameters without multiplication with E
             # self.x_mu = 1.0 / (2.0 * (1.0 + self.p.nu))
             # self.x_lambda = 1.0 * self.p.nu / ((1.0 + self.p.nu) * (1.0 - 2.0 * self.p.nu))
+            # constants, can be changed with `update_parameters`
+            x_mu, x_lambda = self.elasticity_parameters()
+            self.x_mu = df.Constant(x_mu)
+            self.x_lambda = df.Constant(x_lambda)
             self.sigma_ufl = self.q_E * self.x_sigma(self.u)
 
+            # weight of the volume integrals, 2 pi r in the axisymmetric case
+            w = volume_weight(mesh, self.p)
+
             # multiplication with activated elements / current Young's modulus
-            R_ufl = self.q_E * df.inner(self.x_sigma(self.u), self.eps(v)) * dxm
-            R_ufl += - self.q_pd * df.inner(f, v) * dxm  # add volumetric force, aka gravity (in this case)
+            R_ufl = self.q_E * df.inner(self.x_sigma(self.u), self.eps(v)) * w * dxm
+            R_ufl += - self.q_pd * df.inner(f, v) * w * dxm  # add volumetric force, aka gravity (in this case)
 
             # quadrature point part
             self.R = R_ufl
@@ -193,16 +240,28 @@ class ConcreteThixElasticModel(df.NonlinearProblem):
 
             self.assembler = None  # set as default, to check if bc have been added???
 
-    def x_sigma(self, v):
-
+    def elasticity_parameters(self):
+        # Elasticity parameters without multiplication with E
         x_mu = 1.0 / (2.0 * (1.0 + self.p.nu))
         x_lambda = 1.0 * self.p.nu / ((1.0 + self.p.nu) * (1.0 - 2.0 * self.p.nu))
-        if self.p.dim ==2 and self.p.stress_case == 'plane_stress':
+        if self.p.dim ==2 and not self.p.axisymmetric and self.p.stress_case == 'plane_stress':
             x_lambda = 2 * x_mu * x_lambda / (x_lambda + 2 * x_mu) # see https://comet-fenics.readthedocs.io/en/latest/demo/elasticity/2D_elasticity.py.html
+        return x_mu, x_lambda
 
-        return 2.0 * x_mu * df.sym(df.grad(v)) + x_lambda * df.tr(df.sym(df.grad(v))) * df.Identity(len(v))
+    def volume_force(self):
+        # gravity, in the last direction
+        force = [0.0] * self.p.dim
+        force[-1] = -self.p.g * self.p.density
+        return force[0] if self.p.dim == 1 else force
+
+    def x_sigma(self, v):
+        eps = self.eps(v)
+        return 2.0 * self.x_mu * eps + self.x_lambda * df.tr(eps) * df.Identity(eps.ufl_shape[0])
 
     def eps(self,v):
+        # 3x3 in (r, z, theta) for axisymmetric problems
+        if self.p.axisymmetric:
+            return axisymmetric_strain(v, self.mesh)
         return df.sym(df.grad(v))
 
     def sigma_voigt(self, s):
@@ -292,8 +351,34 @@ class ConcreteThixElasticModel(df.NonlinearProblem):
     def set_timestep(self, dt):
         self.dt = dt
 
+    def update_parameters(self):
+        # sets the constants of the forms to the current parameters, the Young's modulus uses the parameters directly
+        x_mu, x_lambda = self.elasticity_parameters()
+        self.x_mu.assign(x_mu)
+        self.x_lambda.assign(x_lambda)
+        self.f.assign(df.Constant(self.volume_force()))
+
+    def reset(self):
+        # initial fields, the path time is restored to the last initial path
+        for name in ['u', 'q_pd', 'q_E', 'q_sigma', 'q_eps']:
+            getattr(self, name).vector().zero()
+        set_q(self.q_path, self.initial_path)
+
+    def get_state(self):
+        # copies of the local values of the fields, the path time is the only history
+        state = {name: getattr(self, name).vector().get_local()
+                 for name in ['u', 'q_path', 'q_pd', 'q_E', 'q_sigma', 'q_eps']}
+        state['dt'] = self.dt
+        return state
+
+    def set_state(self, state):
+        for name in ['u', 'q_path', 'q_pd', 'q_E', 'q_sigma', 'q_eps']:
+            set_q(getattr(self, name), state[name])
+        self.set_timestep(state['dt'])
+
     def set_initial_path(self, path_time):
         self.q_path.interpolate(path_time)  # default = zero, given as expression
+        self.initial_path = self.q_path.vector().get_local()
 
     def set_bcs(self, bcs):
         # Only now (with the bcs) can we initialize the assembler
@@ -313,21 +398,13 @@ class ConcreteThixElasticModel(df.NonlinearProblem):
     def pv_plot(self, t=0):
         # paraview export
 
-        # displacement plot
-        u_plot = df.project(self.u, self.V)
-        u_plot.rename("Displacement", "displacemenet vector")
-        self.pv_file.write(u_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
-
-        sigma_plot = df.project(self.sigma_ufl, self.visu_space_T,
-                                form_compiler_parameters={'quadrature_degree': self.p.degree})
-        # print('sigma plot', sigma_plot.vector()[:].max())
-        E_plot = df.project(self.q_E, self.visu_space, form_compiler_parameters={'quadrature_degree': self.p.degree})
-        pd_plot = df.project(self.q_pd, self.visu_space, form_compiler_parameters={'quadrature_degree': self.p.degree})
-
-        E_plot.rename("Young's Modulus", "Young's modulus value")
-        sigma_plot.rename("Stress", "stress components")
-        pd_plot.rename("pseudo density", "pseudo density")
+        # displacement plot, written directly without projection
+        if self.visu_fields.selected("Displacement"):
+            self.pv_file.write(self.u, t, encoding=self.pv_encoding)
 
-        self.pv_file.write(E_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
-        self.pv_file.write(sigma_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
-        self.pv_file.write(pd_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
+        # projected fields, only the selected ones are projected
+        for name, expr, V in [("Young's Modulus", self.q_E, self.visu_space),
+                              ("Stress", self.sigma_ufl, self.visu_space_T),
+                              ("pseudo density", self.q_pd, self.visu_space)]:
+            if self.visu_fields.selected(name):
+                self.pv_file.write(self.visu_fields(name, expr, V), t, encoding=self.pv_encoding)
@@ -2,6 +2,11 @@ import dolfin as df
 
 from fenics_concrete.material_problems.material_problem import MaterialProblem
 from fenics_concrete.helpers import Parameters
+from fenics_concrete.helpers import create_pv_file
+from fenics_concrete.helpers import pv_encoding
+from fenics_concrete.helpers import VisuFields
+from fenics_concrete.helpers import axisymmetric_strain
+from fenics_concrete.helpers import volume_weight
 from fenics_concrete import experimental_setups
 
 # this is necessary, otherwise this warning will not stop
@@ -54,9 +59,10 @@ class LinearElasticity(MaterialProblem):
             self.p.lmbda = self.p.E * self.p.nu / ((1.0 + self.p.nu) * (1.0 - 2.0 * self.p.nu))
 
         # initialize possible paraview output
-        self.pv_file = df.XDMFFile(self.pv_name + '.xdmf')
-        self.pv_file.parameters["flush_output"] = True
-        self.pv_file.parameters["functions_share_mesh"] = True
+        self.pv_file = create_pv_file(self.experiment.mesh, self.pv_name, self.p.pv_async, self.p.pv_region,
+                                      self.p.pv_precision)
+        self.pv_encoding = pv_encoding(self.experiment.mesh, self.p.pv_encoding)
+        self.visu_fields = VisuFields(df.dx, self.p.pv_fields)  # cached projections for the paraview output
 
         # define function space ets.
         self.V = df.VectorFunctionSpace(self.experiment.mesh, "Lagrange", self.p.degree)  # 2 for quadratic elements
@@ -66,7 +72,9 @@ class LinearElasticity(MaterialProblem):
         # Define variational problem
         u_trial = df.TrialFunction(self.V)
         v = df.TestFunction(self.V)
-        self.a = df.inner(self.sigma(u_trial), df.grad(v)) * df.dx
+        # in the axisymmetric case the integrals are weighted with 2 pi r, the forces are those of the 3D body
+        weight = volume_weight(self.experiment.mesh, self.p)
+        self.a = df.inner(self.sigma(u_trial), self.eps(v)) * weight * df.dx
 
         if self.p.dim == 2:
             f = df.Constant((0, 0))
@@ -75,21 +83,30 @@ class LinearElasticity(MaterialProblem):
         else:
             raise Exception(f'wrong dimension {self.p.dim} for problem setup')
 
-        self.L = df.inner(f, v) * df.dx
+        self.L = df.inner(f, v) * weight * df.dx
 
         # boundary conditions only after function space
         self.bcs = self.experiment.create_displ_bcs(self.V)
 
         # displacement field
-        self.displacement = df.Function(self.V)
+        self.displacement = df.Function(self.V, name="Displacement")
 
         # TODO better names!!!!
-        self.visu_space_T = df.TensorFunctionSpace(self.experiment.mesh, "Lagrange", self.p.degree)
+        # the axisymmetric stress has the additional hoop component
+        shape = (3, 3) if self.p.axisymmetric else None
+        self.visu_space_T = df.TensorFunctionSpace(self.experiment.mesh, "Lagrange", self.p.degree, shape=shape)
+
+    def eps(self, v):
+        # strain of the displacement field, 3x3 in (r, z, theta) for axisymmetric problems
+        if self.p.axisymmetric:
+            return axisymmetric_strain(v, self.experiment.mesh)
+        return df.sym(df.grad(v))
 
     # Stress computation for linear elastic problem
     def sigma(self, v):
         # v is the displacement field
-        return 2.0 * self.p.mu * df.sym(df.grad(v)) + self.p.lmbda * df.tr(df.sym(df.grad(v))) * df.Identity(len(v))
+        eps = self.eps(v)
+        return 2.0 * self.p.mu * eps + self.p.lmbda * df.tr(eps) * df.Identity(eps.ufl_shape[0])
 
     def solve(self, t=1.0):
         # time in this example only relevant for the naming of the paraview steps and the sensor output
@@ -106,19 +123,31 @@ class LinearElasticity(MaterialProblem):
             # go through all sensors and measure
             self.sensors[sensor_name].measure(self, t)
 
+        self.check_triggers(t)
+
     def compute_residual(self):
         # compute reaction forces
         self.residual = df.action(self.a, self.displacement) - self.L
 
     def pv_plot(self, t=0):
         # paraview output
+        if not self.output_due():
+            return
 
-        # displacement plot
-        u_plot = df.project(self.displacement, self.V)
-        u_plot.rename("Displacement", "test string, what does this do??")  # TODO: what does the second string do?
-        self.pv_file.write(u_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
+        # displacement plot, written directly without projection
+        if self.visu_fields.selected("Displacement"):
+            self.pv_file.write(self.displacement, t, encoding=self.pv_encoding)
 
         # stress plot
-        sigma_plot = df.project(self.stress, self.visu_space_T)
-        sigma_plot.rename("Stress", "test string, what does this do??")  # TODO: what does the second string do?
-        self.pv_file.write(sigma_plot, t, encoding=df.XDMFFile.Encoding.ASCII)
+        if self.visu_fields.selected("Stress"):
+            sigma_plot = self.visu_fields("Stress", self.stress, self.visu_space_T)
+            self.pv_file.write(sigma_plot, t, encoding=self.pv_encoding)
+
+    def pv_close(self):
+        # writes the remaining paraview output and checkpoint and closes the file
+        self.flush_checkpoint()
+        self.pv_file.close()
+
+    def open_pv_file(self):
+        self.pv_file = create_pv_file(self.experiment.mesh, self.pv_name, self.p.pv_async, self.p.pv_region,
+                                      self.p.pv_precision)
@@ -2,6 +2,9 @@ import dolfin as df
 
 from fenics_concrete.helpers import Parameters
 from fenics_concrete.sensors import Sensors
+from fenics_concrete.aggregates import Aggregates
+from fenics_concrete.checkpoint import CheckpointWriter
+from fenics_concrete.checkpoint import read_checkpoint
 
 from loguru import logger
 import logging
@@ -15,6 +18,9 @@ warnings.simplefilter("ignore", QuadratureRepresentationDeprecationWarning)
 
 
 class MaterialProblem():
+    # parameters that can be changed with `update_parameters`, defined by the problems
+    runtime_parameters = ()
+
     def __init__(self, experiment, parameters=None, pv_name='pv_output_full'):
         self.experiment = experiment
         # setting up paramters
@@ -25,8 +31,19 @@ class MaterialProblem():
         self.p['igc'] = 8.3145  # ideal gas constant [JK −1 mol −1 ]
         self.p['g'] = 9.81  # graviational acceleration in m/s²
 
+        # (r, z) formulation of rotationally symmetric problems, set by the experiment
+        self.p['axisymmetric'] = False
+
         # other "globel" paramters...
         self.p['log_level'] = 'INFO'
+        self.p['pv_encoding'] = 'HDF5'  # binary paraview output, 'ASCII' for text output in serial
+        self.p['pv_async'] = False  # write the paraview output in a background thread, only in serial
+        self.p['pv_fields'] = None  # list of the names of the written fields, None for all fields
+        self.p['pv_interval'] = 1  # only every n-th call of pv_plot writes output
+        self.p['pv_region'] = None  # bounding box ((x_min, y_min, ..), (x_max, y_max, ..)) or (cell markers, marker)
+        self.p['pv_precision'] = 'float64'  # 'float32' for single precision output, only in serial
+        self.p['checkpoint_interval'] = 0  # write a checkpoint every n-th solve, 0 for no checkpoints
+        self.p['checkpoint_name'] = None  # file name of the checkpoints without extension, default based on pv_name
 
         self.p = self.p + self.experiment.p + parameters
 
@@ -67,13 +84,27 @@ class MaterialProblem():
 
 
         self.sensors =  Sensors()  # list to hold attached sensors
+        self.aggregates = Aggregates()  # list to hold attached per point aggregates
 
 
         self.pv_name = pv_name
+        self.output_interval = self.p.pv_interval  # only every n-th call of pv_plot writes output
+        self.output_calls = 0
+
+        # set by triggers to signal the time loop to stop
+        self.finished = False
+
+        # checkpoints, written in a background thread
+        self.checkpoint_name = self.p.checkpoint_name or pv_name + '_checkpoint'
+        self.checkpoint_writer = None  # started with the first checkpoint
+        self.solve_calls = 0
 
         #setup fields for sensor output, can be defined in model
         self.displacement = None
+        self.q_yield = None
+        self.stress = None
         self.temperature = None
+        self.q_temperature = None
         self.degree_of_hydration = None
         self.q_degree_of_hydration = None
 
@@ -89,5 +120,175 @@ class MaterialProblem():
         raise NotImplementedError()
 
     def add_sensor(self, sensor):
+        self.check_required_model(sensor)
+        self.sensors[sensor.name] = sensor
+
+    def add_aggregate(self, aggregate):
+        self.check_required_model(aggregate)
+        # trigger conditions of aggregates reduce over the processes of the mesh
+        aggregate.comm = self.experiment.mesh.mpi_comm()
+        self.aggregates[aggregate.name] = aggregate
+
+    def has_model(self, model):
+        # True when the problem solves the 'temperature' or the 'mechanics' model
+        return True
+
+    def check_required_model(self, item):
+        # sensors and aggregates of fields that are not computed would fail during the run
+        model = getattr(item, 'required_model', None)
+        if model is not None and not self.has_model(model):
+            mode = f' in problem_mode {self.p.problem_mode}' if 'problem_mode' in self.p else ''
+            raise Exception(f'{item.name} requires the {model} model, which is not solved by '
+                            f'{type(self).__name__}{mode}')
+
+    def check_triggers(self, t):
+        # checks the trigger conditions of all sensors and aggregates, to be called after each solve
+        for sensor_name in self.sensors:
+            self.sensors[sensor_name].check_triggers(self, t)
+        for aggregate_name in self.aggregates:
+            self.aggregates[aggregate_name].check_triggers(self, t)
+
+    def output_due(self):
+        # counts the calls of pv_plot, True for every `output_interval`-th call
+        due = self.output_calls % self.output_interval == 0
+        self.output_calls += 1
+        return due
+
+    def update_parameters(self, parameters):
+        """changes parameters of the existing problem, without rebuilding forms and function spaces
+
+        only parameters listed in `runtime_parameters` can be changed, all others have to keep their value
+        returns the dict of changed parameters
+
+        parameters:
+            dict with the new values
+        """
+        changed = {}
+        for key, value in parameters.items():
+            if key in self.p and self.p[key] == value:
+                continue
+            if key not in self.runtime_parameters:
+                raise Exception(f'parameter {key} can not be changed at runtime, a new problem is required')
+            changed[key] = value
+
+        # the models share the parameters of the problem
+        self.p.update(changed)
+        self.experiment.p.update({key: value for key, value in changed.items() if key in self.experiment.p})
+        if changed:
+            self.apply_parameters(changed)
+        return changed
+
+    def apply_parameters(self, changed):
+        # updates constants, boundary conditions etc. after a change of the parameters in `changed`
+        raise NotImplementedError()
+
+    def reset(self):
+        """restores the initial fields and clears sensors, aggregates and counters, to reuse the problem"""
+        self.reset_fields()
+        for sensor in self.sensors.values():
+            sensor.reset()
+        for aggregate in self.aggregates.values():
+            aggregate.reset()
+        self.output_calls = 0
+        self.output_interval = self.p.pv_interval
+        self.solve_calls = 0
+        self.finished = False
+
+    def reset_fields(self):
+        # sets all fields and histories to their initial values
+        raise NotImplementedError()
+
+    def set_pv_name(self, pv_name):
+        """
+        writes the following paraview output and checkpoints to files with the base name `pv_name`, e.g. when the
+        problem is reused for another run
+        """
+        if pv_name == self.pv_name:
+            return
+        self.pv_close()
+        self.checkpoint_writer = None  # a new writer is started with the next checkpoint
+        self.pv_name = pv_name
+        self.checkpoint_name = self.p.checkpoint_name or pv_name + '_checkpoint'
+        self.open_pv_file()
+
+    def open_pv_file(self):
+        # opens the paraview output file `self.pv_name`, after the previous file was closed
+        raise NotImplementedError()
+
+    def get_field_state(self):
+        # dict of numpy arrays with the local values of all fields required to continue the simulation
+        raise NotImplementedError()
+
+    def set_field_state(self, fields):
+        # restores the fields returned by `get_field_state`
+        raise NotImplementedError()
+
+    def get_state(self, t=None):
+        """returns a copy of the complete simulation state at time `t`
+
+        the state can be restored with `set_state` in a problem with the same mesh, partition, sensors,
+        aggregates and triggers, e.g. to branch several simulations from a shared history
+        """
+        return {'t': t,
+                'mpi_size': df.MPI.size(self.experiment.mesh.mpi_comm()),
+                'fields': self.get_field_state(),
+                'sensors': {name: sensor.get_state() for name, sensor in self.sensors.items()},
+                'aggregates': {name: aggregate.get_state() for name, aggregate in self.aggregates.items()},
+                'output_calls': self.output_calls,
+                'output_interval': self.output_interval,
+                'solve_calls': self.solve_calls,
+                'finished': self.finished}
+
+    def set_state(self, state):
+        """restores a state returned by `get_state`, returns the time of the state"""
+        if state['mpi_size'] != df.MPI.size(self.experiment.mesh.mpi_comm()):
+            raise Exception(f'State was saved with {state["mpi_size"]} processes, it can only be restored with '
+                            f'the same number of processes')
+        for name, sensor_state in state['sensors'].items():
+            if name not in self.sensors:
+                raise Exception(f'State contains data of the sensor {name}, which is not attached to the problem')
+            self.sensors[name].set_state(sensor_state)
+        for name, aggregate_state in state['aggregates'].items():
+            if name not in self.aggregates:
+                raise Exception(f'State contains data of the aggregate {name}, which is not attached to the problem')
+            self.aggregates[name].set_state(aggregate_state)
+        self.set_field_state(state['fields'])
+        self.output_calls = state['output_calls']
+        self.output_interval = state['output_interval']
+        self.solve_calls = state['solve_calls']
+        self.finished = state['finished']
+        return state['t']
+
+    def checkpoint_due(self):
+        # counts the solves, True after every `checkpoint_interval`-th solve
+        self.solve_calls += 1
+        return self.p.checkpoint_interval > 0 and self.solve_calls % self.p.checkpoint_interval == 0
+
+    def write_checkpoint(self, t):
+        """copies the state at time `t`, the file is written in a background thread"""
+        if self.checkpoint_writer is None:
+            rank = df.MPI.rank(self.experiment.mesh.mpi_comm())
+            self.checkpoint_writer = CheckpointWriter(self.checkpoint_name, rank)
+        self.checkpoint_writer.write(self.get_state(t))
+
+    def flush_checkpoint(self):
+        """waits until the last checkpoint is written, raises the error of a failed write
+
+        the writer thread does not keep the process alive, call this or `pv_close` at the end of a run
+        """
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.flush()
+
+    def restore(self, name=None):
+        """
+        restores the state of a checkpoint, returns the time of the checkpoint
+
+        the sensors, aggregates and triggers have to be attached before, parameters may differ
+        e.g. to compute variants from a shared history
 
-        self.sensors[sensor.name] = sensor
\ No newline at end of file
+        name:
+            file name of the checkpoint without extension, default is the checkpoint name of this problem
+        """
+        self.flush_checkpoint()
+        rank = df.MPI.rank(self.experiment.mesh.mpi_comm())
+        return self.set_state(read_checkpoint(name or self.checkpoint_name, rank))
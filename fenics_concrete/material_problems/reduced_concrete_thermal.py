@@ -0,0 +1,229 @@
+import dolfin as df
+import numpy as np
+
+from fenics_concrete.material_problems.material_problem import MaterialProblem
+
+from fenics_concrete.helpers import Parameters
+from fenics_concrete.helpers import set_q
+from fenics_concrete.helpers import LocalProjector
+from fenics_concrete.helpers import create_pv_file
+from fenics_concrete.helpers import pv_encoding
+from fenics_concrete.helpers import VisuFields
+from fenics_concrete.reduced_order import boundary_lift
+from fenics_concrete.sensors import DOHSensor
+from fenics_concrete.sensors import HydrationHistorySensor
+from fenics_concrete.sensors import MinDOHSensor
+from fenics_concrete import hydration
+
+import warnings
+from ffc.quadrature.deprecation import QuadratureRepresentationDeprecationWarning
+
+df.parameters["form_compiler"]["representation"] = "quadrature"
+warnings.simplefilter("ignore", QuadratureRepresentationDeprecationWarning)
+
+
+# reduced order model of the temperature and hydration problem of ConcreteThermoMechanical
+class ReducedConcreteThermal(MaterialProblem):
+    # material parameters and boundary values that can be changed with `update_parameters`
+    runtime_parameters = ('themal_cond', 'vol_heat_cap', 'Q_inf', 'B1', 'B2', 'eta', 'alpha_max', 'E_act', 'T_ref',
+                          'temp_adjust_law', 'T_0', 'T_bc1', 'T_bc2', 'T_bc3', 'rom_full_alpha')
+    # sensors that require the degree of hydration at all quadrature points
+    alpha_sensors = (DOHSensor, MinDOHSensor, HydrationHistorySensor)
+
+    def __init__(self, experiment, basis, parameters=None, pv_name='pv_output_reduced-concrete-thermal'):
+        """
+        Arguments:
+            experiment : Experiment
+                experimental setup with the mesh of the full runs of the basis
+            basis : ReducedBasis
+                reduced matrices from snapshots of full runs, see fenics_concrete.reduced_order
+            parameters : Parameters, optional
+                changes of the parameters of the full problem of the basis
+        """
+        self.basis = basis
+        super().__init__(experiment, parameters, pv_name)
+
+    def setup(self):
+        default_p = Parameters(self.basis.parameters)
+        # the degree of hydration at all quadrature points is computed after each step from the reconstructed
+        # temperature, required for the paraview output, the cost scales with the full model, therefore it is only
+        # computed when this is True or a degree of hydration sensor is attached, see `full_alpha`
+        default_p['rom_full_alpha'] = False
+        self.p = default_p + self.p
+
+        mesh = self.experiment.mesh
+        if df.MPI.size(mesh.mpi_comm()) > 1:
+            raise Exception('the reduced order model is only implemented in serial')
+
+        # spaces of the full temperature problem, to reconstruct the fields for the sensors and the output
+        degree = self.p.degree_T
+        q_degree = self.p.quadrature_degree or degree
+        metadata = {"quadrature_degree": q_degree, "quadrature_scheme": "default"}
+        self.dxm = df.dx(metadata=metadata)
+        self.V = df.FunctionSpace(mesh, 'P', degree)
+        quadrature_element = df.FiniteElement("Quadrature", mesh.ufl_cell(), degree=q_degree, quad_scheme="default")
+        self.q_V = df.FunctionSpace(mesh, quadrature_element)
+        if self.V.dim() != self.basis.basis.shape[0]:
+            raise Exception(f'the basis has {self.basis.basis.shape[0]} dofs, the temperature space {self.V.dim()}, '
+                            f'the mesh and the degree have to match the full runs')
+
+        if q_degree == 1:
+            self.visu_space = df.FunctionSpace(mesh, "DG", 0)
+        else:
+            self.visu_space = df.FunctionSpace(mesh, "P", 1)
+        self.visu_fields = VisuFields(self.dxm, self.p.pv_fields)
+        self.pv_file = create_pv_file(mesh, self.pv_name, self.p.pv_async, self.p.pv_region, self.p.pv_precision)
+        self.pv_encoding = pv_encoding(mesh, self.p.pv_encoding)
+
+        # reconstructed fields
+        self.T = df.Function(self.V, name="Temperature")
+        self.q_T = df.Function(self.q_V, name="temperature")
+        self.q_alpha = df.Function(self.q_V, name="degree of hydration")
+        self.project_T = LocalProjector(self.T, self.q_V, self.dxm)
+        self.T_lift = df.Function(self.V)
+        self.q_T_lift = df.Function(self.q_V)
+        self.project_lift = LocalProjector(self.T_lift, self.q_V, self.dxm)
+
+        self.dt = 0
+        self.set_lift()
+        self.reset_fields()
+
+    def set_lift(self):
+        # boundary values and their contributions to the reduced system
+        self.lift = boundary_lift(self.experiment, self.V)
+        self.mass_lift = self.basis.mass_basis.T @ self.lift
+        self.stiffness_lift = self.basis.stiffness_basis.T @ self.lift
+        set_q(self.T_lift, self.lift)
+        self.project_lift(self.q_T_lift)
+        self.lift_at_points = self.q_T_lift.vector().get_local()[self.basis.indices]
+
+    def set_timestep(self, dt):
+        self.dt = dt
+
+    def has_model(self, model):
+        return model == 'temperature'
+
+    @property
+    def full_alpha(self):
+        # the sensors have to be attached before the first solve, the degree of hydration is integrated in time
+        return self.p.rom_full_alpha or any(isinstance(sensor, self.alpha_sensors) for sensor in self.sensors.values())
+
+    def hydration_at_points(self, T, alpha_n, guess):
+        # increase of the degree of hydration and its derivative with respect to the temperature
+        try:
+            delta_alpha = hydration.solve_delta_alpha(alpha_n, T, self.dt, self.p, x0=guess)
+        except Exception:
+            delta_alpha = hydration.solve_delta_alpha(alpha_n, T, self.dt, self.p, x0=np.full_like(alpha_n, 0.5))
+        if np.any(delta_alpha < 0.0):
+            raise Exception(
+                'There is a problem with the alpha computation/initial guess, computed delta alpha is negative.')
+        ddalpha_dT = self.dt * hydration.affinity(delta_alpha, alpha_n, self.p) \
+                     * hydration.temp_adjust_tangent(T, self.p) \
+                     / hydration.delta_alpha_prime(delta_alpha, alpha_n, T, self.dt, self.p)
+        return delta_alpha, ddalpha_dT
+
+    def solve(self, t=1.0):
+        if self.dt <= 0:
+            raise RuntimeError("You need to `.set_timestep(dt)` larger than zero before the solve!")
+
+        basis = self.basis
+        heat_cap = self.p.vol_heat_cap
+        conductivity = self.dt * self.p.themal_cond
+        matrix = heat_cap * basis.mass + conductivity * basis.stiffness
+        rhs = heat_cap * (self.mass_n - self.mass_lift) - conductivity * self.stiffness_lift
+
+        # newton iteration of the reduced system, the hydration is only computed at the interpolation points
+        a = self.a.copy()
+        for i in range(25):
+            T_points = basis.basis_at_points @ a + self.lift_at_points
+            delta_alpha, ddalpha_dT = self.hydration_at_points(T_points, self.alpha_n_points, self.delta_alpha_points)
+            residual = matrix @ a - rhs - self.p.Q_inf * basis.source @ delta_alpha
+            jacobian = matrix - self.p.Q_inf * basis.source @ (ddalpha_dT[:, None] * basis.basis_at_points)
+            da = np.linalg.solve(jacobian, -residual)
+            a += da
+            if np.linalg.norm(da) <= 1e-10 * np.linalg.norm(a):
+                break
+        else:
+            raise Exception(f'The reduced temperature problem did not converge at time {t}')
+
+        # history update
+        T_points = basis.basis_at_points @ a + self.lift_at_points
+        self.delta_alpha_points, _ = self.hydration_at_points(T_points, self.alpha_n_points, self.delta_alpha_points)
+        self.alpha_n_points = self.alpha_n_points + self.delta_alpha_points
+        self.a = a
+        self.mass_n = basis.mass @ a + self.mass_lift
+
+        # reconstruction of the fields for the sensors
+        set_q(self.T, basis.basis @ a + self.lift)
+        self.temperature = self.T
+        if self.full_alpha:
+            self.project_T(self.q_T)
+            T_list = self.q_T.vector().get_local()
+            alpha_n_list = self.q_alpha.vector().get_local()
+            delta_alpha_list, _ = self.hydration_at_points(T_list, alpha_n_list, self.delta_alpha_list)
+            self.delta_alpha_list = delta_alpha_list
+            set_q(self.q_alpha, alpha_n_list + delta_alpha_list)
+            self.degree_of_hydration = self.visu_fields("DOH", self.q_alpha, self.visu_space)
+            self.q_degree_of_hydration = self.q_alpha
+
+        # get sensor data
+        for sensor_name in self.sensors:
+            # go through all sensors and measure
+            self.sensors[sensor_name].measure(self, t)
+
+        # update the per point aggregates
+        for aggregate_name in self.aggregates:
+            self.aggregates[aggregate_name].update(self, t)
+
+        self.check_triggers(t)
+
+        if self.checkpoint_due():
+            self.write_checkpoint(t)
+
+    def pv_plot(self, t=0):
+        # paraview export of the reconstructed fields
+        if not self.output_due():
+            return
+        if self.visu_fields.selected("Temperature"):
+            self.pv_file.write(self.T, t, encoding=self.pv_encoding)
+        if self.full_alpha and self.visu_fields.selected("DOH"):
+            alpha_plot = self.visu_fields("DOH", self.q_alpha, self.visu_space)
+            self.pv_file.write(alpha_plot, t, encoding=self.pv_encoding)
+
+    def pv_close(self):
+        # writes the remaining paraview output and checkpoint and closes the file
+        self.flush_checkpoint()
+        self.pv_file.close()
+
+    def open_pv_file(self):
+        self.pv_file = create_pv_file(self.experiment.mesh, self.pv_name, self.p.pv_async, self.p.pv_region,
+                                      self.p.pv_precision)
+
+    def apply_parameters(self, changed):
+        # the reduced matrices are scaled with the material parameters in each solve
+        # the boundary values are set when the boundary conditions are created
+        if any(key in self.experiment.p for key in changed):
+            self.set_lift()
+
+    def reset_fields(self):
+        # initial temperature, the reduced coordinates start with the projection onto the basis
+        T_0 = np.full(self.V.dim(), self.p.T_0 + self.p.zero_C)
+        self.a = self.basis.basis.T @ (T_0 - self.lift)
+        self.mass_n = self.basis.mass_basis.T @ T_0
+        n_points = len(self.basis.indices)
+        self.alpha_n_points = np.zeros(n_points)
+        self.delta_alpha_points = np.full(n_points, 0.2)
+        self.delta_alpha_list = np.full(self.q_V.dim(), 0.2)
+        self.q_alpha.vector().zero()
+        set_q(self.T, T_0)
+
+    def get_field_state(self):
+        return {'a': self.a.copy(), 'mass_n': self.mass_n.copy(), 'alpha_n_points': self.alpha_n_points.copy(),
+                'delta_alpha_points': self.delta_alpha_points.copy(), 'T': self.T.vector().get_local(),
+                'q_alpha': self.q_alpha.vector().get_local()}
+
+    def set_field_state(self, fields):
+        for name in ['a', 'mass_n', 'alpha_n_points', 'delta_alpha_points']:
+            setattr(self, name, fields[name].copy())
+        set_q(self.T, fields['T'])
+        set_q(self.q_alpha, fields['q_alpha'])
@@ -0,0 +1,115 @@
+"""Persistent cache of generated meshes, shared by processes and sessions
+
+Each mesh is stored in a HDF5 file named by a hash of the experiment class and the values of its geometry
+parameters. A new file is written to a unique temporary name and renamed afterwards, the rename is atomic, so
+readers never see a partial file and do not need a lock. When several processes generate the same mesh at the
+same time, each writes a complete file and the last rename wins.
+
+The cache is off by default, it is enabled with the parameter `mesh_cache` of the experiments or the environment
+variable FENICS_CONCRETE_MESH_CACHE. The key includes a hash of the source of the experiment module, so changes of
+the mesh generation invalidate the entries.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import uuid
+
+import dolfin as df
+
+# changing the version invalidates all existing cache entries, e.g. after changes of the cache file format
+CACHE_VERSION = 2
+CACHE_DIR_VARIABLE = 'FENICS_CONCRETE_MESH_CACHE'
+
+
+def default_cache_dir():
+    """cache directory given by FENICS_CONCRETE_MESH_CACHE, None disables the cache when it is not set"""
+    return os.environ.get(CACHE_DIR_VARIABLE) or None
+
+
+def source_hash(experiment_class):
+    """hash of the source file of the module that defines the experiment, changes with the mesh generation"""
+    with open(inspect.getfile(sys.modules[experiment_class.__module__]), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def mesh_key(experiment_class, parameters, names):
+    """
+    content hash of a mesh
+
+    experiment_class:
+        class of the experiment that generates the mesh
+    parameters:
+        parameters of the experiment
+    names:
+        names of the parameters that change the mesh
+    """
+    content = {'class': f'{experiment_class.__module__}.{experiment_class.__qualname__}',
+               'parameters': {name: repr(parameters.get(name)) for name in sorted(names)},
+               'source': source_hash(experiment_class),
+               'version': CACHE_VERSION}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def cache_file(cache_dir, key):
+    return os.path.join(cache_dir, f'{key}.h5')
+
+
+def read_mesh(comm, file_name):
+    """reads a mesh and its metadata dict from a cache file"""
+    mesh = df.Mesh(comm)
+    with df.HDF5File(comm, file_name, 'r') as f:
+        f.read(mesh, '/mesh', False)
+        attributes = f.attributes('/mesh')
+        metadata = {name: attributes[name] for name in attributes.list_attributes()
+                    if name.startswith('metadata_')}
+    return mesh, {name[len('metadata_'):]: value for name, value in metadata.items()}
+
+
+def write_mesh(comm, file_name, mesh, metadata):
+    """atomically writes a mesh and a dict of float metadata to a cache file"""
+    # all processes write to the same temporary file, the name is chosen by the first process
+    tmp_file = comm.bcast(f'{file_name}.{uuid.uuid4().hex}.tmp', root=0)
+    with df.HDF5File(comm, tmp_file, 'w') as f:
+        f.write(mesh, '/mesh')
+        attributes = f.attributes('/mesh')
+        for name, value in metadata.items():
+            attributes[f'metadata_{name}'] = float(value)
+    comm.Barrier()
+    if df.MPI.rank(comm) == 0:
+        os.replace(tmp_file, file_name)
+    comm.Barrier()
+
+
+def cached_mesh(comm, key, generate, cache_dir=None):
+    """
+    returns the cached mesh for the key, generates and stores it when it is not in the cache
+
+    comm:
+        MPI communicator of the mesh
+    key:
+        content hash of the mesh, see `mesh_key`
+    generate:
+        function without arguments, returns the mesh and a dict of float metadata, e.g. the corrected radius
+    cache_dir:
+        cache directory, None disables the cache
+
+    returns the mesh and the metadata dict
+    """
+    if cache_dir is None:
+        return generate()
+
+    file_name = cache_file(cache_dir, key)
+    # all processes have to take the same branch
+    exists = comm.bcast(os.path.isfile(file_name), root=0)
+    if exists:
+        return read_mesh(comm, file_name)
+
+    mesh, metadata = generate()
+    if df.MPI.rank(comm) == 0:
+        os.makedirs(cache_dir, exist_ok=True)
+    comm.Barrier()
+    write_mesh(comm, file_name, mesh, metadata)
+    return mesh, metadata
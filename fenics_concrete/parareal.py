@@ -0,0 +1,273 @@
+import copy
+import time as timer
+
+import numpy as np
+
+from fenics_concrete.helpers import MeshTransfer
+from fenics_concrete.parameters import Parameters
+from fenics_concrete.sweep import RunSpec
+from fenics_concrete.sweep import check_picklable
+from fenics_concrete.sweep import get_problem
+from fenics_concrete.sweep import process_pool
+
+
+class SliceSpec:
+    """Picklable description of the fine propagation of one time slice"""
+
+    def __init__(self, index, run, fields, t_0, n_steps):
+        """
+        Arguments:
+            index : int
+                number of the time slice
+            run : RunSpec
+                problem, parameters, sensors and time step of the fine propagator
+            fields : dict
+                field state at the start of the slice, see `get_field_state`
+            t_0 : float
+                time at the start of the slice
+            n_steps : int
+                number of fine time steps of the slice
+        """
+        self.index = index
+        self.run = run
+        self.fields = fields
+        self.t_0 = t_0
+        self.n_steps = n_steps
+
+
+def propagate(spec):
+    """
+    fine propagation of one time slice, executed in the worker processes
+
+    returns a dict with the index, the field state at the end of the slice, the sensor data as
+    {name: (time, data)} and the run time
+    """
+    start = timer.perf_counter()
+    problem = get_problem(spec.run)
+    for sensor in copy.deepcopy(spec.run.sensors):
+        problem.add_sensor(sensor)
+
+    problem.set_field_state(spec.fields)
+    problem.set_timestep(spec.run.dt)
+    for i in range(1, spec.n_steps + 1):
+        problem.solve(t=spec.t_0 + i * spec.run.dt)
+    problem.flush_checkpoint()
+
+    return {'index': spec.index,
+            'fields': problem.get_field_state(),
+            'sensors': {name: (list(sensor.time), list(sensor.data)) for name, sensor in problem.sensors.items()},
+            'run_time': timer.perf_counter() - start}
+
+
+def combine(coarse, fine, coarse_old):
+    """parareal update coarse + fine - coarse_old of field states, the other entries are taken from `fine`"""
+    if isinstance(fine, dict):
+        return {key: combine(coarse[key], fine[key], coarse_old[key]) for key in fine}
+    if isinstance(fine, np.ndarray):
+        return coarse + fine - coarse_old
+    return fine
+
+
+def state_change(new, old):
+    """largest relative change of the arrays of two field states"""
+    if isinstance(new, dict):
+        return max([state_change(new[key], old[key]) for key in new] + [0.0])
+    if isinstance(new, np.ndarray):
+        norm = np.linalg.norm(new)
+        difference = np.linalg.norm(new - old)
+        return difference / norm if norm > 0 else difference
+    return 0.0
+
+
+def models(problem):
+    # sub problems of a ConcreteThermoMechanical problem with the names of their field states
+    return [(name, model) for name, model in [('temperature', problem.temperature_problem),
+                                              ('mechanics', problem.mechanics_problem)] if model is not None]
+
+
+class CoarsePropagator:
+    """Coarse propagator in the main process, optionally on a coarser mesh"""
+
+    def __init__(self, fine_run, coarse_run):
+        """
+        Arguments:
+            fine_run : RunSpec
+                fine problem, the field states are transferred from and to its discretization
+            coarse_run : RunSpec
+                coarse problem and time step
+        """
+        self.fine = get_problem(fine_run)
+        self.fine_fields = self.fine.get_field_state()
+        self.coarse_run = coarse_run
+        # a separate problem, the cached problems of the fine runs carry their sensors, triggers and output
+        experiment = coarse_run.experiment_class(coarse_run.parameters)
+        self.coarse = coarse_run.problem_class(experiment, coarse_run.parameters, pv_name=coarse_run.pv_name)
+        self.transfer = MeshTransfer()
+        # a transfer is required, when the coarse problem has another mesh or other degrees
+        self.same_discretization = self.shapes(self.coarse.get_field_state()) == self.shapes(self.fine_fields)
+        self.run_time = 0
+
+    @staticmethod
+    def shapes(fields):
+        if isinstance(fields, dict):
+            return {key: CoarsePropagator.shapes(value) for key, value in fields.items()}
+        return np.shape(fields)
+
+    def transfer_fields(self, source, target, fields):
+        # interpolates the field state of the source problem to the discretization of the target problem
+        source.set_field_state(fields)
+        for (name, source_model), (_, target_model) in zip(models(source), models(target)):
+            for field in source_model.state_fields:
+                self.transfer(getattr(source_model, field), getattr(target_model, field))
+        target_fields = target.get_field_state()
+        # time steps and step counts are taken from the source
+        for name, _ in models(source):
+            for key, value in fields[name].items():
+                if not isinstance(value, np.ndarray):
+                    target_fields[name][key] = value
+        return target_fields
+
+    def __call__(self, fields, t_0, n_steps):
+        """propagates a fine field state over one time slice, returns the fine field state at its end"""
+        start = timer.perf_counter()
+        if not self.same_discretization:
+            fields = self.transfer_fields(self.fine, self.coarse, fields)
+
+        self.coarse.set_field_state(fields)
+        self.coarse.set_timestep(self.coarse_run.dt)
+        for i in range(1, n_steps + 1):
+            self.coarse.solve(t=t_0 + i * self.coarse_run.dt)
+        fields = self.coarse.get_field_state()
+
+        if not self.same_discretization:
+            fields = self.transfer_fields(self.coarse, self.fine, fields)
+        self.run_time += timer.perf_counter() - start
+        return fields
+
+
+def parareal(base_parameters, experiment_class, problem_class, sensors, dt, time, n_slices, coarse_dt,
+             coarse_parameters=None, tolerance=1e-6, max_iterations=None, processes=None,
+             pv_name='pv_output_parareal'):
+    """
+    time parallel simulation with the parareal method
+
+    the time is divided into slices. The coarse propagator runs sequentially in the current process, the fine
+    propagators of all slices run in parallel in a pool of processes. The slices are corrected with
+    U_n+1 = G(U_n) + F(U_n_old) - G(U_n_old) until the field states change less than the tolerance, after k
+    iterations the first k slices are exact. The problems are reused in the worker processes, as in `sweep`.
+    Triggers that stop the simulation are not supported.
+
+    Arguments:
+        base_parameters : Parameters
+            parameters of the fine problem
+        experiment_class : class
+            experimental setup, e.g. fenics_concrete.ConcreteCubeExperiment
+        problem_class : class
+            material problem with field states, e.g. fenics_concrete.ConcreteThermoMechanical
+        sensors : list
+            sensor objects, measured in the fine propagation of each slice
+        dt : float
+            time step of the fine propagator
+        time : float
+            end time of the simulation
+        n_slices : int
+            number of time slices, the slices have to be multiples of `dt` and `coarse_dt`
+        coarse_dt : float
+            time step of the coarse propagator
+        coarse_parameters : dict, optional
+            changed parameters of the coarse problem, e.g. {'mesh_density': 4} for a coarser mesh
+        tolerance : float, optional
+            largest relative change of the field states of the last iteration
+        max_iterations : int, optional
+            largest number of iterations, default is the number of slices, which gives the fine solution
+        processes : int, optional
+            number of worker processes, default is the number of cpus, 1 runs in the current process, see
+            `sweep.process_pool`
+        pv_name : string, optional
+            base name of the output files
+
+    returns a dict with the sensor data as {name: (time, data)}, the field state at the end time, the number of
+    iterations, the change of each iteration, whether the tolerance was reached, the wall clock time, the run time of
+    the fine propagators of the first iteration as estimate of a sequential fine simulation, the run time of the
+    coarse propagator and the speedup
+    """
+    start = timer.perf_counter()
+    slice_time = time / n_slices
+    n_fine = int(round(slice_time / dt))
+    n_coarse = int(round(slice_time / coarse_dt))
+    if not np.isclose(n_fine * dt, slice_time) or not np.isclose(n_coarse * coarse_dt, slice_time):
+        raise Exception('the time slices have to be multiples of the fine and the coarse time step')
+    if max_iterations is None:
+        max_iterations = n_slices
+
+    fine_run = RunSpec(0, experiment_class, problem_class, Parameters(base_parameters), {}, sensors, dt, time,
+                       pv_name)
+    coarse_run = RunSpec(-1, experiment_class, problem_class,
+                         Parameters(base_parameters) + Parameters(coarse_parameters or {}), {}, [], coarse_dt, time,
+                         f'{pv_name}_coarse')
+    coarse = CoarsePropagator(fine_run, coarse_run)
+
+    # initial coarse prediction
+    states = [coarse.fine_fields]
+    coarse_states = []
+    for n in range(n_slices):
+        coarse_states.append(coarse(states[n], n * slice_time, n_coarse))
+        states.append(coarse_states[n])
+
+    slices = [None] * n_slices  # results of the last fine propagation of each slice
+    changes = []
+    fine_time = None
+    converged = False
+    executor = None
+    if processes != 1:
+        check_picklable(sensors)
+        executor = process_pool(processes)
+    try:
+        for k in range(max_iterations):
+            # fine propagation of all slices that are not yet exact
+            specs = [SliceSpec(n, fine_run, states[n], n * slice_time, n_fine) for n in range(k, n_slices)]
+            if executor is None:
+                results = [propagate(spec) for spec in specs]
+            else:
+                results = list(executor.map(propagate, specs))
+            for result in results:
+                slices[result['index']] = result
+            if fine_time is None:
+                fine_time = sum(result['run_time'] for result in results)
+
+            # sequential correction, the slice k starts from an exact state
+            new_states = states[:k + 1]
+            new_states.append(slices[k]['fields'])
+            for n in range(k + 1, n_slices):
+                coarse_new = coarse(new_states[n], n * slice_time, n_coarse)
+                new_states.append(combine(coarse_new, slices[n]['fields'], coarse_states[n]))
+                coarse_states[n] = coarse_new
+
+            changes.append(max([state_change(new, old) for new, old in zip(new_states[k + 1:], states[k + 1:])]
+                               + [0.0]))
+            states = new_states
+            if changes[-1] < tolerance or k + 1 == n_slices:
+                converged = True
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # sensor data of the last fine propagation of each slice
+    sensor_data = {}
+    for result in slices:
+        for name, (times, data) in result['sensors'].items():
+            sensor_data.setdefault(name, ([], []))
+            sensor_data[name][0].extend(times)
+            sensor_data[name][1].extend(data)
+
+    run_time = timer.perf_counter() - start
+    return {'sensors': sensor_data,
+            'fields': states[-1],
+            'iterations': len(changes),
+            'changes': changes,
+            'converged': converged,
+            'run_time': run_time,
+            'fine_time': fine_time,
+            'coarse_time': coarse.run_time,
+            'speedup': fine_time / run_time}
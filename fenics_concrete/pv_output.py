@@ -0,0 +1,251 @@
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+class BinaryXDMFWriter:
+    """Paraview output with the data in a binary file, optionally written to disk by a background thread
+
+    `write` copies the values of a function into a snapshot. When asynchronous, it returns immediately and a
+    background thread appends the snapshots to the data file and keeps the xdmf file up to date. At most
+    `queue_size` snapshots wait to be written, `write` blocks when the queue is full.
+    The output can be restricted to a subset of the cells and written in single precision.
+    Only implemented in serial.
+    """
+
+    topology_types = {(1, 2): 'PolyLine', (2, 3): 'Triangle', (2, 4): 'Quadrilateral', (3, 4): 'Tetrahedron',
+                      (3, 8): 'Hexahedron'}
+    xml_head = ('<?xml version="1.0"?>\n<Xdmf Version="3.0">\n<Domain>\n'
+                '<Grid Name="TimeSeries" GridType="Collection" CollectionType="Temporal">\n')
+    xml_tail = '</Grid>\n</Domain>\n</Xdmf>\n'
+
+    def __init__(self, mesh, pv_name, asynchronous=True, cell_mask=None, precision='float64', queue_size=10,
+                 xml_interval=10.0):
+        """
+        Arguments:
+            mesh : dolfin mesh
+                mesh of the functions that are written
+            pv_name : string
+                file name without extension, writes `pv_name.xdmf` and the data file `pv_name.bin`
+            asynchronous : bool, optional
+                when True, the snapshots are written by a background thread
+            cell_mask : numpy array, optional
+                boolean array with one entry per cell, only the selected cells are written
+            precision : string, optional
+                'float64' or 'float32', precision of the written coordinates and values
+            queue_size : int, optional
+                maximum number of snapshots waiting to be written
+            xml_interval : float, optional
+                minimum time in seconds between updates of the xdmf file while running
+        """
+        self.mesh = mesh
+        self.asynchronous = asynchronous
+        self.dtype = np.dtype(precision)
+        self.cell_mask = cell_mask
+        self.vertices = None  # written vertices, when only a subset of the cells is written
+        if cell_mask is not None:
+            self.vertices = np.unique(mesh.cells()[cell_mask])
+        self.xdmf_file = pv_name + '.xdmf'
+        self.data_file = pv_name + '.bin'
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.xml_interval = xml_interval
+        self.thread = None  # started with the first output
+        self.started = False
+        self.closed = False
+        self.error = None
+        self.cell_dofs = {}  # dofs of each cell for cell centered output, per function space
+
+        # only used by the background thread
+        self.mesh_xml = None
+        self.steps = []  # steps that are not yet final in the xdmf file, list of [time, list of attribute xml strings]
+        self.xml = None  # xdmf file, opened with the first update
+        self.xml_offset = 0  # end of the final steps in the xdmf file, followed by the last step and the tail
+        self.last_xml_write = 0
+
+    def write(self, function, t, encoding=None):
+        """
+        Arguments:
+            function : dolfin function
+                function to write, the name of the function is used as field name
+            t : float
+                time of the output
+            encoding : optional
+                ignored, only for compatibility with dolfin.XDMFFile
+        """
+        self.check_error()
+        if self.closed:
+            raise RuntimeError(f'Writing to closed paraview output {self.xdmf_file}')
+        if not self.started:
+            self.start()
+
+        center, values = self.snapshot(function)
+        self.put(('field', t, function.name(), center, values))
+
+    def snapshot(self, function):
+        # copy of the values, at the vertices or for DG0 functions at the cells
+        V = function.function_space()
+        element = V.ufl_element()
+        shape = function.ufl_shape
+        value_size = int(np.prod(shape)) if shape else 1
+
+        if element.family() == 'Discontinuous Lagrange' and element.degree() == 0:
+            center = 'Cell'
+            if V.id() not in self.cell_dofs:
+                dofmap = V.dofmap()
+                self.cell_dofs[V.id()] = np.array([dofmap.cell_dofs(cell) for cell in range(self.mesh.num_cells())])
+            values = function.vector().get_local()[self.cell_dofs[V.id()]].reshape(-1, value_size)
+        else:
+            center = 'Node'
+            values = function.compute_vertex_values(self.mesh).reshape(value_size, -1).T
+
+        # restriction to the selected cells
+        if self.cell_mask is not None:
+            values = values[self.cell_mask] if center == 'Cell' else values[self.vertices]
+
+        # paraview expects three components for vectors and nine for tensors
+        if len(shape) == 1 and shape[0] < 3:
+            values = np.hstack((values, np.zeros((len(values), 3 - shape[0]))))
+        elif len(shape) == 2 and shape[0] == shape[1] and shape[0] < 3:
+            n = shape[0]
+            padded = np.zeros((len(values), 3, 3))
+            padded[:, :n, :n] = values.reshape(-1, n, n)
+            values = padded.reshape(-1, 9)
+
+        return center, np.ascontiguousarray(values, dtype=self.dtype)
+
+    def start(self):
+        coordinates = self.mesh.coordinates()
+        if coordinates.shape[1] == 1:
+            coordinates = np.hstack((coordinates, np.zeros_like(coordinates)))
+        cells = self.mesh.cells().astype(np.int64)
+        if self.cell_mask is not None:
+            # renumber the vertices of the selected cells
+            coordinates = coordinates[self.vertices]
+            cells = np.searchsorted(self.vertices, cells[self.cell_mask])
+        coordinates = np.ascontiguousarray(coordinates, dtype=self.dtype)
+
+        self.started = True
+        if self.asynchronous:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        else:
+            self.data = open(self.data_file, 'wb')
+        self.put(('mesh', coordinates, cells, self.mesh.topology().dim()))
+
+    def put(self, item):
+        if self.asynchronous:
+            self.queue.put(item)
+        else:
+            self.process(self.data, item)
+            self.check_error()
+
+    def flush(self):
+        """Waits until all snapshots are written and updates the xdmf file"""
+        if self.started:
+            self.put(('flush',))
+            self.queue.join()
+        self.check_error()
+
+    def close(self):
+        """Writes all remaining snapshots and stops the background thread"""
+        if self.started and not self.closed:
+            if self.asynchronous:
+                self.queue.put(None)
+                self.thread.join()
+            else:
+                self.process(self.data, ('close',))
+                self.data.close()
+        self.closed = True
+        self.check_error()
+
+    def check_error(self):
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise RuntimeError(f'Writing paraview output {self.xdmf_file} failed') from error
+
+    # background thread
+    def run(self):
+        with open(self.data_file, 'wb') as data:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    self.process(data, ('close',))
+                    self.queue.task_done()
+                    break
+                self.process(data, item)
+                self.queue.task_done()
+
+    def process(self, data, item):
+        try:
+            if item[0] == 'mesh':
+                self.add_mesh(data, *item[1:])
+            elif item[0] == 'field':
+                self.add_field(data, *item[1:])
+                if time.monotonic() - self.last_xml_write > self.xml_interval:
+                    data.flush()
+                    self.write_xml()
+            elif item[0] == 'flush':
+                data.flush()
+                self.write_xml()
+            elif item[0] == 'close':
+                data.flush()
+                self.write_xml()
+                if self.xml is not None:
+                    self.xml.close()
+        except Exception as e:
+            # the snapshots are still consumed, the error is raised in the main thread
+            self.error = e
+
+    def data_item(self, data, array):
+        # appends the array to the data file and returns the xdmf reference
+        offset = data.tell()
+        data.write(array.tobytes())
+        number_type = 'Int' if array.dtype.kind in 'iu' else 'Float'
+        dimensions = ' '.join(str(d) for d in array.shape)
+        return (f'<DataItem Dimensions="{dimensions}" NumberType="{number_type}" '
+                f'Precision="{array.dtype.itemsize}" Format="Binary" Endian="Native" Seek="{offset}">'
+                f'{os.path.basename(self.data_file)}</DataItem>')
+
+    def add_mesh(self, data, coordinates, cells, tdim):
+        topology_type = self.topology_types[(tdim, cells.shape[1])]
+        geometry_type = 'XY' if coordinates.shape[1] == 2 else 'XYZ'
+        self.mesh_xml = (f'<Topology NumberOfElements="{len(cells)}" TopologyType="{topology_type}" '
+                         f'NodesPerElement="{cells.shape[1]}">{self.data_item(data, cells)}</Topology>'
+                         f'<Geometry GeometryType="{geometry_type}">{self.data_item(data, coordinates)}</Geometry>')
+
+    def add_field(self, data, t, name, center, values):
+        attribute_type = {1: 'Scalar', 3: 'Vector', 9: 'Tensor'}.get(values.shape[1], 'Matrix')
+        attribute = (f'<Attribute Name="{name}" AttributeType="{attribute_type}" Center="{center}">'
+                     f'{self.data_item(data, values)}</Attribute>')
+        if not self.steps or self.steps[-1][0] != t:
+            self.steps.append([t, []])
+        self.steps[-1][1].append(attribute)
+
+    def grid_xml(self, t, attributes):
+        return (f'<Grid Name="mesh" GridType="Uniform">{self.mesh_xml}<Time Value="{t}" />'
+                f'{"".join(attributes)}</Grid>\n')
+
+    def write_xml(self):
+        # appends the new steps before the closing tail, only the last step is written again with each update,
+        # because further fields can be added to it
+        if self.mesh_xml is None:
+            return
+        if self.xml is None:
+            self.xml = open(self.xdmf_file, 'wb')
+            self.xml.write(self.xml_head.encode())
+            self.xml_offset = self.xml.tell()
+        self.xml.seek(self.xml_offset)
+        for t, attributes in self.steps[:-1]:
+            self.xml.write(self.grid_xml(t, attributes).encode())
+        self.xml_offset = self.xml.tell()
+        del self.steps[:-1]
+        for t, attributes in self.steps:
+            self.xml.write(self.grid_xml(t, attributes).encode())
+        self.xml.write(self.xml_tail.encode())
+        self.xml.truncate()
+        self.xml.flush()
+        self.last_xml_write = time.monotonic()
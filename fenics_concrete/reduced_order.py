@@ -0,0 +1,171 @@
+"""Offline part of the reduced order model of the temperature and hydration problem
+
+The temperature is approximated by a POD basis of snapshots of full runs, T = lift + basis @ a, where the lift has
+the boundary values at the Dirichlet dofs and is zero elsewhere. The heat of hydration is a nonlinear function of
+the temperature at each quadrature point, it is hyper-reduced with DEIM: the increase of the degree of hydration
+is only computed at a few selected quadrature points and interpolated with a second POD basis.
+
+The reduced matrices are computed once from a full problem with `ReducedBasis`, the online problem is
+`fenics_concrete.ReducedConcreteThermal`. The model is built and solved in serial.
+"""
+
+import pickle
+
+import dolfin as df
+import numpy as np
+
+from fenics_concrete.helpers import LocalProjector
+from fenics_concrete.helpers import set_q
+from fenics_concrete.helpers import volume_weight
+
+
+def pod(snapshots, tolerance=1e-8, max_modes=None):
+    """
+    proper orthogonal decomposition of snapshots
+
+    snapshots:
+        array with one snapshot per column
+    tolerance:
+        largest relative energy of the discarded modes
+    max_modes:
+        largest number of modes, optional
+
+    returns the basis, the singular values and the relative energy of the discarded modes
+    """
+    u, s, _ = np.linalg.svd(snapshots, full_matrices=False)
+    total = np.sum(s ** 2)
+    if total == 0:
+        raise Exception('all snapshots are zero, a POD basis can not be computed')
+    energy = np.cumsum(s ** 2) / total
+    n = min(int(np.searchsorted(energy, 1 - tolerance)) + 1, len(s))
+    if max_modes is not None:
+        n = min(n, max_modes)
+    return u[:, :n], s, max(1 - energy[n - 1], 0.0)
+
+
+def deim_indices(basis):
+    """greedy selection of the interpolation points of the discrete empirical interpolation method"""
+    indices = [int(np.argmax(np.abs(basis[:, 0])))]
+    for j in range(1, basis.shape[1]):
+        coefficients = np.linalg.solve(basis[indices, :j], basis[indices, j])
+        residual = basis[:, j] - basis[:, :j] @ coefficients
+        indices.append(int(np.argmax(np.abs(residual))))
+    return np.array(indices)
+
+
+class ReducedBasis:
+    """Reduced matrices of the temperature and hydration problem, computed from snapshots of full runs"""
+
+    def __init__(self, problem, snapshots, tolerance=1e-8, max_modes=None, deim_tolerance=1e-8,
+                 max_deim_modes=None):
+        """
+        Arguments:
+            problem : ConcreteThermoMechanical
+                full problem on the geometry of the reduced model, with a temperature problem, e.g. in the thermal
+                mode, its parameters are the defaults of the reduced model
+            snapshots : list
+                data of SnapshotSensors of one or more full runs on the same mesh, the runs should cover the range
+                of the parameters of the online solves
+            tolerance : float, optional
+                largest relative energy of the discarded temperature modes
+            max_modes : int, optional
+                largest number of temperature modes
+            deim_tolerance : float, optional
+                largest relative energy of the discarded modes of the increase of the degree of hydration
+            max_deim_modes : int, optional
+                largest number of interpolation points
+        """
+        temperature_problem = problem.temperature_problem
+        mesh = problem.experiment.mesh
+        if df.MPI.size(mesh.mpi_comm()) > 1:
+            raise Exception('the reduced order model is only implemented in serial')
+
+        # parameters of the full problem, stored as dict to be picklable
+        self.parameters = dict(problem.p)
+        V = temperature_problem.V
+        q_V = temperature_problem.q_V
+        dxm = temperature_problem.dxm
+        w = volume_weight(mesh, problem.p)
+
+        # temperature modes, the snapshots are zero at the Dirichlet dofs after subtracting the lift
+        lift = boundary_lift(problem.experiment, V)
+        T_snapshots = np.array([snapshot['T'] - lift for snapshot in snapshots]).T
+        self.basis, self.singular_values, self.pod_error = pod(T_snapshots, tolerance, max_modes)
+
+        # modes and interpolation points of the increase of the degree of hydration
+        alpha_snapshots = np.array([snapshot['delta_alpha'] for snapshot in snapshots]).T
+        deim_basis, self.deim_singular_values, self.deim_error = pod(alpha_snapshots, deim_tolerance,
+                                                                     max_deim_modes)
+        self.indices = deim_indices(deim_basis)
+        interpolation = np.linalg.inv(deim_basis[self.indices])
+        # amplification of the DEIM error by the interpolation, the error is at most this factor times the error
+        # of the best approximation in the DEIM basis
+        self.deim_constant = np.linalg.norm(interpolation, 2)
+
+        # mass and stiffness matrices without the material parameters
+        T_ = df.TrialFunction(V)
+        vT = df.TestFunction(V)
+        M = df.assemble(T_ * vT * w * dxm)
+        K = df.assemble(df.dot(df.grad(T_), df.grad(vT)) * w * dxm)
+        x = df.Function(V)
+        self.mass_basis = np.zeros_like(self.basis)
+        self.stiffness_basis = np.zeros_like(self.basis)
+        basis_at_points = np.zeros((len(self.indices), self.basis.shape[1]))
+        q_T = df.Function(q_V)
+        project_T = LocalProjector(x, q_V, dxm)
+        for i in range(self.basis.shape[1]):
+            set_q(x, self.basis[:, i])
+            self.mass_basis[:, i] = (M * x.vector()).get_local()
+            self.stiffness_basis[:, i] = (K * x.vector()).get_local()
+            project_T(q_T)
+            basis_at_points[:, i] = q_T.vector().get_local()[self.indices]
+        self.mass = self.basis.T @ self.mass_basis
+        self.stiffness = self.basis.T @ self.stiffness_basis
+        self.basis_at_points = basis_at_points
+
+        # heat of hydration without Q_inf, as function of the values at the interpolation points
+        q_mode = df.Function(q_V)
+        source = np.zeros((self.basis.shape[1], deim_basis.shape[1]))
+        for j in range(deim_basis.shape[1]):
+            set_q(q_mode, deim_basis[:, j])
+            source[:, j] = self.basis.T @ df.assemble(q_mode * vT * w * dxm).get_local()
+        self.source = source @ interpolation
+
+    @property
+    def size(self):
+        """number of temperature modes and of interpolation points"""
+        return self.basis.shape[1], len(self.indices)
+
+    def save(self, file_name):
+        """writes the basis to a pickle file"""
+        with open(file_name, 'wb') as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(file_name):
+        with open(file_name, 'rb') as f:
+            return pickle.load(f)
+
+
+def boundary_lift(experiment, V):
+    """vector with the temperature boundary values at the Dirichlet dofs, zero elsewhere"""
+    lift = df.Function(V)
+    for bc in experiment.create_temp_bcs(V):
+        bc.apply(lift.vector())
+    return lift.vector().get_local()
+
+
+def compare_sensors(reduced, full):
+    """
+    errors of the sensors of a reduced problem against a full problem with the same sensors and times
+
+    returns a dict {sensor name: (largest absolute error, largest error relative to the largest full value)}
+    """
+    errors = {}
+    for name, sensor in full.sensors.items():
+        full_data = np.asarray(sensor.data, dtype=float)
+        reduced_data = np.asarray(reduced.sensors[name].data, dtype=float)
+        error = np.max(np.abs(reduced_data - full_data))
+        scale = np.max(np.abs(full_data))
+        errors[name] = (error, error / scale if scale > 0 else error)
+    return errors
@@ -0,0 +1,234 @@
+"""Fast screening models of the heat of hydration, only depend on numpy
+
+A sample with uniform temperature (adiabatic or semi-adiabatic) and the temperature profile through the thickness
+of a wall or slab. The models share the kinetics of `fenics_concrete.hydration` and take the parameters of
+ConcreteThermoMechanical as dict or Parameters with the entries
+    B1, B2, eta, alpha_max, E_act, T_ref, temp_adjust_law, igc, zero_C : kinetics, see hydration
+    Q_inf : potential heat per concrete volume in J/m^3
+    vol_heat_cap : volumetric heat capacity in J/(m^3 K)
+    themal_cond : thermal conductivity in W/(m K), only for the slab
+    T_0 : initial temperature in celsius
+Each numeric entry can be an array, the models are evaluated for all parameter sets at once.
+"""
+
+import numpy as np
+
+from fenics_concrete import hydration
+
+
+def parameter_shape(p):
+    """shape of the parameter sets, broadcast from the shapes of the numeric entries"""
+    return np.broadcast_shapes(*[np.shape(value) for value in p.values() if not isinstance(value, str)])
+
+
+def expand_parameters(p, n_axes):
+    """parameters with `n_axes` trailing axes added to the array entries, to broadcast with the points"""
+    return {key: value if isinstance(value, str) or np.ndim(value) == 0
+            else np.reshape(value, np.shape(value) + (1,) * n_axes) for key, value in p.items()}
+
+
+def solve_delta_alpha(residual, derivative, x0=0.2, tolerance=1e-12, max_iterations=50):
+    """
+    vectorized newton iteration for the increase of the degree of hydration in one time step
+
+    newton can converge to a negative root at small degrees of hydration, these points are solved again with a
+    larger starting value
+
+    residual, derivative:
+        functions of delta alpha
+    x0:
+        starting value, array or scalar
+    """
+    def newton(delta_alpha):
+        for _ in range(max_iterations):
+            step = residual(delta_alpha) / derivative(delta_alpha)
+            delta_alpha = delta_alpha - step
+            if np.all(np.abs(step) < tolerance):
+                break
+        return delta_alpha
+
+    delta_alpha = newton(x0)
+    if np.any(delta_alpha < 0):
+        delta_alpha = np.where(delta_alpha < 0, newton(np.full_like(delta_alpha, 0.5)), delta_alpha)
+    if np.any(delta_alpha < 0):
+        raise Exception('There is a problem with the alpha computation, computed delta alpha is negative.')
+    return delta_alpha
+
+
+def semi_adiabatic(p, time, dt, heat_loss=0.0, T_env=None):
+    """
+    temperature and degree of hydration of a sample with uniform temperature
+
+    c dT/dt = Q_inf dalpha/dt - heat_loss (T - T_env), integrated with backward euler
+
+    p:
+        parameters, see the module documentation
+    time:
+        end time in s
+    dt:
+        time step in s
+    heat_loss:
+        heat loss per volume and temperature difference in W/(m^3 K), the surface heat transfer coefficient times
+        surface per volume, 0 is adiabatic
+    T_env:
+        environment temperature in celsius, default is T_0
+
+    returns the times, the temperatures in celsius and the degrees of hydration, with one row per time and the
+    shape of the parameter sets
+    """
+    shape = parameter_shape(p)
+    n_steps = int(round(time / dt))
+    T_env = p['T_0'] if T_env is None else T_env
+    T_env = T_env + p['zero_C']
+    heat = p['Q_inf'] / p['vol_heat_cap']  # temperature increase per degree of hydration
+    loss = dt * heat_loss / p['vol_heat_cap']
+
+    T = np.broadcast_to(p['T_0'] + p['zero_C'], shape).astype(float)
+    alpha = np.zeros(shape)
+    delta_alpha = np.full(shape, 0.2)
+    T_list = [T]
+    alpha_list = [alpha]
+    for _ in range(n_steps):
+        T_n, alpha_n = T, alpha
+
+        def temperature(delta):
+            return (T_n + heat * delta + loss * T_env) / (1 + loss)
+
+        def residual(delta):
+            return delta - dt * hydration.affinity(delta, alpha_n, p) * hydration.temp_adjust(temperature(delta), p)
+
+        def derivative(delta):
+            T_delta = temperature(delta)
+            return 1 - dt * (hydration.daffinity_ddalpha(delta, alpha_n, p) * hydration.temp_adjust(T_delta, p)
+                             + hydration.affinity(delta, alpha_n, p) * hydration.temp_adjust_tangent(T_delta, p)
+                             * heat / (1 + loss))
+
+        delta_alpha = solve_delta_alpha(residual, derivative, delta_alpha)
+        alpha = alpha_n + delta_alpha
+        T = temperature(delta_alpha)
+        T_list.append(T)
+        alpha_list.append(alpha)
+
+    return dt * np.arange(n_steps + 1), np.array(T_list) - p['zero_C'], np.array(alpha_list)
+
+
+def adiabatic(p, time, dt):
+    """temperature and degree of hydration of an adiabatic sample, see `semi_adiabatic`"""
+    return semi_adiabatic(p, time, dt)
+
+
+def solve_tridiagonal(lower, diagonal, upper, rhs):
+    """thomas algorithm for tridiagonal systems along the last axis, vectorized over the other axes"""
+    n = rhs.shape[-1]
+    c = np.zeros(rhs.shape)
+    d = np.zeros(rhs.shape)
+    c[..., 0] = upper[..., 0] / diagonal[..., 0]
+    d[..., 0] = rhs[..., 0] / diagonal[..., 0]
+    for i in range(1, n):
+        denominator = diagonal[..., i] - lower[..., i] * c[..., i - 1]
+        if i < n - 1:
+            c[..., i] = upper[..., i] / denominator
+        d[..., i] = (rhs[..., i] - lower[..., i] * d[..., i - 1]) / denominator
+    x = np.zeros(rhs.shape)
+    x[..., -1] = d[..., -1]
+    for i in range(n - 2, -1, -1):
+        x[..., i] = d[..., i] - c[..., i] * x[..., i + 1]
+    return x
+
+
+def slab(p, thickness, time, dt, n_elements=20, T_env=None, heat_transfer=None):
+    """
+    temperature profile through the thickness of a wall or slab, both faces are cooled by the environment
+
+    linear finite elements with lumped capacity, the degree of hydration is integrated at the nodes, backward euler
+    in time with a newton iteration of the coupled problem
+
+    p:
+        parameters, see the module documentation
+    thickness:
+        thickness in m
+    time:
+        end time in s
+    dt:
+        time step in s
+    n_elements:
+        number of elements through the thickness
+    T_env:
+        environment temperature in celsius, default is T_0
+    heat_transfer:
+        surface heat transfer coefficient in W/(m^2 K), None for the environment temperature at the faces
+
+    returns the times, the coordinates of the nodes, the temperatures in celsius and the degrees of hydration, with
+    one row per time, the shape of the parameter sets and one value per node
+    """
+    shape = parameter_shape(p) + (n_elements + 1,)
+    q = expand_parameters(p, 1)
+    n_steps = int(round(time / dt))
+    x = np.linspace(0, thickness, n_elements + 1)
+    h = thickness / n_elements
+    T_env = q['T_0'] if T_env is None else T_env
+    T_env = T_env + q['zero_C']
+
+    # lumped capacity and conductivity matrix
+    mass = np.full(n_elements + 1, h)
+    mass[[0, -1]] = h / 2
+    capacity = q['vol_heat_cap'] * mass
+    conductivity = q['themal_cond'] / h
+    surface = np.zeros(n_elements + 1)
+    surface[[0, -1]] = 1
+    dirichlet = heat_transfer is None
+    robin = 0 if dirichlet else dt * heat_transfer * surface
+
+    T = np.broadcast_to(q['T_0'] + q['zero_C'], shape).astype(float)
+    alpha = np.zeros(shape)
+    delta_alpha = np.full(shape, 0.2)
+    T_list = [T]
+    alpha_list = [alpha]
+    for _ in range(n_steps):
+        T_n, alpha_n = T, alpha
+        T = T_n.copy()
+        for _ in range(25):
+            def residual(delta):
+                return hydration.delta_alpha_fkt(delta, alpha_n, T, dt, q)
+
+            def derivative(delta):
+                return hydration.delta_alpha_prime(delta, alpha_n, T, dt, q)
+
+            delta_alpha = solve_delta_alpha(residual, derivative, delta_alpha)
+            ddalpha_dT = dt * hydration.affinity(delta_alpha, alpha_n, q) * hydration.temp_adjust_tangent(T, q) \
+                         / hydration.delta_alpha_prime(delta_alpha, alpha_n, T, dt, q)
+
+            # residual and tangent of the heat balance at the nodes
+            flux = np.zeros(shape)
+            flux[..., :-1] += conductivity * (T[..., :-1] - T[..., 1:])
+            flux[..., 1:] += conductivity * (T[..., 1:] - T[..., :-1])
+            R = capacity * (T - T_n) + dt * flux + robin * (T - T_env) - q['Q_inf'] * mass * delta_alpha
+            diagonal = np.broadcast_to(capacity + robin - q['Q_inf'] * mass * ddalpha_dT, shape).copy()
+            diagonal[..., 1:-1] += 2 * dt * conductivity
+            diagonal[..., [0, -1]] += dt * conductivity
+            off_diagonal = np.broadcast_to(-dt * conductivity, shape).copy()
+            if dirichlet:
+                R[..., [0, -1]] = T[..., [0, -1]] - T_env
+                diagonal[..., [0, -1]] = 1
+                lower = off_diagonal.copy()
+                upper = off_diagonal.copy()
+                lower[..., -1] = 0
+                upper[..., 0] = 0
+            else:
+                lower = upper = off_diagonal
+
+            dT = solve_tridiagonal(lower, diagonal, upper, -R)
+            T = T + dT
+            if np.all(np.abs(dT) < 1e-8):
+                break
+        else:
+            raise Exception('The slab temperature did not converge')
+
+        delta_alpha = solve_delta_alpha(lambda delta: hydration.delta_alpha_fkt(delta, alpha_n, T, dt, q),
+                                        lambda delta: hydration.delta_alpha_prime(delta, alpha_n, T, dt, q),
+                                        delta_alpha)
+        alpha = alpha_n + delta_alpha
+        T_list.append(T)
+        alpha_list.append(alpha)
+
+    return dt * np.arange(n_steps + 1), x, np.array(T_list) - q['zero_C'], np.array(alpha_list)
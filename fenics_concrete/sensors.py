@@ -1,6 +1,11 @@
 import dolfin as df
 import numpy as np
 
+from fenics_concrete.helpers import evaluate_at_point
+from fenics_concrete.helpers import visu_projector
+from fenics_concrete.hydration_history import HydrationHistory
+from fenics_concrete.triggers import Triggerable
+
 
 class Sensors(dict):
     """
@@ -29,18 +34,52 @@ class Sensors(dict):
         super().__setitem__(key, value)
 
 
+def quadrature_degree(p):
+    """quadrature degree of the stresses and strains of a problem"""
+    return p.get('quadrature_degree') or p.get('degree_u') or p.degree
+
+
+def tensor_signs(signs, function):
+    """signs of the flattened tensor components at a mirrored point, the shear components between a mirrored and
+    a not mirrored direction change their sign"""
+    shape = function.ufl_shape
+    signs = list(signs) + [1] * (shape[0] - len(signs))
+    return np.outer(signs, signs)[:shape[0], :shape[1]].flatten()
+
+
 # sensor template
-class Sensor:
+class Sensor(Triggerable):
     """Template for a sensor object"""
 
+    # 'temperature' or 'mechanics' for sensors that measure fields of that model, checked when the sensor is added
+    required_model = None
+
+    def __init__(self):
+        self.data = []
+        self.time = []
+        self.triggers = []  # trigger conditions, checked after each solve
+
     def measure(self, problem, t):
         """Needs to be implemented in child, depending on the sensor"""
         raise NotImplementedError()
 
+    def reset(self):
+        """Clears the measured data and reactivates the triggers"""
+        self.data = []
+        self.time = []
+        self.reset_triggers()
+
     @property
     def name(self):
         return self.__class__.__name__
 
+    def location(self, problem):
+        """Location of the sensor in the mesh and the signs of the directions in which it was mirrored
+
+        The location `where` is given in the full body, for symmetric models it is mirrored into the meshed part.
+        """
+        return problem.experiment.map_point(self.where)
+
     def data_max(self, value):
         if self.max: # check for initial value (None is default)
             if value > self.max:
@@ -53,15 +92,16 @@ class Sensor:
 class DisplacementSensor(Sensor):
     """A sensor that measure displacement at a specific point"""
 
+    required_model = 'mechanics'
+
     def __init__(self, where):
         """
         Arguments:
             where : Point
                 location where the value is measured
         """
+        super().__init__()
         self.where = where
-        self.data = []
-        self.time = []
 
     def measure(self, problem, t=1.0):
         """
@@ -70,23 +110,25 @@ class DisplacementSensor(Sensor):
             t : float, optional
                 time of measurement for time dependent problems
         """
-        # get displacements
-        self.data.append(problem.displacement(self.where))
+        # get displacements, the component normal to a symmetry plane changes its sign at mirrored points
+        point, signs = self.location(problem)
+        self.data.append(evaluate_at_point(problem.displacement, point) * np.array(signs))
         self.time.append(t)
 
 
 class TemperatureSensor(Sensor):
     """A sensor that measure temperature at a specific point in celsius"""
 
+    required_model = 'temperature'
+
     def __init__(self, where):
         """
         Arguments:
             where : Point
                 location where the value is measured
         """
+        super().__init__()
         self.where = where
-        self.data = []
-        self.time = []
 
     def measure(self, problem, t=1.0):
         """
@@ -95,7 +137,8 @@ class TemperatureSensor(Sensor):
             t : float, optional
                 time of measurement for time dependent problems
         """
-        T = problem.temperature(self.where) - problem.p.zero_C
+        point, _ = self.location(problem)
+        T = evaluate_at_point(problem.temperature, point) - problem.p.zero_C
         self.data.append(T)
         self.time.append(t)
 
@@ -103,9 +146,15 @@ class TemperatureSensor(Sensor):
 class MaxTemperatureSensor(Sensor):
     """A sensor that measure the maximum temperature at each timestep"""
 
+    state_attributes = ('data', 'time', 'max')
+    required_model = 'temperature'
+
     def __init__(self):
-        self.data = []
-        self.time = []
+        super().__init__()
+        self.max = None
+
+    def reset(self):
+        super().reset()
         self.max = None
 
     def measure(self, problem, t=1.0):
@@ -115,7 +164,7 @@ class MaxTemperatureSensor(Sensor):
             t : float, optional
                 time of measurement for time dependent problems
         """
-        max_T = np.amax(problem.temperature.vector().get_local()) - problem.p.zero_C
+        max_T = problem.temperature.vector().max() - problem.p.zero_C
         self.data.append(max_T)
         self.data_max(max_T)
         self.time.append(t)
@@ -130,9 +179,8 @@ class DOHSensor(Sensor):
             where : Point
                 location where the value is measured
         """
+        super().__init__()
         self.where = where
-        self.data = []
-        self.time = []
 
     def measure(self, problem, t=1.0):
         """
@@ -143,7 +191,8 @@ class DOHSensor(Sensor):
         """
         # get DOH
         # TODO: problem with projected field onto linear mesh!?!
-        alpha = problem.degree_of_hydration(self.where)
+        point, _ = self.location(problem)
+        alpha = evaluate_at_point(problem.degree_of_hydration, point)
         self.data.append(alpha)
         self.time.append(t)
 
@@ -152,8 +201,7 @@ class MinDOHSensor(Sensor):
     """A sensor that measure the minimum degree of hydration at each timestep"""
 
     def __init__(self):
-        self.data = []
-        self.time = []
+        super().__init__()
 
     def measure(self, problem, t=1.0):
         """
@@ -163,7 +211,7 @@ class MinDOHSensor(Sensor):
                 time of measurement for time dependent problems
         """
         # get min DOH
-        min_DOH = np.amin(problem.q_degree_of_hydration.vector().get_local())
+        min_DOH = problem.q_degree_of_hydration.vector().min()
         self.data.append(min_DOH)
         self.time.append(t)
 
@@ -173,9 +221,15 @@ class MaxYieldSensor(Sensor):
 
     A max value > 0 indicates that at some place the stress exceeds the limits"""
 
+    state_attributes = ('data', 'time', 'max')
+    required_model = 'mechanics'
+
     def __init__(self):
-        self.data = []
-        self.time = []
+        super().__init__()
+        self.max = None
+
+    def reset(self):
+        super().reset()
         self.max = None
 
     def measure(self, problem, t=1.0):
@@ -185,7 +239,7 @@ class MaxYieldSensor(Sensor):
             t : float, optional
                 time of measurement for time dependent problems
         """
-        max_yield = np.amax(problem.q_yield.vector().get_local())
+        max_yield = problem.q_yield.vector().max()
         self.data.append(max_yield)
         self.time.append(t)
         self.data_max(max_yield)
@@ -194,9 +248,10 @@ class MaxYieldSensor(Sensor):
 class ReactionForceSensorBottom(Sensor):
     """A sensor that measure the reaction force at the bottom perpendicular to the surface"""
 
+    required_model = 'mechanics'
+
     def __init__(self):
-        self.data = []
-        self.time = []
+        super().__init__()
 
     def measure(self, problem, t=1.0):
         """
@@ -210,12 +265,13 @@ class ReactionForceSensorBottom(Sensor):
 
         v_reac = df.Function(problem.V)
         if problem.p.dim == 2:
-            bc_z = df.DirichletBC(problem.V.sub(1), df.Constant(1.), bottom_surface)
+            bc_z = df.DirichletBC(problem.V.sub(1), df.Constant(1.), *bottom_surface)
         elif problem.p.dim == 3:
-            bc_z = df.DirichletBC(problem.V.sub(2), df.Constant(1.), bottom_surface)
+            bc_z = df.DirichletBC(problem.V.sub(2), df.Constant(1.), *bottom_surface)
 
         bc_z.apply(v_reac.vector())
-        computed_force = (-df.assemble(df.action(problem.residual, v_reac)))
+        # force of the full body, for symmetric models the force of the meshed part is multiplied
+        computed_force = (-df.assemble(df.action(problem.residual, v_reac))) * problem.experiment.symmetry_factor()
 
         self.data.append(computed_force)
         self.time.append(t)
@@ -224,15 +280,18 @@ class ReactionForceSensorBottom(Sensor):
 class StressSensor(Sensor):
     """A sensor that measure the stress tensor in at a point"""
 
+    required_model = 'mechanics'
+
     def __init__(self, where):
         """
         Arguments:
             where : Point
                 location where the value is measured
         """
+        super().__init__()
         self.where = where
-        self.data = []
-        self.time = []
+        self.stress = None
+        self.project_stress = None  # set up with the first measurement
 
     def measure(self, problem, t=1.0):
         """
@@ -242,22 +301,30 @@ class StressSensor(Sensor):
                 time of measurement for time dependent problems
         """
         # get stress
-        stress = df.project(problem.stress, problem.visu_space_T, form_compiler_parameters={'quadrature_degree': problem.p.degree})
-        self.data.append(stress(self.where))
+        if self.project_stress is None:
+            self.stress = df.Function(problem.visu_space_T)
+            self.project_stress = visu_projector(problem.stress, problem.visu_space_T,
+                                                 df.dx(metadata={'quadrature_degree': quadrature_degree(problem.p)}))
+        self.project_stress(self.stress)
+        point, signs = self.location(problem)
+        self.data.append(evaluate_at_point(self.stress, point) * tensor_signs(signs, self.stress))
         self.time.append(t)
 
 class StrainSensor(Sensor):
     """A sensor that measure the strain tensor in at a point"""
 
+    required_model = 'mechanics'
+
     def __init__(self, where):
         """
         Arguments:
             where : Point
                 location where the value is measured
         """
+        super().__init__()
         self.where = where
-        self.data = []
-        self.time = []
+        self.strain = None
+        self.project_strain = None  # set up with the first measurement
 
     def measure(self, problem, t=1.0):
         """
@@ -267,6 +334,53 @@ class StrainSensor(Sensor):
                 time of measurement for time dependent problems
         """
         # get strain
-        strain = df.project(problem.strain, problem.visu_space_T, form_compiler_parameters={'quadrature_degree': problem.p.degree})
-        self.data.append(strain(self.where))
-        self.time.append(t)
\ No newline at end of file
+        if self.project_strain is None:
+            self.strain = df.Function(problem.visu_space_T)
+            self.project_strain = visu_projector(problem.strain, problem.visu_space_T,
+                                                 df.dx(metadata={'quadrature_degree': quadrature_degree(problem.p)}))
+        self.project_strain(self.strain)
+        point, signs = self.location(problem)
+        self.data.append(evaluate_at_point(self.strain, point) * tensor_signs(signs, self.strain))
+        self.time.append(t)
+
+class HydrationHistorySensor(Sensor):
+    """A sensor that records the degree of hydration at all local quadrature points, to drive later runs with
+    problem_mode 'mechanical'"""
+
+    def __init__(self):
+        super().__init__()
+
+    def measure(self, problem, t=1.0):
+        """
+        Arguments:
+            problem : FEM problem object
+            t : float, optional
+                time of measurement for time dependent problems
+        """
+        self.data.append(problem.q_degree_of_hydration.vector().get_local())
+        self.time.append(t)
+
+    def history(self):
+        """returns the recorded values as HydrationHistory"""
+        return HydrationHistory(self.time, self.data)
+
+
+class SnapshotSensor(Sensor):
+    """A sensor that records the temperature at all local dofs and the increase of the degree of hydration at all
+    local quadrature points, the snapshots of a reduced order model, see fenics_concrete.reduced_order"""
+
+    required_model = 'temperature'
+
+    def __init__(self):
+        super().__init__()
+
+    def measure(self, problem, t=1.0):
+        """
+        Arguments:
+            problem : FEM problem object
+            t : float, optional
+                time of measurement for time dependent problems
+        """
+        self.data.append({'T': problem.temperature.vector().get_local(),
+                          'delta_alpha': problem.temperature_problem.q_delta_alpha.vector().get_local()})
+        self.time.append(t)
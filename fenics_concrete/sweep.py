@@ -0,0 +1,226 @@
+import concurrent.futures
+import copy
+import multiprocessing
+import pickle
+import time as timer
+
+from fenics_concrete.parameters import Parameters
+
+# experiments and problems of the current process, shared by all runs with the same geometry and setup
+_experiments = {}
+_problems = {}
+
+
+class RunSpec:
+    """Picklable description of one run of a sweep"""
+
+    def __init__(self, index, experiment_class, problem_class, parameters, overrides, sensors, dt, time,
+                 pv_name='pv_output_sweep'):
+        """
+        Arguments:
+            index : int
+                number of the run in the sweep
+            experiment_class : class
+                experimental setup, e.g. fenics_concrete.ConcreteCubeExperiment
+            problem_class : class
+                material problem, e.g. fenics_concrete.ConcreteThermoMechanical
+            parameters : Parameters
+                complete parameters of the run
+            overrides : dict
+                parameters that differ from the base parameters, only used for the result table
+            sensors : list
+                unused sensor objects, each run measures with its own copy
+            dt : float
+                time step
+            time : float
+                end time of the simulation
+            pv_name : string, optional
+                base name of the output files, the index of the run is appended
+        """
+        self.index = index
+        self.experiment_class = experiment_class
+        self.problem_class = problem_class
+        self.parameters = parameters
+        self.overrides = overrides
+        self.sensors = sensors
+        self.dt = dt
+        self.time = time
+        self.pv_name = pv_name
+
+    def geometry_key(self):
+        # runs with the same key use the same mesh
+        return (self.experiment_class,) + tuple(repr(self.parameters.get(name))
+                                                for name in self.experiment_class.geometry_parameters)
+
+    def problem_key(self):
+        # runs with the same key can use the same problem, only the values of the runtime parameters differ
+        setup = tuple((name, repr(value)) for name, value in sorted(self.parameters.items())
+                      if name not in self.problem_class.runtime_parameters)
+        runtime = tuple(sorted(name for name in self.parameters if name in self.problem_class.runtime_parameters))
+        return (self.problem_class, self.geometry_key(), setup, runtime)
+
+
+def get_experiment(spec):
+    """returns an experiment for the run, the experiment is reused within the process when the geometry matches"""
+    key = spec.geometry_key()
+    if key not in _experiments:
+        _experiments[key] = spec.experiment_class(spec.parameters)
+    else:
+        # boundary conditions and loads are created from the parameters of the experiment
+        experiment = _experiments[key]
+        experiment.p = experiment.p + spec.parameters
+    return _experiments[key]
+
+
+def get_problem(spec):
+    """returns a problem for the run in its initial state, the problem is reused within the process when only
+    runtime parameters differ"""
+    key = spec.problem_key()
+    if key not in _problems:
+        experiment = get_experiment(spec)
+        _problems[key] = spec.problem_class(experiment, spec.parameters, pv_name=f'{spec.pv_name}_{spec.index}')
+    else:
+        problem = _problems[key]
+        # runs of other setups with the same geometry may have changed the parameters of the shared experiment
+        # since this problem was used, they are restored before the boundary conditions are rebuilt
+        experiment = problem.experiment
+        experiment.p = experiment.p + Parameters({name: value for name, value in problem.p.items()
+                                                  if name in experiment.p})
+        problem.update_parameters({name: value for name, value in spec.parameters.items()
+                                   if name in problem.runtime_parameters})
+        problem.reset()
+        problem.sensors.clear()
+        problem.aggregates.clear()
+        # the output of each run goes to its own file
+        problem.set_pv_name(f'{spec.pv_name}_{spec.index}')
+    return _problems[key]
+
+
+def run(spec):
+    """
+    runs one simulation of a sweep, executed in the worker processes
+
+    returns a dict with the index, the sensor data as {name: (time, data)}, the run time and a possible error
+    """
+    start = timer.perf_counter()
+    result = {'index': spec.index, 'sensors': {}, 'error': None}
+    try:
+        problem = get_problem(spec)
+        for sensor in copy.deepcopy(spec.sensors):
+            problem.add_sensor(sensor)
+
+        problem.set_timestep(spec.dt)
+        t = spec.dt
+        while t <= spec.time and not problem.finished:
+            problem.solve(t=t)
+            t += spec.dt
+        # the last checkpoint is written before the result is returned, a write error fails the run
+        problem.flush_checkpoint()
+
+        for name, sensor in problem.sensors.items():
+            result['sensors'][name] = (list(sensor.time), list(sensor.data))
+    except Exception as e:
+        # a failing variant does not stop the sweep
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['run_time'] = timer.perf_counter() - start
+    return result
+
+
+def estimated_cost(spec):
+    """rough relative cost of a run: number of elements times number of time steps"""
+    dim = spec.parameters.get('dim', 3)
+    n = spec.parameters.get('mesh_density', 10)
+    degree = spec.parameters.get('degree', 2)
+    return (n * degree) ** dim * spec.time / spec.dt
+
+
+def process_pool(processes):
+    """
+    pool of worker processes, started with spawn
+
+    forked workers would inherit the initialized dolfin, PETSc and MPI state of the parent process, spawned workers
+    import fenics_concrete again, therefore scripts that start a pool need an `if __name__ == '__main__':` guard
+    """
+    return concurrent.futures.ProcessPoolExecutor(max_workers=processes,
+                                                  mp_context=multiprocessing.get_context('spawn'))
+
+
+def check_picklable(sensors):
+    """raises an exception with a clear message, when the sensors cannot be sent to the worker processes"""
+    try:
+        pickle.dumps(sensors)
+    except Exception as e:
+        raise Exception('The sensors and their trigger conditions have to be picklable to be sent to the worker '
+                        'processes, use the condition and action classes of fenics_concrete.triggers or other '
+                        f'module level classes instead of closures and lambdas, or processes=1: {e}')
+
+
+def sweep(base_parameters, experiment_class, problem_class, overrides, sensors, dt, time, processes=None,
+          cost=estimated_cost, pv_name='pv_output_sweep'):
+    """
+    runs all variants of a simulation in a pool of processes
+
+    each worker process keeps its experiments and problems, runs that differ only in runtime parameters of the
+    problem reuse it with `update_parameters` and `reset`, runs with the same geometry reuse the mesh and the
+    compiled forms. The most expensive runs are started first, to balance the load.
+
+    Arguments:
+        base_parameters : Parameters
+            parameters shared by all runs
+        experiment_class : class
+            experimental setup, e.g. fenics_concrete.ConcreteCubeExperiment
+        problem_class : class
+            material problem, e.g. fenics_concrete.ConcreteThermoMechanical
+        overrides : list of dict
+            one dict of changed parameters per run, e.g. [{'E_28': 15e6}, {'E_28': 20e6}]
+        sensors : list
+            sensor objects, each run measures with its own copy
+        dt : float
+            time step
+        time : float
+            end time of the simulations
+        processes : int, optional
+            number of worker processes, default is the number of cpus, 1 runs in the current process, see
+            `process_pool`
+        cost : callable, optional
+            returns the estimated relative cost of a RunSpec, used for scheduling
+        pv_name : string, optional
+            base name of the output files, the index of the run is appended
+
+    returns the list of results of `run`, in the order of `overrides`
+    """
+    specs = [RunSpec(i, experiment_class, problem_class, Parameters(base_parameters) + Parameters(override),
+                     dict(override), sensors, dt, time, pv_name) for i, override in enumerate(overrides)]
+
+    # longest runs first
+    ordered = sorted(specs, key=cost, reverse=True)
+
+    if processes == 1:
+        results = [run(spec) for spec in ordered]
+    else:
+        check_picklable(sensors)
+        with process_pool(processes) as executor:
+            results = list(executor.map(run, ordered))
+
+    results.sort(key=lambda result: result['index'])
+    for spec, result in zip(specs, results):
+        result['parameters'] = spec.overrides
+    return results
+
+
+def sensor_table(results):
+    """
+    combines the sensor data of all runs to one table
+
+    results:
+        list of results returned by `sweep`
+
+    returns a list of rows, each a dict with the run index, the changed parameters, sensor name, time and value
+    """
+    rows = []
+    for result in results:
+        for name, (times, values) in result['sensors'].items():
+            for t, value in zip(times, values):
+                rows.append({'run': result['index'], **result['parameters'], 'sensor': name, 'time': t,
+                             'value': value})
+    return rows
@@ -0,0 +1,155 @@
+import copy
+
+
+class Trigger:
+    """A condition that is checked after each solve, the action is called when the condition is met"""
+
+    def __init__(self, condition, action, once=True):
+        """
+        Arguments:
+            condition : callable
+                called with the sensor or aggregate the trigger is attached to, returns True or False
+            action : callable
+                called with the problem and the current time when the condition is met
+            once : bool, optional
+                when True, the trigger is deactivated after the first call of the action
+        """
+        self.condition = condition
+        self.action = action
+        self.once = once
+        self.active = True
+        self.time = []  # times at which the action was called
+
+    def check(self, owner, problem, t):
+        """
+        Arguments:
+            owner : sensor or aggregate object the trigger is attached to
+            problem : FEM problem object
+            t : float
+                time of the check
+        """
+        if self.active and self.condition(owner):
+            self.action(problem, t)
+            self.time.append(t)
+            if self.once:
+                self.active = False
+
+
+class Triggerable:
+    """Adds trigger conditions to sensors and aggregates, requires a `triggers` list"""
+
+    # attributes that are stored in checkpoints
+    state_attributes = ('data', 'time')
+
+    def add_trigger(self, condition, action, once=True):
+        """
+        Arguments:
+            condition : callable
+                called with this object, returns True or False
+            action : callable
+                called with the problem and the current time when the condition is met
+            once : bool, optional
+                when True, the trigger is deactivated after the first call of the action
+        """
+        self.triggers.append(Trigger(condition, action, once))
+
+    def check_triggers(self, problem, t):
+        for trigger in self.triggers:
+            trigger.check(self, problem, t)
+
+    def reset_triggers(self):
+        """Reactivates all triggers"""
+        for trigger in self.triggers:
+            trigger.active = True
+            trigger.time = []
+
+    def get_state(self):
+        """Returns a copy of the measured data and the state of the triggers, for checkpoints"""
+        state = {name: copy.deepcopy(getattr(self, name)) for name in self.state_attributes}
+        state['triggers'] = [(trigger.active, list(trigger.time)) for trigger in self.triggers]
+        return state
+
+    def set_state(self, state):
+        """Restores the state returned by `get_state`, the triggers have to be added beforehand"""
+        for name in self.state_attributes:
+            setattr(self, name, copy.deepcopy(state[name]))
+        for trigger, (active, time) in zip(self.triggers, state['triggers']):
+            trigger.active = active
+            trigger.time = list(time)
+
+
+# conditions, callable classes so that sensors with triggers can be sent to worker processes
+class LastValueAbove:
+    """Condition for sensors, met when the last measured value is greater than `value`"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, sensor):
+        return len(sensor.data) > 0 and sensor.data[-1] > self.value
+
+
+class LastValueBelow:
+    """Condition for sensors, met when the last measured value is smaller than `value`"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, sensor):
+        return len(sensor.data) > 0 and sensor.data[-1] < self.value
+
+
+class PeakPassed:
+    """Condition for sensors, met when the last measured value is smaller than the previous one"""
+
+    def __call__(self, sensor):
+        return len(sensor.data) > 1 and sensor.data[-1] < sensor.data[-2]
+
+
+class AnyPointAbove:
+    """Condition for aggregates, met when the value at any point of any process is greater than `value`"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, aggregate):
+        # the data holds the points of this process, the result is reduced to be the same on all processes
+        return aggregate.data is not None and aggregate.global_any((aggregate.data > self.value).any())
+
+
+class AllPointsAbove:
+    """Condition for aggregates, met when the values at all points of all processes are greater than `value`"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, aggregate):
+        return aggregate.data is not None and aggregate.global_all((aggregate.data > self.value).all())
+
+
+# actions
+class StopSimulation:
+    """Sets `problem.finished`, which is meant to be checked by the time loop"""
+
+    def __call__(self, problem, t):
+        problem.finished = True
+
+
+class ChangeTimestep:
+    """Sets a new time step for the following solves"""
+
+    def __init__(self, dt):
+        self.dt = dt
+
+    def __call__(self, problem, t):
+        problem.set_timestep(self.dt)
+
+
+class ChangeOutputInterval:
+    """Sets how often the calls of `pv_plot` actually write output"""
+
+    def __init__(self, interval):
+        self.interval = interval
+
+    def __call__(self, problem, t):
+        problem.output_interval = self.interval
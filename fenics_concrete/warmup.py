@@ -0,0 +1,181 @@
+"""Compiles the forms of all model variants into a persistent cache, to avoid the compilation in new processes
+
+The forms, projectors and expressions are compiled by dijitso, which stores the compiled modules in the
+directory given by the environment variable DIJITSO_CACHE_DIR. The modules are moved into the cache
+directory after they are built, so several processes can share the cache. The directory can be baked into
+container images, new processes only have to set DIJITSO_CACHE_DIR before dolfin is imported. The warm-up
+therefore compiles in a new process with the variable set.
+
+usage:
+    python -m fenics_concrete.warmup --cache-dir /opt/fenics_concrete_cache --benchmark
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time as timer
+import warnings
+
+CACHE_DIR_VARIABLE = 'DIJITSO_CACHE_DIR'
+
+# run in a new process to measure the cold start, prints the timings as json
+BENCHMARK_SCRIPT = '''
+import json, time
+start = time.perf_counter()
+import fenics_concrete
+imported = time.perf_counter()
+parameters = fenics_concrete.Parameters()
+parameters['log_level'] = 'WARNING'
+parameters['dim'] = {dim}
+parameters['degree'] = {degree}
+parameters['mesh_density'] = 2
+experiment = fenics_concrete.ConcreteCubeExperiment(parameters)
+problem = fenics_concrete.ConcreteThermoMechanical(experiment, parameters, pv_name={pv_name!r})
+problem.set_timestep(3600)
+set_up = time.perf_counter()
+problem.solve(t=3600)
+solved = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'setup': set_up - imported, 'first solve': solved - set_up,
+                  'total': solved - start}}))
+'''
+
+
+# run in a new process, which reads the cache directory when dolfin is imported, prints the times as json
+WARMUP_SCRIPT = '''
+import json
+from fenics_concrete.warmup import compile_variants
+print(json.dumps(compile_variants({dims!r}, {degrees!r})))
+'''
+
+
+def set_cache_dir(cache_dir):
+    """
+    sets the cache directory of the compiled forms for child processes started afterwards
+
+    dolfin reads the directory when it is imported, the current process only uses it when dolfin is not imported yet
+    """
+    cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    os.makedirs(cache_dir, exist_ok=True)
+    if 'dolfin' in sys.modules and os.environ.get(CACHE_DIR_VARIABLE) != cache_dir:
+        warnings.warn(f'dolfin is already imported, the cache directory {cache_dir} is only used by new processes')
+    os.environ[CACHE_DIR_VARIABLE] = cache_dir
+    return cache_dir
+
+
+def warmup(cache_dir=None, dims=(2, 3), degrees=(1, 2)):
+    """
+    compiles the forms of the thermo-mechanical and the thixotropy model for all given variants in a new process
+
+    cache_dir:
+        cache directory, default is the value of DIJITSO_CACHE_DIR or the dijitso default
+    dims:
+        spatial dimensions
+    degrees:
+        polynomial degrees
+
+    returns a dict with the compile time in seconds for each variant
+    """
+    env = dict(os.environ)
+    if cache_dir is not None:
+        cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        os.makedirs(cache_dir, exist_ok=True)
+        env[CACHE_DIR_VARIABLE] = cache_dir
+
+    script = WARMUP_SCRIPT.format(dims=list(dims), degrees=list(degrees))
+    output = subprocess.run([sys.executable, '-c', script], env=env, check=True, capture_output=True,
+                            text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def compile_variants(dims=(2, 3), degrees=(1, 2)):
+    """
+    compiles the forms of the given variants in the current process, with the cache directory it was started with
+
+    each variant is set up on a small mesh and solved for one time step, including the paraview output, which
+    compiles the projections
+
+    returns a dict with the compile time in seconds for each variant
+    """
+    import fenics_concrete
+
+    times = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for dim in dims:
+            for degree in degrees:
+                parameters = fenics_concrete.Parameters()
+                parameters['log_level'] = 'WARNING'
+                parameters['dim'] = dim
+                parameters['degree'] = degree
+                parameters['mesh_density'] = 1
+
+                start = timer.perf_counter()
+                experiment = fenics_concrete.ConcreteCubeExperiment(parameters)
+                problem = fenics_concrete.ConcreteThermoMechanical(
+                    experiment, parameters, pv_name=os.path.join(output_dir, f'thermo_{dim}_{degree}'))
+                problem.set_timestep(3600)
+                problem.solve(t=3600)
+                problem.pv_plot(t=3600)
+                problem.pv_close()
+                times[f'ConcreteThermoMechanical dim={dim} degree={degree}'] = timer.perf_counter() - start
+
+                start = timer.perf_counter()
+                experiment = fenics_concrete.ConcreteCubeUniaxialExperiment(parameters)
+                problem = fenics_concrete.ConcreteThixMechanical(
+                    experiment, parameters, pv_name=os.path.join(output_dir, f'thix_{dim}_{degree}'))
+                problem.set_timestep(60)
+                problem.solve(t=0)
+                problem.pv_plot(t=0)
+                problem.pv_close()
+                times[f'ConcreteThixMechanical dim={dim} degree={degree}'] = timer.perf_counter() - start
+
+    return times
+
+
+def cold_start_benchmark(cache_dir=None, dim=3, degree=2):
+    """
+    measures import, setup and first solve of a thermo-mechanical problem in a new process
+
+    cache_dir:
+        cache directory used by the new process, default is the current setting
+    dim, degree:
+        variant of the problem
+
+    returns a dict with the times in seconds
+    """
+    env = dict(os.environ)
+    if cache_dir is not None:
+        env[CACHE_DIR_VARIABLE] = os.path.abspath(os.path.expanduser(cache_dir))
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        script = BENCHMARK_SCRIPT.format(dim=dim, degree=degree, pv_name=os.path.join(output_dir, 'benchmark'))
+        output = subprocess.run([sys.executable, '-c', script], env=env, check=True, capture_output=True,
+                                text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compiles the forms of fenics_concrete into a persistent cache')
+    parser.add_argument('--cache-dir', default=None,
+                        help=f'cache directory, default is ${CACHE_DIR_VARIABLE} or the dijitso default')
+    parser.add_argument('--dim', type=int, nargs='+', default=[2, 3], help='spatial dimensions')
+    parser.add_argument('--degree', type=int, nargs='+', default=[1, 2], help='polynomial degrees')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='report the cold start time of a new process after the warm-up')
+    args = parser.parse_args(argv)
+
+    times = warmup(args.cache_dir, args.dim, args.degree)
+    for variant, seconds in times.items():
+        print(f'{variant}: {seconds:.1f} s')
+    cache_dir = args.cache_dir or os.environ.get(CACHE_DIR_VARIABLE, 'dijitso default')
+    print(f'cache directory: {cache_dir}')
+
+    if args.benchmark:
+        timings = cold_start_benchmark(args.cache_dir, max(args.dim), max(args.degree))
+        print('cold start with cache: ' + ', '.join(f'{name} {seconds:.2f} s' for name, seconds in timings.items()))
+
+
+if __name__ == '__main__':
+    main()
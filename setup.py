@@ -64,9 +64,9 @@ setup(
     # If your package is a single module, use this instead of 'packages':
     # py_modules=['mypackage'],
 
-    # entry_points={
-    #     'console_scripts': ['mycli=mymodule:cli'],
-    # },
+    entry_points={
+        'console_scripts': ['fenics_concrete_warmup=fenics_concrete.warmup:main'],
+    },
     install_requires=REQUIRED,
     include_package_data=True,
     license='MIT',
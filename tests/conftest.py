@@ -0,0 +1,49 @@
+import fenics_concrete
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'mpi: runs checks with mpirun on several processes')
+
+
+def simulate_cube(parameters=None, sensors=(), dt=3600, end=3 * 3600, history=None):
+    """
+    thermo-mechanical problem of the 2D cube, solved with constant time steps from `dt` to `end`
+
+    parameters:
+        changes of the default test parameters, e.g. {'problem_mode': 'thermal'}
+    sensors:
+        new sensor objects that are attached to the problem
+    dt:
+        time step
+    end:
+        time of the last solve
+    history:
+        hydration history for the mechanical mode
+    """
+    p = fenics_concrete.Parameters()
+    p['log_level'] = 'WARNING'
+    p['dim'] = 2
+    p['mesh_density'] = 4
+    p = p + parameters
+
+    experiment = fenics_concrete.ConcreteCubeExperiment(p)
+    problem = fenics_concrete.ConcreteThermoMechanical(experiment, p)
+    for sensor in sensors:
+        problem.add_sensor(sensor)
+    if history is not None:
+        problem.set_hydration_history(history)
+
+    problem.set_timestep(dt)
+    t = dt
+    while t <= end + dt / 2:
+        problem.solve(t=t)
+        t += dt
+    return problem
+
+
+@pytest.fixture
+def simulate():
+    """the function `simulate_cube`"""
+    return simulate_cube
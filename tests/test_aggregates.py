@@ -0,0 +1,121 @@
+import dolfin as df
+import numpy as np
+
+import fenics_concrete
+
+import pytest
+
+
+def simple_simulation(parameters, aggregates, sensors):
+
+    experiment = fenics_concrete.ConcreteCubeExperiment(parameters)
+    problem = fenics_concrete.ConcreteThermoMechanical(experiment, parameters)
+
+    for aggregate in aggregates:
+        problem.add_aggregate(aggregate)
+    for sensor in sensors:
+        problem.add_sensor(sensor)
+
+    # data for time stepping
+    dt = 3600  # 60 min step
+    time = dt * 5  # total simulation time in s
+
+    # set time step
+    problem.set_timestep(dt)  # for time integration scheme
+
+    # initialize time
+    t = dt  # first time step time
+
+    while t <= time:  # time
+        # solve temp-hydration-mechanics
+        problem.solve(t=t)  # solving this
+
+        # prepare next timestep
+        t += dt
+
+    return problem
+
+
+def default_parameters():
+    parameters = fenics_concrete.Parameters()  # using the current default values
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 4
+    parameters['bc_setting'] = 'test-setup'
+    parameters['T_0'] = 10  # inital concrete temperature
+    parameters['T_bc1'] = 20  # temperature boundary value 1
+    parameters['T_bc2'] = 30  # temperature boundary value 2
+
+    return parameters
+
+
+class QuadratureTemperatureSensor(fenics_concrete.sensors.Sensor):
+    """records the temperature in celsius at all quadrature points"""
+
+    required_model = 'temperature'
+
+    def measure(self, problem, t=1.0):
+        self.data.append(problem.q_temperature.vector().get_local() - problem.p.zero_C)
+        self.time.append(t)
+
+
+def test_max_yield_aggregate():
+    parameters = default_parameters()
+
+    aggregate = fenics_concrete.aggregates.MaxYieldAggregate()
+    sensor = fenics_concrete.sensors.MaxYieldSensor()
+    problem = simple_simulation(parameters, [aggregate], [sensor])
+
+    # the maximum over all points of the running maximum has to match the maximum over all time steps
+    assert np.amax(problem.aggregates[aggregate.name].data) == pytest.approx(problem.sensors[sensor.name].max)
+
+
+def test_peak_temperature_aggregate():
+    parameters = default_parameters()
+
+    aggregate = fenics_concrete.aggregates.PeakTemperatureAggregate()
+    sensor = QuadratureTemperatureSensor()
+    problem = simple_simulation(parameters, [aggregate], [sensor])
+
+    # the running peak has to match the maximum of the recorded temperatures at each point, the time is the first
+    # step that reached it
+    peak = problem.aggregates[aggregate.name]
+    records = np.array(problem.sensors[sensor.name].data)
+    times = np.array(problem.sensors[sensor.name].time)
+
+    assert len(records) == 5
+    assert peak.data == pytest.approx(np.maximum.reduce(records))
+    assert peak.time == pytest.approx(times[np.argmax(records, axis=0)])
+
+
+def test_equivalent_age_aggregate():
+    parameters = default_parameters()
+    parameters['temp_adjust_law'] = 'off'  # equivalent age equals the real age
+
+    aggregate = fenics_concrete.aggregates.EquivalentAgeAggregate()
+    problem = simple_simulation(parameters, [aggregate], [])
+
+    assert problem.aggregates[aggregate.name].data == pytest.approx(5 * 3600)
+
+
+def test_max_temperature_gradient_aggregate():
+    parameters = default_parameters()
+    experiment = fenics_concrete.ConcreteCubeExperiment(parameters)
+    problem = fenics_concrete.ConcreteThermoMechanical(experiment, parameters)
+
+    aggregate = fenics_concrete.aggregates.MaxTemperatureGradientAggregate()
+    T = problem.temperature_problem.T
+
+    # linear temperature fields have a constant gradient
+    T.interpolate(df.Expression('3*x[0] + 4*x[1]', degree=1))
+    aggregate.update(problem)
+    assert aggregate.data == pytest.approx(5)
+
+    # a smaller gradient keeps the maximum
+    T.interpolate(df.Expression('x[0]', degree=1))
+    aggregate.update(problem)
+    assert aggregate.data == pytest.approx(5)
+
+    T.interpolate(df.Expression('10*x[1]', degree=1))
+    aggregate.update(problem)
+    assert aggregate.data == pytest.approx(10)
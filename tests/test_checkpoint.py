@@ -0,0 +1,75 @@
+import fenics_concrete
+
+import os
+
+import pytest
+
+
+def setup_problem(name):
+    parameters = fenics_concrete.Parameters()  # using the current default values
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 4
+    parameters['bc_setting'] = 'full'
+    parameters['T_0'] = 10  # inital concrete temperature
+    parameters['T_bc1'] = 30  # temperature boundary value 1
+    parameters['checkpoint_interval'] = 3
+
+    file_path = os.path.dirname(os.path.realpath(__file__)) + '/'
+    experiment = fenics_concrete.ConcreteCubeExperiment(parameters)
+    problem = fenics_concrete.ConcreteThermoMechanical(experiment, parameters, pv_name=file_path + name)
+
+    problem.add_sensor(fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)))
+    problem.add_sensor(fenics_concrete.sensors.MaxYieldSensor())
+    problem.add_aggregate(fenics_concrete.aggregates.PeakTemperatureAggregate())
+    problem.set_timestep(3600)
+
+    return problem
+
+
+def test_restart_from_checkpoint():
+    dt = 3600
+    problem = setup_problem('test_checkpoint')
+    for step in range(1, 7):
+        problem.solve(t=step * dt)
+    problem.flush_checkpoint()
+
+    # branch a second simulation from the state after the sixth solve
+    restarted = setup_problem('test_checkpoint_restart')
+    restarted.set_state(problem.get_state(6 * dt))
+    problem.solve(t=7 * dt)
+    restarted.solve(t=7 * dt)
+
+    assert restarted.sensors.TemperatureSensor.data == problem.sensors.TemperatureSensor.data
+    assert restarted.sensors.MaxYieldSensor.max == problem.sensors.MaxYieldSensor.max
+    assert (restarted.aggregates.PeakTemperatureAggregate.data ==
+            problem.aggregates.PeakTemperatureAggregate.data).all()
+
+    # the last checkpoint file is written after the sixth solve, restoring it continues bit for bit
+    from_file = setup_problem('test_checkpoint_file')
+    t = from_file.restore(problem.checkpoint_name)
+    assert t == pytest.approx(6 * dt)
+    from_file.solve(t=7 * dt)
+
+    assert from_file.sensors.TemperatureSensor.data == problem.sensors.TemperatureSensor.data
+    assert from_file.sensors.TemperatureSensor.time == problem.sensors.TemperatureSensor.time
+    assert (from_file.temperature_problem.T.vector().get_local() ==
+            problem.temperature_problem.T.vector().get_local()).all()
+
+
+def test_close_writes_last_checkpoint(tmp_path):
+    problem = setup_problem('test_checkpoint_close')
+    problem.checkpoint_name = str(tmp_path / 'checkpoint')
+    for step in range(1, 4):
+        problem.solve(t=step * 3600)
+    problem.pv_close()
+    # the checkpoint of the last solve is on disk when the file is closed
+    assert fenics_concrete.checkpoint.read_checkpoint(problem.checkpoint_name)['t'] == pytest.approx(3 * 3600)
+
+    # a failed write of the last checkpoint is raised when the file is closed
+    failing = setup_problem('test_checkpoint_close_error')
+    failing.checkpoint_name = str(tmp_path / 'missing' / 'checkpoint')
+    for step in range(1, 4):
+        failing.solve(t=step * 3600)
+    with pytest.raises(RuntimeError):
+        failing.pv_close()
@@ -1,3 +1,4 @@
+import dolfin as df
 import numpy as np
 
 import fenics_concrete
@@ -56,3 +57,66 @@ def test_force_response_3D():
 
     # due to meshing errors, only aprroximate results to be expected. within 1% is good enough
     assert measured == pytest.approx(p.E*np.pi*p.radius**2*displacement/p.height, 0.01)
+
+
+def test_cylinder_mesh_volume():
+    p = fenics_concrete.Parameters()
+    p['radius'] = 6
+    p['height'] = 12
+    p['mesh_density'] = 4
+    experiment = fenics_concrete.ConcreteCylinderExperiment(p)
+
+    # the corrected mesh radius gives the volume of the cylinder, up to the tolerance of the radius correction
+    volume = df.assemble(1 * df.dx(domain=experiment.mesh))
+    assert experiment.p.mesh_radius > p.radius
+    assert volume == pytest.approx(np.pi * p.radius ** 2 * p.height, 1e-4)
+
+
+@pytest.mark.parametrize("nu", [0.0, 0.2])
+@pytest.mark.parametrize("bc_setting", ['free', 'fixed'])
+def test_force_response_axisymmetric(nu, bc_setting):
+    p = fenics_concrete.Parameters()  # using the current default values
+
+    p['E'] = 1023
+    p['nu'] = nu
+    p['radius'] = 6
+    p['height'] = 12
+    displacement = -3
+    p['dim'] = 2
+    p['axisymmetric'] = True
+    p['bc_setting'] = bc_setting
+
+    sensor = fenics_concrete.sensors.ReactionForceSensorBottom()
+    measured = simple_setup(p, displacement, sensor)
+
+    # the reaction force is the one of the full 3D cylinder
+    expected = p.E*np.pi*p.radius**2*displacement/p.height
+    if bc_setting == 'free' or nu == 0.0:
+        assert measured == pytest.approx(expected)
+    else:
+        # the confinement increases the stiffness
+        assert abs(measured) > abs(expected)
+
+
+def test_thermo_mechanical_axisymmetric():
+    p = fenics_concrete.Parameters()
+    p['log_level'] = 'WARNING'
+    p['dim'] = 2
+    p['axisymmetric'] = True
+    p['radius'] = 0.075
+    p['height'] = 0.3
+    p['mesh_density'] = 4
+    p['T_0'] = 20
+    p['T_bc1'] = 20
+
+    experiment = fenics_concrete.ConcreteCylinderExperiment(p)
+    problem = fenics_concrete.ConcreteThermoMechanical(experiment, p)
+    sensor = fenics_concrete.sensors.TemperatureSensor((0.0, 0.15))
+    problem.add_sensor(sensor)
+
+    problem.set_timestep(3600)
+    for t in [3600, 7200]:
+        problem.solve(t=t)
+
+    # the heat of hydration warms up the center of the cylinder
+    assert problem.sensors[sensor.name].data[-1] > 20
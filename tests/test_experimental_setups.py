@@ -1,3 +1,4 @@
+import dolfin as df
 import numpy as np
 
 import fenics_concrete
@@ -78,3 +79,34 @@ def test_cylinder_setup(dim, boundary_setting):
 
     problem.solve()  # solving this
 
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_facet_markers(dim):
+    # the boundaries from the facet markers constrain the same dofs as the geometric definition
+    parameters = fenics_concrete.Parameters()
+    parameters['dim'] = dim
+    parameters['mesh_density'] = 3
+    experiment = fenics_concrete.ConcreteCubeExperiment(parameters)
+    V = df.FunctionSpace(experiment.mesh, 'P', 2)
+
+    def dofs(*boundary):
+        return sorted(df.DirichletBC(V, 0, *boundary).get_boundary_values())
+
+    vertical = dim - 1
+    geometric = {'left': 'on_boundary && near(x[0], 0)',
+                 'right': 'on_boundary && near(x[0], 1)',
+                 'bottom': f'on_boundary && near(x[{vertical}], 0)',
+                 'top': f'on_boundary && near(x[{vertical}], 1)'}
+    for side, condition in geometric.items():
+        compiled = df.CompiledSubDomain(condition)
+        assert dofs(*getattr(experiment, f'boundary_{side}')()) == dofs(compiled)
+
+    assert dofs(*experiment.boundary_full()) == dofs(df.CompiledSubDomain('on_boundary'))
+    assert dofs(*experiment.boundary_empty()) == []
+    if dim == 2:
+        assert dofs(*experiment.boundary_front()) == []
+
+    # the measure of a side is its area
+    area = df.assemble(df.Constant(1.0) * experiment.ds('bottom'))
+    assert area == pytest.approx(1.0)
@@ -0,0 +1,34 @@
+import fenics_concrete
+
+import pytest
+
+
+def run(simulate, time_scheme, dt, degree=1, themal_cond=2.0):
+    parameters = {'mesh_density': 6, 'problem_mode': 'thermal', 'time_scheme': time_scheme, 'degree': degree,
+                  'themal_cond': themal_cond, 'T_0': 20, 'T_bc1': 10}
+    sensors = [fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)), fenics_concrete.sensors.DOHSensor((0.5, 0.5))]
+    return simulate(parameters, sensors, dt, end=12 * 3600)
+
+
+@pytest.mark.parametrize('degree', [1, 2])
+def test_explicit_matches_implicit(simulate, degree):
+    explicit = run(simulate, 'explicit', 3600, degree)
+    implicit = run(simulate, 'backward-euler', 300, degree)
+
+    for name in implicit.sensors:
+        assert explicit.sensors[name].data[-1] == pytest.approx(implicit.sensors[name].data[-1], rel=1e-2)
+
+
+def test_stable_timestep(simulate):
+    problem = run(simulate, 'explicit', 3600)
+    dt = problem.temperature_problem.stable_timestep()
+    assert 0 < dt < 3600
+
+    # the critical time step is inversely proportional to the thermal conductivity
+    conductive = run(simulate, 'explicit', 3600, themal_cond=4.0)
+    assert conductive.temperature_problem.stable_timestep() == pytest.approx(dt / 2)
+
+
+def test_unknown_time_scheme(simulate):
+    with pytest.raises(Exception):
+        run(simulate, 'unknown', 3600)
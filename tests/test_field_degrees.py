@@ -0,0 +1,36 @@
+import fenics_concrete
+
+import pytest
+
+
+def sensors():
+    return [fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)),
+            fenics_concrete.sensors.DisplacementSensor((0.5, 1.0))]
+
+
+def test_separate_degrees(simulate):
+    reference = simulate({'mesh_density': 6, 'degree': 2}, sensors())
+    reduced = simulate({'mesh_density': 6, 'degree_T': 1, 'degree_u': 2}, sensors())
+
+    # linear temperatures with quadratic displacements
+    assert reduced.temperature_problem.V.dim() < reference.temperature_problem.V.dim()
+    assert reduced.mechanics_problem.V.dim() == reference.mechanics_problem.V.dim()
+    assert reduced.temperature_problem.q_V.dim() < reduced.mechanics_problem.q_V.dim()
+
+    # the degree of hydration is transferred to the quadrature points of the mechanics problem
+    alpha_T = reduced.temperature_problem.q_alpha.vector().get_local()
+    alpha_u = reduced.mechanics_problem.q_alpha.vector().get_local()
+    assert alpha_u.min() == pytest.approx(alpha_T.min(), rel=0.05)
+    assert alpha_u.max() == pytest.approx(alpha_T.max(), rel=0.05)
+
+    for name in reference.sensors:
+        assert reduced.sensors[name].data[-1] == pytest.approx(reference.sensors[name].data[-1], rel=0.05)
+
+
+def test_common_quadrature_degree(simulate):
+    problem = simulate({'mesh_density': 6, 'degree_T': 1, 'degree_u': 2, 'quadrature_degree': 2},
+                       sensors())
+
+    # the same quadrature space, the degree of hydration is shared
+    assert problem.alpha_transfer is None
+    assert problem.mechanics_problem.q_alpha is problem.temperature_problem.q_alpha
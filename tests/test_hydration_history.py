@@ -0,0 +1,71 @@
+import fenics_concrete
+
+import numpy as np
+import pytest
+
+
+def sensors():
+    return [fenics_concrete.sensors.DisplacementSensor((0.5, 1.0)), fenics_concrete.sensors.HydrationHistorySensor()]
+
+
+def test_interpolation():
+    history = fenics_concrete.hydration_history.HydrationHistory([0, 10], [np.zeros(3), np.ones(3)])
+    history.add(20, np.full(3, 3.0))
+
+    assert history(5) == pytest.approx(np.full(3, 0.5))
+    assert history(15) == pytest.approx(np.full(3, 2.0))
+    # constant outside of the stored times
+    assert history(-1) == pytest.approx(np.zeros(3))
+    assert history(30) == pytest.approx(np.full(3, 3.0))
+
+
+def test_save_load(tmp_path):
+    history = fenics_concrete.hydration_history.HydrationHistory([1, 2], [np.zeros(3), np.ones(3)])
+    history.save(tmp_path / 'history.npz')
+    loaded = fenics_concrete.hydration_history.HydrationHistory.load(tmp_path / 'history.npz')
+
+    assert loaded.times == [1, 2]
+    assert loaded(1.5) == pytest.approx(np.full(3, 0.5))
+
+
+def test_mechanical_mode(simulate):
+    full = simulate({'problem_mode': 'thermo-mechanical', 'E_28': 15000000}, sensors())
+    history = full.sensors['HydrationHistorySensor'].history()
+    mechanical = simulate({'problem_mode': 'mechanical', 'E_28': 15000000}, sensors(), history=history)
+
+    # no temperature problem is built
+    assert mechanical.temperature_problem is None
+    assert mechanical.temperature is None
+
+    assert mechanical.sensors['DisplacementSensor'].data == pytest.approx(full.sensors['DisplacementSensor'].data)
+
+    # a what-if study with a stiffer concrete only solves the mechanics
+    stiffer = simulate({'problem_mode': 'mechanical', 'E_28': 30000000}, sensors(), history=history)
+    assert abs(stiffer.sensors['DisplacementSensor'].data[-1][-1]) < \
+           abs(mechanical.sensors['DisplacementSensor'].data[-1][-1])
+
+
+def test_missing_history(simulate):
+    with pytest.raises(Exception):
+        simulate({'problem_mode': 'mechanical'}, sensors())
+
+
+def test_aggregates_in_mechanical_mode(simulate, tmp_path):
+    history = simulate({'problem_mode': 'thermo-mechanical'}, sensors(), end=3600)
+    history = history.sensors['HydrationHistorySensor'].history()
+    mechanical = simulate({'problem_mode': 'mechanical'}, history=history, end=3600)
+    mechanical.set_pv_name(str(tmp_path / 'mechanical'))
+
+    # the aggregates of the mechanics are written with the mechanics model
+    mechanical.add_aggregate(fenics_concrete.aggregates.MaxYieldAggregate())
+    mechanical.solve(t=7200)
+    assert mechanical.q_temperature is None
+    mechanical.pv_plot_aggregates(t=7200)
+    mechanical.pv_close()
+    assert (tmp_path / 'mechanical.xdmf').exists()
+
+    # temperature aggregates and sensors are rejected when they are attached
+    with pytest.raises(Exception, match='temperature'):
+        mechanical.add_aggregate(fenics_concrete.aggregates.PeakTemperatureAggregate())
+    with pytest.raises(Exception, match='temperature'):
+        mechanical.add_sensor(fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)))
@@ -0,0 +1,48 @@
+import fenics_concrete
+
+import numpy as np
+import pytest
+
+PARAMETERS = {'B1': 2.916E-4, 'B2': 0.0024229, 'eta': 5.554, 'alpha_max': 0.875, 'E_act': 47002, 'igc': 8.3145,
+              'T_ref': 25, 'zero_C': 273.15, 'temp_adjust_law': 'exponential'}
+
+
+def test_substep_error():
+    hydration = fenics_concrete.hydration
+    alpha_n = np.array([0.0, 0.05, 0.3, 0.6])
+    T_n = np.full(4, 293.15)
+    T = np.full(4, 303.15)
+    reference, _ = hydration.substep_alpha(alpha_n, T_n, T, 3600, PARAMETERS, np.full(4, 20000))
+
+    for tolerance in [1e-2, 1e-3, 1e-4]:
+        n_steps = hydration.hydration_substeps(alpha_n, T_n, T, 3600, PARAMETERS, tolerance, max_steps=1000)
+        alpha, _ = hydration.substep_alpha(alpha_n, T_n, T, 3600, PARAMETERS, n_steps)
+        assert np.max(np.abs(alpha - reference)) < tolerance
+    # each point takes its own number of sub steps
+    assert len(set(n_steps)) > 1
+
+
+def test_substep_tangent():
+    hydration = fenics_concrete.hydration
+    alpha_n = np.array([0.0, 0.05, 0.3, 0.6])
+    T_n = np.full(4, 293.15)
+    T = np.full(4, 303.15)
+    n_steps = np.array([1, 3, 5, 8])
+
+    alpha, dalpha_dT = hydration.substep_alpha(alpha_n, T_n, T, 3600, PARAMETERS, n_steps)
+    alpha_perturbed, _ = hydration.substep_alpha(alpha_n, T_n, T + 1e-5, 3600, PARAMETERS, n_steps)
+    assert dalpha_dT == pytest.approx((alpha_perturbed - alpha) / 1e-5, rel=1e-3)
+
+
+def run(simulate, dt, hydration_tolerance=None):
+    parameters = {'problem_mode': 'thermal', 'hydration_tolerance': hydration_tolerance, 'T_0': 20, 'T_bc1': 20}
+    return simulate(parameters, [fenics_concrete.sensors.DOHSensor((0.5, 0.5))], dt, end=24 * 3600)
+
+
+def test_substeps_in_problem(simulate):
+    reference = run(simulate, 300)
+    one_step = run(simulate, 3 * 3600)
+    substeps = run(simulate, 3 * 3600, hydration_tolerance=1e-3)
+
+    alpha = reference.sensors['DOHSensor'].data[-1]
+    assert abs(substeps.sensors['DOHSensor'].data[-1] - alpha) < abs(one_step.sensors['DOHSensor'].data[-1] - alpha)
@@ -0,0 +1,31 @@
+import json
+import subprocess
+import sys
+
+# import time budget of the package in seconds
+IMPORT_BUDGET = 0.5
+
+SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import fenics_concrete
+import_time = time.perf_counter() - start
+import fenics_concrete.hydration
+import fenics_concrete.mori_tanaka_homogenization
+print(json.dumps({'time': import_time, 'modules': sorted(sys.modules)}))
+'''
+
+
+def test_import_time():
+    # measured in a new process, the test session already imported the heavy dependencies
+    times = []
+    for _ in range(3):
+        output = subprocess.run([sys.executable, '-c', SCRIPT], check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        times.append(result['time'])
+
+    assert min(times) < IMPORT_BUDGET
+
+    # the package, the hydration and the homogenization do not need the heavy dependencies
+    for module in ['dolfin', 'ufl', 'ffc', 'gmsh', 'meshio', 'scipy', 'pytest']:
+        assert module not in result['modules']
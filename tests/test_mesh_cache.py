@@ -0,0 +1,56 @@
+import os
+
+import fenics_concrete
+
+import pytest
+
+
+def cylinder_parameters(cache_dir):
+    p = fenics_concrete.Parameters()
+    p['log_level'] = 'WARNING'
+    p['dim'] = 3
+    p['radius'] = 6
+    p['height'] = 12
+    p['mesh_density'] = 4
+    p['mesh_cache'] = str(cache_dir)
+    return p
+
+
+def test_mesh_key(tmp_path):
+    p = cylinder_parameters(tmp_path)
+    names = fenics_concrete.ConcreteCylinderExperiment.geometry_parameters
+    key = fenics_concrete.mesh_cache.mesh_key(fenics_concrete.ConcreteCylinderExperiment, p, names)
+
+    # parameters that do not change the mesh do not change the key
+    assert key == fenics_concrete.mesh_cache.mesh_key(fenics_concrete.ConcreteCylinderExperiment,
+                                                      p + {'E_28': 1, 'mesh_cache': None}, names)
+    assert key != fenics_concrete.mesh_cache.mesh_key(fenics_concrete.ConcreteCylinderExperiment,
+                                                      p + {'mesh_density': 5}, names)
+    assert key != fenics_concrete.mesh_cache.mesh_key(fenics_concrete.ConcreteCubeExperiment, p, names)
+
+
+def test_cylinder_mesh_cache(tmp_path):
+    p = cylinder_parameters(tmp_path)
+
+    generated = fenics_concrete.ConcreteCylinderExperiment(p)
+    files = os.listdir(tmp_path)
+    # one complete cache file, no temporary files
+    assert len(files) == 1 and files[0].endswith('.h5')
+
+    cached = fenics_concrete.ConcreteCylinderExperiment(p)
+    assert os.listdir(tmp_path) == files
+    assert cached.mesh.num_cells() == generated.mesh.num_cells()
+    assert cached.mesh.coordinates() == pytest.approx(generated.mesh.coordinates())
+    assert cached.p.mesh_radius == pytest.approx(generated.p.mesh_radius)
+
+    # a different geometry gets a new entry
+    fenics_concrete.ConcreteCylinderExperiment(p + {'height': 10})
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_cache_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv(fenics_concrete.mesh_cache.CACHE_DIR_VARIABLE, raising=False)
+    assert fenics_concrete.mesh_cache.default_cache_dir() is None
+
+    monkeypatch.setenv(fenics_concrete.mesh_cache.CACHE_DIR_VARIABLE, str(tmp_path))
+    assert fenics_concrete.mesh_cache.default_cache_dir() == str(tmp_path)
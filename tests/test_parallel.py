@@ -0,0 +1,149 @@
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import dolfin as df
+import numpy as np
+import pytest
+
+import fenics_concrete
+
+
+def setup_problem():
+    parameters = fenics_concrete.Parameters()
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 4
+    parameters['problem_mode'] = 'thermal'
+
+    experiment = fenics_concrete.ConcreteCubeExperiment(parameters)
+    problem = fenics_concrete.ConcreteThermoMechanical(experiment, parameters)
+    return problem
+
+
+def test_evaluate_at_point():
+    problem = setup_problem()
+    T = problem.temperature_problem.T
+    T.interpolate(df.Expression('x[0] + 2*x[1]', degree=1))
+
+    assert fenics_concrete.helpers.evaluate_at_point(T, (0.3, 0.6)) == pytest.approx(1.5)
+    assert fenics_concrete.helpers.evaluate_at_point(T, df.Point(1.0, 1.0)) == pytest.approx(3.0)
+
+
+def test_coordinate_extrema():
+    problem = setup_problem()
+
+    for direction in range(2):
+        assert problem.experiment.coordinate_min(direction) == pytest.approx(0.0)
+        assert problem.experiment.coordinate_max(direction) == pytest.approx(1.0)
+
+
+def test_pv_encoding():
+    mesh = setup_problem().experiment.mesh
+
+    assert fenics_concrete.helpers.pv_encoding(mesh, 'HDF5') == df.XDMFFile.Encoding.HDF5
+    assert fenics_concrete.helpers.pv_encoding(mesh, 'ASCII') == df.XDMFFile.Encoding.ASCII
+    with pytest.raises(Exception):
+        fenics_concrete.helpers.pv_encoding(mesh, 'unknown')
+
+
+def test_aggregate_conditions():
+    problem = setup_problem()
+    aggregate = fenics_concrete.aggregates.EquivalentAgeAggregate()
+    problem.add_aggregate(aggregate)
+
+    aggregate.data = np.array([0.0, 1.0, 2.0])
+    assert fenics_concrete.triggers.AnyPointAbove(1.5)(aggregate)
+    assert not fenics_concrete.triggers.AllPointsAbove(1.5)(aggregate)
+    assert fenics_concrete.triggers.AllPointsAbove(-1)(aggregate)
+
+
+def square_mesh():
+    # only the first process needs the arrays
+    coordinates = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    cells = np.array([[0, 1, 3], [0, 2, 3]])
+    return fenics_concrete.helpers.mesh_from_arrays(df.MPI.comm_world, coordinates, cells, 'triangle')
+
+
+def test_mesh_from_arrays():
+    mesh = square_mesh()
+
+    assert mesh.num_cells() == 2
+    assert mesh.num_vertices() == 4
+    assert df.assemble(df.Constant(1.0) * df.dx(domain=mesh)) == pytest.approx(1.0)
+
+
+def test_mesh_from_arrays_speed(tmp_path):
+    # the mesh is built in memory, instead of writing and reading an xdmf file, this has to be faster
+    comm = df.MPI.comm_self
+    reference = df.UnitCubeMesh(comm, 12, 12, 12)
+    coordinates = reference.coordinates().copy()
+    cells = reference.cells().copy()
+    fenics_concrete.helpers.mesh_editor_module()  # compiled before the timing
+
+    start = time.perf_counter()
+    mesh = fenics_concrete.helpers.mesh_from_arrays(comm, coordinates, cells, 'tetrahedron')
+    in_memory = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with df.XDMFFile(comm, str(tmp_path / 'mesh.xdmf')) as f:
+        f.write(reference)
+    from_file = df.Mesh(comm)
+    with df.XDMFFile(comm, str(tmp_path / 'mesh.xdmf')) as f:
+        f.read(from_file)
+    xdmf = time.perf_counter() - start
+
+    assert mesh.num_cells() == from_file.num_cells()
+    assert mesh.coordinates() == pytest.approx(coordinates)
+    assert (mesh.cells() == cells).all()
+    assert in_memory < xdmf
+
+
+def check_distributed():
+    # run with mpirun, each check has to give the same result on all processes
+    comm = df.MPI.comm_world
+    rank = df.MPI.rank(comm)
+    problem = setup_problem()
+    assert problem.experiment.mesh.num_cells() < 32  # the mesh of 4x4x2 cells is distributed
+
+    T = problem.temperature_problem.T
+    T.interpolate(df.Expression('x[0] + 2*x[1]', degree=1))
+    assert fenics_concrete.helpers.evaluate_at_point(T, (0.3, 0.6)) == pytest.approx(1.5)
+
+    assert problem.experiment.coordinate_min(0) == pytest.approx(0.0)
+    assert problem.experiment.coordinate_max(1) == pytest.approx(1.0)
+
+    # ascii is serial only
+    mesh = problem.experiment.mesh
+    assert fenics_concrete.helpers.pv_encoding(mesh, 'ASCII') == df.XDMFFile.Encoding.HDF5
+
+    # only the points of the first process exceed the value
+    aggregate = fenics_concrete.aggregates.EquivalentAgeAggregate()
+    problem.add_aggregate(aggregate)
+    aggregate.data = np.full(3, 1.0 if rank == 0 else 0.0)
+    assert fenics_concrete.triggers.AnyPointAbove(0.5)(aggregate)
+    assert not fenics_concrete.triggers.AllPointsAbove(0.5)(aggregate)
+
+    # the mesh built on the first process is distributed
+    mesh = square_mesh()
+    assert df.MPI.sum(comm, float(mesh.num_cells())) == 2
+    assert df.assemble(df.Constant(1.0) * df.dx(domain=mesh)) == pytest.approx(1.0)
+
+    sensor = fenics_concrete.sensors.TemperatureSensor((0.3, 0.6))
+    sensor.add_trigger(fenics_concrete.triggers.LastValueAbove(20), fenics_concrete.triggers.StopSimulation())
+    problem.add_sensor(sensor)
+    problem.set_timestep(3600)
+    problem.solve(t=3600)
+    assert comm.allgather(problem.finished) == [problem.finished] * df.MPI.size(comm)
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(shutil.which('mpirun') is None, reason='mpirun is not available')
+def test_distributed():
+    script = f'import sys; sys.path.insert(0, {os.path.dirname(__file__)!r}); ' \
+             f'import test_parallel; test_parallel.check_distributed()'
+    result = subprocess.run(['mpirun', '-n', '2', sys.executable, '-c', script], capture_output=True, text=True,
+                            timeout=600)
+    assert result.returncode == 0, result.stderr
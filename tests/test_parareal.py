@@ -0,0 +1,69 @@
+import fenics_concrete
+
+import os
+
+import numpy as np
+import pytest
+
+
+def parameters():
+    parameters = fenics_concrete.Parameters()
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 4
+    parameters['problem_mode'] = 'thermal'
+    parameters['T_0'] = 20
+    parameters['T_bc1'] = 10
+    return parameters
+
+
+def sensors():
+    return [fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)), fenics_concrete.sensors.DOHSensor((0.5, 0.5))]
+
+
+@pytest.mark.parametrize("processes, coarse_parameters", [(1, None), (2, None), (2, {'mesh_density': 2})])
+def test_parareal(simulate, processes, coarse_parameters):
+    file_path = os.path.dirname(os.path.realpath(__file__)) + '/'
+    time = 4 * 6 * 3600
+    result = fenics_concrete.parareal.parareal(parameters(), fenics_concrete.ConcreteCubeExperiment,
+                                               fenics_concrete.ConcreteThermoMechanical, sensors(), dt=600,
+                                               time=time, n_slices=4, coarse_dt=3 * 3600,
+                                               coarse_parameters=coarse_parameters, tolerance=1e-5,
+                                               processes=processes, pv_name=file_path + 'test_parareal')
+    reference = simulate(parameters(), sensors(), 600, time)
+
+    assert result['converged']
+    assert result['iterations'] <= 4
+    # the change decreases with the iterations
+    assert result['changes'][-1] <= result['changes'][0]
+    assert result['speedup'] > 0
+
+    for name, sensor in reference.sensors.items():
+        times, data = result['sensors'][name]
+        assert times == pytest.approx(sensor.time)
+        assert np.array(data) == pytest.approx(np.array(sensor.data), rel=1e-3)
+
+
+def test_slices_and_time_steps():
+    with pytest.raises(Exception):
+        fenics_concrete.parareal.parareal(parameters(), fenics_concrete.ConcreteCubeExperiment,
+                                          fenics_concrete.ConcreteThermoMechanical, sensors(), dt=700, time=3600,
+                                          n_slices=2, coarse_dt=1800)
+
+
+def test_coarse_problem_without_coarse_parameters():
+    # with the same parameters the coarse problem must not be the cached problem of the fine runs
+    fine_run = fenics_concrete.sweep.RunSpec(0, fenics_concrete.ConcreteCubeExperiment,
+                                             fenics_concrete.ConcreteThermoMechanical, parameters(), {}, sensors(),
+                                             600, 3600)
+    fine = fenics_concrete.sweep.get_problem(fine_run)
+    fine.add_sensor(fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)))
+    coarse_run = fenics_concrete.sweep.RunSpec(-1, fenics_concrete.ConcreteCubeExperiment,
+                                               fenics_concrete.ConcreteThermoMechanical, parameters(), {}, [], 1800,
+                                               3600, 'pv_output_coarse')
+    coarse = fenics_concrete.parareal.CoarsePropagator(fine_run, coarse_run)
+
+    assert coarse.coarse is not coarse.fine
+    assert coarse.same_discretization
+    assert len(coarse.coarse.sensors) == 0
+    assert 'TemperatureSensor' in fine.sensors
@@ -13,6 +13,7 @@ def simple_simulation(new_parameters, name):
     parameters = fenics_concrete.Parameters()  # using the current default values
     # general
     parameters['log_level'] = 'WARNING'
+    parameters['pv_encoding'] = 'ASCII'  # reference files are written in ascii
     # mesh
     parameters['mesh_setting'] = 'left/right'  # default boundary setting
     parameters['bc_setting'] = 'test-setup'  # default boundary setting
@@ -80,6 +81,8 @@ def simple_simulation(new_parameters, name):
         # prepare next timestep
         t += dt
 
+    problem.pv_close()
+
 
 
 def compare_pv_files(ref_file, test_file):
@@ -118,3 +121,81 @@ def test_pv_output(dim,degree):
 
     compare_pv_files('ref_'+file_name+'.xdmf','test_'+file_name+'.xdmf')
     
+
+
+def test_async_pv_output():
+    file_name = 'async_2D'
+    parameters = fenics_concrete.Parameters()  # using the current default values
+    parameters['dim'] = 2
+    parameters['degree'] = 2
+    parameters['pv_async'] = True
+
+    simple_simulation(parameters, file_name)
+
+    file_path = os.path.dirname(os.path.realpath(__file__)) + '/'
+    root = ET.parse(file_path + 'test_' + file_name + '.xdmf').getroot()
+    time_steps = root[0][0]
+
+    # one grid for each of the 10 time steps with temperature, DOH and the five mechanical fields
+    assert len(time_steps) == 10
+    attributes = time_steps[-1].findall('Attribute')
+    assert [attribute.attrib['Name'] for attribute in attributes][:2] == ['Temperature', 'DOH']
+    assert len(attributes) == 7
+
+    # the binary data of the last temperature matches the number of vertices
+    data_item = attributes[0][0]
+    n_vertices = int(time_steps[-1].find('Geometry')[0].attrib['Dimensions'].split()[0])
+    values = np.fromfile(file_path + data_item.text, dtype=np.float64, offset=int(data_item.attrib['Seek']),
+                         count=n_vertices)
+    assert np.all(values > 273.15 + 10 - 1e-8)
+
+
+def test_selective_pv_output():
+    file_name = 'selective_2D'
+    parameters = fenics_concrete.Parameters()  # using the current default values
+    parameters['dim'] = 2
+    parameters['degree'] = 1
+    parameters['pv_fields'] = ['Temperature', 'Stress']
+    parameters['pv_interval'] = 2
+    parameters['pv_region'] = ((0, 0), (0.5, 1))  # left half of the unit square
+    parameters['pv_precision'] = 'float32'
+
+    simple_simulation(parameters, file_name)
+
+    file_path = os.path.dirname(os.path.realpath(__file__)) + '/'
+    root = ET.parse(file_path + 'test_' + file_name + '.xdmf').getroot()
+    time_steps = root[0][0]
+
+    # every second of the 10 time steps with only the selected fields
+    assert len(time_steps) == 5
+    attributes = time_steps[-1].findall('Attribute')
+    assert [attribute.attrib['Name'] for attribute in attributes] == ['Temperature', 'Stress']
+
+    # half of the 2 * 4 * 4 cells, written in single precision
+    assert time_steps[-1].find('Topology').attrib['NumberOfElements'] == '16'
+    assert time_steps[-1].find('Geometry')[0].attrib['Precision'] == '4'
+    assert attributes[0][0].attrib['Precision'] == '4'
+
+
+def test_incremental_xdmf(tmp_path):
+    # the xdmf file is extended with each update, the steps that are already written are not kept
+    writer = fenics_concrete.pv_output.BinaryXDMFWriter(None, str(tmp_path / 'incremental'), asynchronous=False)
+    coordinates = np.array([[0., 0.], [1., 0.], [0., 1.]])
+    with open(writer.data_file, 'wb') as data:
+        writer.process(data, ('mesh', coordinates, np.array([[0, 1, 2]]), 2))
+        for step in range(20):
+            writer.process(data, ('field', step, 'Temperature', 'Node', np.full((3, 1), float(step))))
+            writer.process(data, ('flush',))
+            assert len(writer.steps) <= 1
+            assert len(ET.parse(writer.xdmf_file).getroot()[0][0]) == step + 1
+        # a field of the last step that arrives after an update is added to its grid
+        writer.process(data, ('field', 19, 'DOH', 'Node', np.zeros((3, 1))))
+        writer.process(data, ('close',))
+    assert writer.error is None
+
+    time_steps = ET.parse(writer.xdmf_file).getroot()[0][0]
+    assert len(time_steps) == 20
+    assert [attribute.attrib['Name'] for attribute in time_steps[-1].findall('Attribute')] == ['Temperature', 'DOH']
+    data_item = time_steps[10].find('Attribute')[0]
+    values = np.fromfile(tmp_path / data_item.text, dtype=np.float64, offset=int(data_item.attrib['Seek']), count=3)
+    assert values == pytest.approx(np.full(3, 10.0))
@@ -0,0 +1,106 @@
+import fenics_concrete
+
+import numpy as np
+import pytest
+
+
+def parameters():
+    parameters = fenics_concrete.Parameters()
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 6
+    parameters['problem_mode'] = 'thermal'
+    parameters['T_0'] = 20
+    parameters['T_bc1'] = 10
+    return parameters
+
+
+def add_sensors(problem):
+    problem.add_sensor(fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)))
+    problem.add_sensor(fenics_concrete.sensors.MaxTemperatureSensor())
+    problem.add_sensor(fenics_concrete.sensors.DOHSensor((0.5, 0.5)))
+
+
+def simulate(problem, times):
+    problem.set_timestep(3600)
+    for t in times:
+        problem.solve(t=t)
+    return problem
+
+
+def test_pod_deim():
+    x = np.linspace(0, 1, 50)
+    snapshots = np.array([np.sin(np.pi * x) * a + x ** 2 * b for a, b in [(1, 0), (0, 1), (1, 1), (2, -1)]]).T
+    basis, singular_values, error = fenics_concrete.reduced_order.pod(snapshots, tolerance=1e-12)
+
+    # two independent modes
+    assert basis.shape == (50, 2)
+    assert error == pytest.approx(0, abs=1e-12)
+    assert basis.T @ basis == pytest.approx(np.eye(2))
+
+    indices = fenics_concrete.reduced_order.deim_indices(basis)
+    assert len(set(indices)) == 2
+    # interpolation at the selected points is exact for functions in the span of the basis
+    f = snapshots[:, 3]
+    assert basis @ np.linalg.solve(basis[indices], f[indices]) == pytest.approx(f)
+
+
+def test_reduced_model():
+    times = [3600 * i for i in range(1, 25)]
+    experiment = fenics_concrete.ConcreteCubeExperiment(parameters())
+
+    # offline: snapshots of a full run
+    full = fenics_concrete.ConcreteThermoMechanical(experiment, parameters())
+    add_sensors(full)
+    full.add_sensor(fenics_concrete.sensors.SnapshotSensor())
+    simulate(full, times)
+    basis = fenics_concrete.reduced_order.ReducedBasis(full, full.sensors['SnapshotSensor'].data, tolerance=1e-10)
+
+    n_modes, n_points = basis.size
+    assert n_modes < full.temperature_problem.V.dim()
+    assert n_points < full.temperature_problem.q_V.dim()
+
+    # online: the same run with the reduced model
+    reduced = fenics_concrete.ReducedConcreteThermal(experiment, basis)
+    add_sensors(reduced)
+    simulate(reduced, times)
+
+    del full.sensors['SnapshotSensor']
+    errors = fenics_concrete.reduced_order.compare_sensors(reduced, full)
+    for name, (absolute, relative) in errors.items():
+        assert relative < 1e-3, name
+
+
+def test_reduced_model_changed_parameters():
+    times = [3600 * i for i in range(1, 25)]
+
+    # offline: snapshots of two full runs that span the boundary temperatures, the boundary values are taken from
+    # the experiment
+    snapshots = []
+    for T_bc1 in [10, 30]:
+        experiment = fenics_concrete.ConcreteCubeExperiment(parameters() + {'T_bc1': T_bc1})
+        full = fenics_concrete.ConcreteThermoMechanical(experiment, parameters() + {'T_bc1': T_bc1})
+        full.add_sensor(fenics_concrete.sensors.SnapshotSensor())
+        simulate(full, times)
+        snapshots += full.sensors['SnapshotSensor'].data
+    basis = fenics_concrete.reduced_order.ReducedBasis(full, snapshots, tolerance=1e-10)
+
+    # online: parameters that were not part of the training
+    changed = {'T_bc1': 20, 'Q_inf': 1.2 * full.p.Q_inf}
+    experiment = fenics_concrete.ConcreteCubeExperiment(parameters() + changed)
+    full = fenics_concrete.ConcreteThermoMechanical(experiment, parameters() + changed)
+    full.add_sensor(fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)))
+    full.add_sensor(fenics_concrete.sensors.MaxTemperatureSensor())
+    simulate(full, times)
+
+    reduced = fenics_concrete.ReducedConcreteThermal(experiment, basis, fenics_concrete.Parameters(changed))
+    reduced.add_sensor(fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)))
+    reduced.add_sensor(fenics_concrete.sensors.MaxTemperatureSensor())
+    # without degree of hydration sensors only the interpolation points are hydrated
+    assert not reduced.full_alpha
+    simulate(reduced, times)
+    assert reduced.q_alpha.vector().norm('linf') == 0
+
+    errors = fenics_concrete.reduced_order.compare_sensors(reduced, full)
+    for name, (absolute, relative) in errors.items():
+        assert relative < 1e-2, name
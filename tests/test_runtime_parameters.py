@@ -0,0 +1,55 @@
+import fenics_concrete
+
+import pytest
+
+
+def setup_problem(new_parameters=None):
+    parameters = fenics_concrete.Parameters()  # using the current default values
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 4
+    parameters['bc_setting'] = 'full'
+    parameters['T_0'] = 10  # inital concrete temperature
+    parameters['T_bc1'] = 30  # temperature boundary value 1
+    parameters['themal_cond'] = 2.0
+    parameters['nu'] = 0.2
+    parameters = parameters + new_parameters
+
+    experiment = fenics_concrete.ConcreteCubeExperiment(parameters)
+    problem = fenics_concrete.ConcreteThermoMechanical(experiment, parameters)
+    problem.add_sensor(fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)))
+    problem.add_sensor(fenics_concrete.sensors.DisplacementSensor((0.5, 0.5)))
+    problem.set_timestep(3600)
+
+    return problem
+
+
+def run(problem):
+    for step in range(1, 4):
+        problem.solve(t=step * 3600)
+
+
+def test_update_parameters_and_reset():
+    new_parameters = {'T_bc1': 40, 'themal_cond': 3.0, 'nu': 0.3, 'density': 2400}
+
+    problem = setup_problem()
+    run(problem)
+    changed = problem.update_parameters(new_parameters)
+    problem.reset()
+    run(problem)
+
+    reference = setup_problem(fenics_concrete.Parameters(new_parameters))
+    run(reference)
+
+    assert changed == new_parameters
+    assert len(problem.sensors.TemperatureSensor.data) == 3
+    assert problem.sensors.TemperatureSensor.data == pytest.approx(reference.sensors.TemperatureSensor.data)
+    assert problem.sensors.DisplacementSensor.data[-1] == pytest.approx(
+        reference.sensors.DisplacementSensor.data[-1])
+
+
+def test_update_setup_parameter():
+    problem = setup_problem()
+
+    with pytest.raises(Exception):
+        problem.update_parameters({'degree': 1})
@@ -0,0 +1,79 @@
+import fenics_concrete
+
+import numpy as np
+import pytest
+
+PARAMETERS = {'B1': 2.916E-4, 'B2': 0.0024229, 'eta': 5.554, 'alpha_max': 0.875, 'E_act': 47002, 'igc': 8.3145,
+              'T_ref': 25, 'zero_C': 273.15, 'temp_adjust_law': 'exponential', 'Q_inf': 240000000,
+              'vol_heat_cap': 2.4e6, 'themal_cond': 2.0, 'T_0': 20}
+
+
+def test_adiabatic_energy_balance():
+    times, T, alpha = fenics_concrete.screening.adiabatic(PARAMETERS, 7 * 24 * 3600, 1800)
+
+    assert times[-1] == pytest.approx(7 * 24 * 3600)
+    assert np.all(np.diff(alpha) >= 0)
+    assert 0.5 < alpha[-1] < PARAMETERS['alpha_max']
+    # all released heat stays in the sample
+    heat = PARAMETERS['Q_inf'] / PARAMETERS['vol_heat_cap']
+    assert T - PARAMETERS['T_0'] == pytest.approx(heat * alpha)
+
+
+def test_vectorized_parameter_sets():
+    Q_inf = np.array([180e6, 240e6, 300e6])
+    E_act = np.array([40000, 47002, 52000])
+    p = dict(PARAMETERS, Q_inf=Q_inf, E_act=E_act)
+    _, T, alpha = fenics_concrete.screening.semi_adiabatic(p, 3 * 24 * 3600, 3600, heat_loss=50)
+    assert T.shape == (73, 3)
+
+    for i in range(3):
+        _, T_i, alpha_i = fenics_concrete.screening.semi_adiabatic(dict(PARAMETERS, Q_inf=Q_inf[i], E_act=E_act[i]),
+                                                                   3 * 24 * 3600, 3600, heat_loss=50)
+        assert T[:, i] == pytest.approx(T_i)
+        assert alpha[:, i] == pytest.approx(alpha_i)
+
+
+def test_semi_adiabatic_heat_loss():
+    _, T_adiabatic, _ = fenics_concrete.screening.adiabatic(PARAMETERS, 14 * 24 * 3600, 3600)
+    _, T, _ = fenics_concrete.screening.semi_adiabatic(PARAMETERS, 14 * 24 * 3600, 3600, heat_loss=50)
+
+    assert T.max() < T_adiabatic.max()
+    # the sample cools down to the environment after the peak
+    assert T[-1] < T.max()
+    assert T[-1] - PARAMETERS['T_0'] < (T.max() - PARAMETERS['T_0']) / 2
+
+
+def test_slab_profile():
+    times, x, T, alpha = fenics_concrete.screening.slab(PARAMETERS, 1.0, 3 * 24 * 3600, 3600, heat_transfer=10)
+    assert T.shape == (len(times), len(x))
+
+    # symmetric profile with the maximum in the middle
+    assert T[-1] == pytest.approx(T[-1][::-1])
+    assert np.argmax(T[-1]) == len(x) // 2
+    assert T[-1][0] < T[-1][len(x) // 2]
+
+    # the middle of a thick slab is close to adiabatic
+    _, T_adiabatic, _ = fenics_concrete.screening.adiabatic(PARAMETERS, 24 * 3600, 3600)
+    _, _, T_thick, _ = fenics_concrete.screening.slab(PARAMETERS, 4.0, 24 * 3600, 3600, heat_transfer=10)
+    assert T_thick[-1][len(x) // 2] == pytest.approx(T_adiabatic[-1], abs=0.5)
+
+
+def test_slab_boundary_conditions():
+    # a large heat transfer coefficient approaches the environment temperature at the faces
+    _, _, T_dirichlet, _ = fenics_concrete.screening.slab(PARAMETERS, 0.5, 24 * 3600, 3600, T_env=10)
+    _, _, T_robin, _ = fenics_concrete.screening.slab(PARAMETERS, 0.5, 24 * 3600, 3600, T_env=10,
+                                                      heat_transfer=1e6)
+    assert T_dirichlet[-1][[0, -1]] == pytest.approx(10)
+    assert T_robin[-1] == pytest.approx(T_dirichlet[-1], abs=1e-2)
+
+
+def test_slab_vectorized():
+    thermal_conductivity = np.array([1.5, 2.5])
+    p = dict(PARAMETERS, themal_cond=thermal_conductivity)
+    _, _, T, _ = fenics_concrete.screening.slab(p, 0.5, 24 * 3600, 3600, n_elements=10, heat_transfer=10)
+    assert T.shape == (25, 2, 11)
+
+    for i in range(2):
+        _, _, T_i, _ = fenics_concrete.screening.slab(dict(PARAMETERS, themal_cond=thermal_conductivity[i]), 0.5,
+                                                      24 * 3600, 3600, n_elements=10, heat_transfer=10)
+        assert T[:, i] == pytest.approx(T_i)
@@ -0,0 +1,110 @@
+import fenics_concrete
+
+import os
+
+import pytest
+
+
+def run_sweep(processes, sensors=None):
+    parameters = fenics_concrete.Parameters()  # using the current default values
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 4
+    parameters['bc_setting'] = 'full'
+    parameters['T_0'] = 10  # inital concrete temperature
+
+    overrides = [{'T_bc1': 20}, {'T_bc1': 30}, {'T_bc1': 40, 'mesh_density': 6}]
+    if sensors is None:
+        sensors = [fenics_concrete.sensors.TemperatureSensor((0.5, 0.5))]
+
+    file_path = os.path.dirname(os.path.realpath(__file__)) + '/'
+    return fenics_concrete.sweep.sweep(parameters, fenics_concrete.ConcreteCubeExperiment,
+                                       fenics_concrete.ConcreteThermoMechanical, overrides, sensors, dt=3600,
+                                       time=3600 * 3, processes=processes, pv_name=file_path + 'test_sweep')
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_sweep(processes):
+    results = run_sweep(processes)
+
+    assert [result['index'] for result in results] == [0, 1, 2]
+    assert all(result['error'] is None for result in results)
+
+    # higher boundary temperature heats the center faster
+    final_T = [result['sensors']['TemperatureSensor'][1][-1] for result in results]
+    assert final_T[0] < final_T[1] < final_T[2]
+
+    table = fenics_concrete.sweep.sensor_table(results)
+    assert len(table) == 3 * 3
+    assert table[-1]['T_bc1'] == 40
+    assert table[-1]['mesh_density'] == 6
+    assert table[-1]['sensor'] == 'TemperatureSensor'
+    assert table[-1]['time'] == pytest.approx(3600 * 3)
+
+
+def test_sweep_with_triggers():
+    # the sensors with their trigger conditions are sent to the worker processes
+    sensor = fenics_concrete.sensors.TemperatureSensor((0.5, 0.5))
+    sensor.add_trigger(fenics_concrete.triggers.LastValueAbove(10), fenics_concrete.triggers.StopSimulation())
+    results = run_sweep(2, [sensor])
+
+    assert all(result['error'] is None for result in results)
+    # the center heats up in the first step, all runs stop after it
+    assert all(len(result['sensors']['TemperatureSensor'][1]) == 1 for result in results)
+
+
+def test_sweep_unpicklable_condition():
+    sensor = fenics_concrete.sensors.TemperatureSensor((0.5, 0.5))
+    sensor.add_trigger(lambda s: False, fenics_concrete.triggers.StopSimulation())
+
+    with pytest.raises(Exception, match='picklable'):
+        run_sweep(2, [sensor])
+
+
+def test_reused_problem_output(tmp_path):
+    parameters = fenics_concrete.Parameters()
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 4
+
+    specs = [fenics_concrete.sweep.RunSpec(i, fenics_concrete.ConcreteCubeExperiment,
+                                           fenics_concrete.ConcreteThermoMechanical,
+                                           parameters + fenics_concrete.Parameters({'T_bc1': T}), {'T_bc1': T}, [],
+                                           3600, 3600, pv_name=str(tmp_path / 'run')) for i, T in enumerate([20, 30])]
+    first = fenics_concrete.sweep.get_problem(specs[0])
+    second = fenics_concrete.sweep.get_problem(specs[1])
+
+    # the problem is reused, the output goes to the file of the second run
+    assert second is first
+    assert second.pv_name == str(tmp_path / 'run_1')
+    second.pv_plot(t=0)
+    second.pv_close()
+    assert (tmp_path / 'run_1.xdmf').is_file()
+
+
+def test_alternating_setups(tmp_path):
+    # two problem setups share the experiment of the geometry, each run has to use its own boundary values
+    parameters = fenics_concrete.Parameters()
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 4
+    parameters['T_0'] = 10
+
+    overrides = [{'problem_mode': 'thermal', 'T_bc1': 20}, {'problem_mode': 'thermo-mechanical', 'T_bc1': 40},
+                 {'problem_mode': 'thermal', 'T_bc1': 20, 'T_0': 15}]
+    specs = [fenics_concrete.sweep.RunSpec(i, fenics_concrete.ConcreteCubeExperiment,
+                                           fenics_concrete.ConcreteThermoMechanical, parameters + override, override,
+                                           [fenics_concrete.sensors.TemperatureSensor((0.5, 0.5))], 3600, 3 * 3600,
+                                           pv_name=str(tmp_path / 'run')) for i, override in enumerate(overrides)]
+    results = [fenics_concrete.sweep.run(spec) for spec in specs]
+    assert all(result['error'] is None for result in results)
+
+    # the third run reuses the problem of the first one after the second run changed the experiment
+    experiment = fenics_concrete.ConcreteCubeExperiment(specs[2].parameters)
+    reference = fenics_concrete.ConcreteThermoMechanical(experiment, specs[2].parameters,
+                                                         pv_name=str(tmp_path / 'reference'))
+    reference.add_sensor(fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)))
+    reference.set_timestep(3600)
+    for t in [3600, 2 * 3600, 3 * 3600]:
+        reference.solve(t=t)
+    assert results[2]['sensors']['TemperatureSensor'][1] == pytest.approx(reference.sensors.TemperatureSensor.data)
@@ -0,0 +1,71 @@
+import fenics_concrete
+
+import pytest
+
+
+def simulate(experiment_class, parameters, sensors):
+    experiment = experiment_class(parameters)
+    problem = fenics_concrete.ConcreteThermoMechanical(experiment, parameters)
+    for sensor in sensors:
+        problem.add_sensor(sensor)
+
+    problem.set_timestep(3600)
+    for t in [3600, 7200]:
+        problem.solve(t=t)
+
+    return problem
+
+
+@pytest.mark.parametrize("symmetry", ['half', 'quarter'])
+def test_column_symmetry(symmetry):
+    parameters = fenics_concrete.Parameters()
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 3
+    parameters['mesh_density'] = 8
+    parameters['width'] = 0.5
+    parameters['height'] = 1
+
+    # the points are in the part that is not meshed in the reduced models
+    def sensors():
+        return [fenics_concrete.sensors.TemperatureSensor((0.4, 0.3, 0.5)),
+                fenics_concrete.sensors.DisplacementSensor((0.4, 0.3, 1.0)),
+                fenics_concrete.sensors.MaxTemperatureSensor()]
+
+    full = simulate(fenics_concrete.ConcreteColumnExperiment, parameters, sensors())
+    reduced = simulate(fenics_concrete.ConcreteColumnExperiment, parameters + {'symmetry': symmetry}, sensors())
+
+    factor = {'half': 2, 'quarter': 4}[symmetry]
+    assert reduced.experiment.symmetry_factor() == factor
+    assert reduced.temperature_problem.V.dim() < full.temperature_problem.V.dim()
+    for name in full.sensors:
+        assert reduced.sensors[name].data[-1] == pytest.approx(full.sensors[name].data[-1], rel=1e-3, abs=1e-12)
+
+
+def test_symmetry_reaction_force():
+    parameters = fenics_concrete.Parameters()
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 3
+    parameters['mesh_density'] = 4
+
+    forces = []
+    for symmetry in [None, 'half', 'quarter']:
+        experiment = fenics_concrete.ConcreteCubeExperiment(parameters + {'symmetry': symmetry})
+        problem = fenics_concrete.ConcreteThixMechanical(experiment, parameters + {'symmetry': symmetry})
+        problem.add_sensor(fenics_concrete.sensors.ReactionForceSensorBottom())
+        problem.set_timestep(60)
+        problem.solve(t=0)
+        forces.append(problem.sensors.ReactionForceSensorBottom.data[-1])
+
+    # the reduced models report the force of the full cube, its weight
+    weight = problem.p.density * problem.p.g * 1.0
+    assert abs(forces[0]) == pytest.approx(weight)
+    assert forces[1] == pytest.approx(forces[0])
+    assert forces[2] == pytest.approx(forces[0])
+
+
+def test_unsupported_symmetry():
+    parameters = fenics_concrete.Parameters()
+    parameters['dim'] = 2
+    parameters['symmetry'] = 'quarter'
+    with pytest.raises(Exception):
+        fenics_concrete.ConcreteBeamExperiment(parameters)
@@ -0,0 +1,44 @@
+import fenics_concrete
+
+import pytest
+
+
+def sensors():
+    return [fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)), fenics_concrete.sensors.DOHSensor((0.5, 0.5))]
+
+
+def test_thermal_mode(simulate):
+    thermal = simulate({'problem_mode': 'thermal'}, sensors(), end=7200)
+    full = simulate({'problem_mode': 'thermo-mechanical'}, sensors(), end=7200)
+
+    # no mechanics problem is built
+    assert thermal.mechanics_problem is None
+    assert thermal.displacement is None
+
+    for name in full.sensors:
+        assert thermal.sensors[name].data == pytest.approx(full.sensors[name].data)
+
+    # the material functions of the mechanics are still available
+    assert thermal.get_E_alpha_fkt()(0.5, {'alpha_t': 0.2, 'E_inf': 1, 'alpha_0': 0.05, 'a_E': 0.6}) > 0
+
+
+def test_unknown_problem_mode(simulate):
+    with pytest.raises(Exception):
+        simulate({'problem_mode': 'unknown'}, sensors())
+
+
+@pytest.mark.parametrize("sensor", [fenics_concrete.sensors.MaxYieldSensor(),
+                                    fenics_concrete.sensors.DisplacementSensor((0.5, 0.5)),
+                                    fenics_concrete.sensors.StressSensor((0.5, 0.5))])
+def test_mechanics_sensor_in_thermal_mode(simulate, sensor):
+    # rejected when attached, not with an AttributeError during the run
+    with pytest.raises(Exception, match='mechanics'):
+        simulate({'problem_mode': 'thermal'}, [sensor])
+
+
+def test_mechanics_aggregate_in_thermal_mode(simulate):
+    problem = simulate({'problem_mode': 'thermal'}, end=3600)
+    assert problem.q_yield is None
+    assert problem.stress is None
+    with pytest.raises(Exception, match='mechanics'):
+        problem.add_aggregate(fenics_concrete.aggregates.MaxYieldAggregate())
@@ -0,0 +1,50 @@
+import fenics_concrete
+
+import numpy as np
+import pytest
+
+
+def run(simulate, time_scheme, dt, end=24 * 3600):
+    parameters = {'problem_mode': 'thermal', 'time_scheme': time_scheme, 'T_0': 20, 'T_bc1': 20}
+    sensors = [fenics_concrete.sensors.TemperatureSensor((0.5, 0.5)), fenics_concrete.sensors.DOHSensor((0.5, 0.5))]
+    return simulate(parameters, sensors, dt, end)
+
+
+def errors(problem, reference, every):
+    # largest deviation of the sensors at the times of the coarse run
+    return {name: np.max(np.abs(np.array(problem.sensors[name].data) -
+                                np.array(reference.sensors[name].data[every - 1::every])))
+            for name in problem.sensors}
+
+
+@pytest.mark.parametrize('time_scheme', ['bdf2', 'crank-nicolson'])
+def test_second_order_schemes(simulate, time_scheme):
+    reference = run(simulate, 'bdf2', 450)
+    backward_euler = errors(run(simulate, 'backward-euler', 3600), reference, 8)
+    second_order = errors(run(simulate, time_scheme, 3600), reference, 8)
+
+    for name in backward_euler:
+        assert second_order[name] < backward_euler[name] / 2, name
+
+
+def test_changed_timestep(simulate):
+    # the bdf2 coefficients follow a change of the time step
+    problem = run(simulate, 'bdf2', 1800, end=6 * 3600)
+    problem.set_timestep(3600)
+    problem.solve(t=7 * 3600)
+    reference = run(simulate, 'bdf2', 900, end=7 * 3600)
+
+    assert problem.temperature_problem.time_coefficients[0] == pytest.approx(3 / 2)
+    assert problem.sensors['TemperatureSensor'].data[-1] == \
+           pytest.approx(reference.sensors['TemperatureSensor'].data[-1], rel=1e-3)
+
+
+def test_initial_rate_of_hydration(simulate):
+    # the first crank-nicolson step starts from the rate of hydration at the initial temperature
+    problem = run(simulate, 'crank-nicolson', 3600, end=0)
+    temperature_problem = problem.temperature_problem
+    T_0 = problem.p.T_0 + problem.p.zero_C
+    rate = fenics_concrete.hydration.affinity(0, 0, problem.p) * fenics_concrete.hydration.temp_adjust(T_0, problem.p)
+
+    assert rate > 0
+    assert temperature_problem.q_rate_n.vector().get_local() == pytest.approx(rate)
@@ -0,0 +1,61 @@
+import fenics_concrete
+
+import pytest
+
+
+def setup_problem():
+    parameters = fenics_concrete.Parameters()  # using the current default values
+    parameters['log_level'] = 'WARNING'
+    parameters['dim'] = 2
+    parameters['mesh_density'] = 4
+    parameters['bc_setting'] = 'full'
+    parameters['T_0'] = 10  # inital concrete temperature
+    parameters['T_bc1'] = 30  # temperature boundary value 1
+
+    experiment = fenics_concrete.ConcreteCubeExperiment(parameters)
+    problem = fenics_concrete.ConcreteThermoMechanical(experiment, parameters)
+
+    return problem
+
+
+def run(problem, dt, time):
+    problem.set_timestep(dt)
+    t = dt
+    steps = 0
+    while t <= time and not problem.finished:
+        problem.solve(t=t)
+        steps += 1
+        t += problem.temperature_problem.dt
+
+    return steps
+
+
+def test_stop_simulation():
+    problem = setup_problem()
+
+    sensor = fenics_concrete.sensors.TemperatureSensor((0.5, 0.5))
+    sensor.add_trigger(fenics_concrete.triggers.LastValueAbove(15), fenics_concrete.triggers.StopSimulation())
+    problem.add_sensor(sensor)
+
+    steps = run(problem, 3600, 3600 * 20)
+
+    assert problem.finished
+    assert steps < 20
+    assert problem.sensors[sensor.name].data[-1] > 15
+    assert problem.sensors[sensor.name].data[-2] <= 15
+
+
+def test_change_timestep_and_output_interval():
+    problem = setup_problem()
+
+    aggregate = fenics_concrete.aggregates.EquivalentAgeAggregate()
+    aggregate.add_trigger(fenics_concrete.triggers.AllPointsAbove(3600), fenics_concrete.triggers.ChangeTimestep(7200))
+    aggregate.add_trigger(fenics_concrete.triggers.AllPointsAbove(3600),
+                          fenics_concrete.triggers.ChangeOutputInterval(5))
+    problem.add_aggregate(aggregate)
+
+    run(problem, 1800, 3600 * 4)
+
+    assert problem.temperature_problem.dt == pytest.approx(7200)
+    assert problem.output_interval == 5
+    assert len(aggregate.triggers[0].time) == 1
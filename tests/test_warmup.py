@@ -0,0 +1,25 @@
+import fenics_concrete
+
+
+def compiled_modules(cache_dir):
+    return {path.name for path in cache_dir.rglob('*.so')}
+
+
+def test_warmup(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    times = fenics_concrete.warmup.warmup(str(cache_dir), dims=[2], degrees=[1])
+
+    assert set(times) == {'ConcreteThermoMechanical dim=2 degree=1', 'ConcreteThixMechanical dim=2 degree=1'}
+    # the compiled forms are written into the cache directory
+    modules = compiled_modules(cache_dir)
+    assert len(modules) > 0
+
+    # a new process finds the compiled forms in the cache, nothing is compiled again
+    warm = fenics_concrete.warmup.cold_start_benchmark(str(cache_dir), dim=2, degree=1)
+    assert compiled_modules(cache_dir) == modules
+
+    # with an empty cache the forms are compiled in the first setup and solve
+    empty_dir = tmp_path / 'empty'
+    cold = fenics_concrete.warmup.cold_start_benchmark(str(empty_dir), dim=2, degree=1)
+    assert len(compiled_modules(empty_dir)) > 0
+    assert warm['setup'] + warm['first solve'] < cold['setup'] + cold['first solve']